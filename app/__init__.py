@@ -14,8 +14,8 @@ db = SQLAlchemy()
 migrate = Migrate()
 login_manager = LoginManager()
 
-def create_app():
-    """Flask 애플리케이션 팩토리"""
+def create_app(start_background=None):
+    """Flask 애플리케이션 팩토리 (start_background 기본값: BACKGROUND_WORKERS 환경 변수)"""
     app = Flask(__name__)
     
     # 설정
@@ -34,11 +34,9 @@ def create_app():
     login_manager.login_message = '로그인이 필요합니다.'
     login_manager.login_message_category = 'info'
     
-    # user_loader 함수 설정
-    @login_manager.user_loader
-    def load_user(user_id):
-        from app.models import User
-        return User.query.get(int(user_id))
+    # user_loader 함수 설정 (사용자 스냅샷 캐시, 사용자 변경 시 무효화)
+    from app.services.identity_cache import load_user
+    login_manager.user_loader(load_user)
     
     # 블루프린트 등록
     from app.routes.auth import auth_bp
@@ -65,4 +63,52 @@ def create_app():
         except Exception as e:
             print(f"❌ 데이터베이스 연결 실패: {e}")
     
+    # 백그라운드 스레드와 시작 시 준비 작업은 서버 프로세스에서만
+    # (CLI 명령, init_db.py, 스크립트에서는 BACKGROUND_WORKERS를 켜지 않음)
+    if start_background is None:
+        start_background = os.getenv('BACKGROUND_WORKERS', 'false').lower() == 'true'
+    if start_background:
+        start_background_services(app)
+    
     return app
+
+def start_background_services(app):
+    """서버 프로세스용 백그라운드 스레드 시작 및 시작 시 준비 작업 (한 번만 실행)"""
+    if app.extensions.get('background_services'):
+        return
+    app.extensions['background_services'] = True
+    
+    # 백그라운드 작업 스레드 시작 (JOB_WORKER_THREADS=0이면 비활성화)
+    from app.services.job_queue import start_job_worker
+    app.extensions['job_worker'] = start_job_worker(app)
+    
+    # 검색 인덱스 동기화 스레드 (SEARCH_OUTBOX_DISPATCHER=false면 비활성화)
+    from app.services.search_outbox import start_outbox_dispatcher
+    app.extensions['search_outbox'] = start_outbox_dispatcher(app)
+    
+    # 조회수 버퍼 반영 스레드 (VIEW_FLUSH_INTERVAL 주기)
+    from app.services.view_counter import start_view_counter
+    app.extensions['view_counter'] = start_view_counter(app)
+    
+    # 검색어 로그 기록/인기 검색어 집계 스레드 (QUERY_LOG_ENABLED=false면 비활성화)
+    from app.services.query_log import start_query_log
+    app.extensions['query_log'] = start_query_log(app)
+    
+    # 자동완성 인덱스 최초 생성 (백그라운드, 준비 전에는 인기 검색어만 제안)
+    from app.services.suggestions import get_suggestion_index
+    get_suggestion_index().ensure_fresh(app)
+    
+    # 검색 인덱스/별칭 준비 및 매핑 확인 (문서 쓰기 경로에서는 확인하지 않음)
+    if os.getenv('ES_VERIFY_ON_STARTUP', 'true').lower() == 'true':
+        from app.services.index_manager import IndexManager
+        try:
+            IndexManager().ensure_index()
+        except Exception as e:
+            print(f"❌ 검색 인덱스 확인 실패: {e}")
+    
+    # LLM 모델 사전 로딩 (LLM_WARMUP=all 또는 embedding,generation 등)
+    warmup = os.getenv('LLM_WARMUP', '').strip()
+    if warmup:
+        from app.services.model_registry import get_model_registry
+        names = None if warmup == 'all' else [name.strip() for name in warmup.split(',')]
+        get_model_registry().warm_up(names)
@@ -3,5 +3,8 @@ from .post import Post, Comment, Like
 from .category import Category
 from .profile import Profile
 from .faq import FAQ
+from .summary import DocumentSummary
+from .job import Job
+from .search_outbox import SearchOutbox
 
-__all__ = ['User', 'Post', 'Comment', 'Like', 'Category', 'Profile', 'FAQ']
+__all__ = ['User', 'Post', 'Comment', 'Like', 'Category', 'Profile', 'FAQ', 'DocumentSummary', 'Job', 'SearchOutbox']
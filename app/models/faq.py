@@ -15,6 +15,9 @@ class FAQ(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # 활성 FAQ 목록 조회용 인덱스
+    __table_args__ = (db.Index('ix_faqs_active', 'is_active', 'id'),)
+
     def __repr__(self):
         return f'<FAQ {self.question}>'
 
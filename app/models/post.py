@@ -10,7 +10,10 @@ class Post(db.Model):
     content = db.Column(db.Text, nullable=False)
     summary = db.Column(db.String(500))  # 게시글 요약
     tags = db.Column(db.String(200))  # 태그 (쉼표로 구분)
-    view_count = db.Column(db.Integer, default=0)
+    view_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # 비정규화 카운터 (좋아요/댓글 작성 시 원자적으로 증감, post_counters.reconcile로 보정)
+    like_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    comment_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     is_published = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -23,13 +26,22 @@ class Post(db.Model):
     comments = db.relationship('Comment', backref='post', lazy='dynamic', cascade='all, delete-orphan')
     likes = db.relationship('Like', backref='post', lazy='dynamic', cascade='all, delete-orphan')
     
+    # 게시 상태별 정렬/키셋 페이지네이션용 인덱스 (정렬 키, id 순서)
+    __table_args__ = (
+        db.Index('ix_posts_published_created', 'is_published', 'created_at', 'id'),
+        db.Index('ix_posts_published_views', 'is_published', 'view_count', 'id'),
+        db.Index('ix_posts_published_like_count', 'is_published', 'like_count', 'id'),
+        db.Index('ix_posts_published_comment_count', 'is_published', 'comment_count', 'id'),
+        db.Index('ix_posts_category_published_created', 'category_id', 'is_published', 'created_at', 'id'),
+    )
+    
     def get_like_count(self):
-        """좋아요 수 반환"""
-        return self.likes.count()
+        """좋아요 수 반환 (카운터 컬럼)"""
+        return self.like_count or 0
     
     def get_comment_count(self):
-        """댓글 수 반환"""
-        return self.comments.count()
+        """댓글 수 반환 (카운터 컬럼)"""
+        return self.comment_count or 0
     
     def get_tags_list(self):
         """태그 리스트 반환"""
@@ -57,6 +69,11 @@ class Comment(db.Model):
     # 관계 설정
     replies = db.relationship('Comment', backref=db.backref('parent', remote_side=[id]))
     
+    # 게시글별 댓글 트리 조회용 인덱스 (post_id 조건 + 작성순 정렬)
+    __table_args__ = (
+        db.Index('ix_comments_post_created', 'post_id', 'created_at', 'id'),
+    )
+    
     def __repr__(self):
         return f'<Comment {self.id}>'
 
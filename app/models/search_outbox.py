@@ -0,0 +1,35 @@
+from datetime import datetime
+from app import db
+
+
+class SearchOutbox(db.Model):
+    """검색 인덱스 동기화 아웃박스 (게시글/FAQ 변경과 같은 트랜잭션에 기록)"""
+    __tablename__ = 'search_outbox'
+
+    id = db.Column(db.Integer, primary_key=True)  # 문서별 적용 순서 (ES 외부 버전으로 사용)
+    doc_id = db.Column(db.String(50), nullable=False)  # 'post-1', 'faq-1' 등 검색 문서 ID
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending/failed (처리 완료 시 삭제)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # 재시도 대기 시각
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_search_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+        db.Index('ix_search_outbox_doc_id', 'doc_id'),
+    )
+
+    def to_dict(self):
+        """딕셔너리로 변환"""
+        return {
+            'id': self.id,
+            'doc_id': self.doc_id,
+            'status': self.status,
+            'attempts': self.attempts,
+            'last_error': self.last_error,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+        }
+
+    def __repr__(self):
+        return f'<SearchOutbox {self.id} {self.doc_id} {self.status}>'
@@ -0,0 +1,17 @@
+from datetime import datetime
+from app import db
+
+
+class DocumentSummary(db.Model):
+    """문서 요약 캐시 (문서 ID + 내용 해시 기준)"""
+    __tablename__ = 'document_summaries'
+
+    id = db.Column(db.Integer, primary_key=True)
+    doc_id = db.Column(db.String(50), nullable=False, unique=True)  # 'post-1', 'faq-1' 등 검색 문서 ID
+    content_hash = db.Column(db.String(40), nullable=False)  # 요약 대상 내용의 SHA-1
+    summary = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<DocumentSummary {self.doc_id}>'
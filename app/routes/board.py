@@ -1,49 +1,40 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, abort
 from flask_login import login_required, current_user
-from app.models import Post, Comment, Like, Category
+from app.models import Post, Comment, Like
 from app import db
-from app.services.elasticsearch_service import ElasticsearchService
+from app.services.answer_cache import get_answer_cache
+from app.services.job_queue import enqueue_post_processing
+from app.services.search_outbox import record_search_change
+from app.services import post_counters
+from app.services.view_counter import get_view_counter, viewer_key
+from app.services.category_cache import get_category_cache
+from app.services.post_queries import (
+    published_posts, paginate_posts, post_summary, get_post_or_404, load_comment_tree
+)
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 
 board_bp = Blueprint('board', __name__)
 
+# 게시판 목록 페이지 크기
+LIST_PAGE_SIZE = 10
+
 @board_bp.route('/')
 @login_required
 def list_posts():
-    """게시글 목록"""
-    page = request.args.get('page', 1, type=int)
+    """게시글 목록 (키셋 커서 페이지네이션)"""
+    cursor = request.args.get('cursor')
     category_id = request.args.get('category', type=int)
     sort_by = request.args.get('sort', 'latest')
     
-    query = Post.query.filter_by(is_published=True)
-    
-    if category_id:
-        query = query.filter(Post.category_id == category_id)
-    
-    # 정렬
-    if sort_by == 'popular':
-        query = query.order_by(Post.view_count.desc())
-    elif sort_by == 'likes':
-        query = query.order_by(Post.created_at.desc())  # 임시로 최신순
-    else:  # latest
-        query = query.order_by(Post.created_at.desc())
-    
-    posts = query.paginate(
-        page=page,
-        per_page=10,
-        error_out=False
-    )
-    
-    categories = Category.query.filter_by(is_active=True).all()
+    # 카테고리 목록/카테고리별 게시글 수는 메모리 읽기 모델 사용
+    category_cache = get_category_cache()
+    categories = category_cache.categories()
+    category_counts = category_cache.counts()
+    total_published = sum(category_counts.values())
     
-    # 카테고리별 게시글 수 (게시 상태만 집계)
-    category_counts_query = db.session.query(
-        Post.category_id,
-        db.func.count(Post.id)
-    ).filter_by(is_published=True).group_by(Post.category_id).all()
-    category_counts = {cid: count for cid, count in category_counts_query}
-    
-    total_published = Post.query.filter_by(is_published=True).count()
+    posts = _list_page(category_id, sort_by, cursor)
+    posts.total = category_counts.get(category_id, 0) if category_id else total_published
     
     return render_template('board/list.html',
                          posts=posts,
@@ -53,20 +44,47 @@ def list_posts():
                          category_counts=category_counts,
                          total_published=total_published)
 
+@board_bp.route('/api/posts')
+@login_required
+def list_posts_api():
+    """게시글 목록 JSON (무한 스크롤, 목록 화면과 같은 커서 사용)"""
+    posts = _list_page(
+        request.args.get('category', type=int),
+        request.args.get('sort', 'latest'),
+        request.args.get('cursor'),
+        per_page=min(request.args.get('size', LIST_PAGE_SIZE, type=int), 50)
+    )
+    return jsonify({
+        'posts': [post_summary(post) for post in posts.items],
+        'next_cursor': posts.next_cursor,
+    })
+
+def _list_page(category_id, sort_by, cursor, per_page=None):
+    """게시판 목록 한 페이지"""
+    query = published_posts()
+    if category_id:
+        query = query.filter(Post.category_id == category_id)
+    return paginate_posts(query, sort_by, cursor, per_page or LIST_PAGE_SIZE)
+
 @board_bp.route('/<int:post_id>')
 def view_post(post_id):
     """게시글 상세보기"""
-    post = Post.query.get_or_404(post_id)
+    post = get_post_or_404(post_id)
     
-    # 조회수 증가
-    post.view_count += 1
-    db.session.commit()
+    # 조회수는 버퍼에 기록하고 플러시 스레드가 일괄 반영 (요청 경로에서 쓰기 없음)
+    view_counter = get_view_counter()
+    user_agent = request.headers.get('User-Agent')
+    view_counter.record(
+        post_id,
+        viewer=viewer_key(current_user.get_id(), request.remote_addr, user_agent),
+        user_agent=user_agent
+    )
+    view_count = (post.view_count or 0) + view_counter.pending(post_id)
     
-    # 댓글 가져오기
-    comments = Comment.query.filter_by(post_id=post_id, parent_id=None)\
-        .order_by(Comment.created_at.asc()).all()
+    # 댓글 트리 가져오기 (작성자 포함 한 번에 조회)
+    comments = load_comment_tree(post_id)
     
-    return render_template('board/detail.html', post=post, comments=comments)
+    return render_template('board/detail.html', post=post, comments=comments, view_count=view_count)
 
 @board_bp.route('/write', methods=['GET', 'POST'])
 @login_required
@@ -95,28 +113,10 @@ def write_post():
         
         try:
             db.session.add(post)
+            db.session.flush()  # id 확보
+            # 검색 인덱스 동기화/요약은 백그라운드에서 처리 (같은 트랜잭션에 등록)
+            enqueue_post_processing(post.id)
             db.session.commit()
-
-            # Elasticsearch 인덱싱
-            try:
-                es = ElasticsearchService()
-                es.create_index()
-                doc = {
-                    "doc_type": "post",
-                    "title": post.title,
-                    "content": post.content,
-                    "tags": post.get_tags_list(),
-                    "category": post.category.name if post.category else None,
-                    "author": post.author.username if post.author else None,
-                    "created_at": post.created_at.isoformat() if post.created_at else None,
-                    "view_count": post.view_count,
-                    "like_count": post.get_like_count(),
-                    "post_id": post.id,
-                }
-                es.index_document(f"post-{post.id}", doc)
-            except Exception as es_e:
-                # 검색 인덱싱 실패는 치명적이지 않으므로 로그만 출력
-                print(f"Elasticsearch 인덱싱 실패 (post create): {es_e}")
             
             if request.is_json:
                 return jsonify({'message': '게시글이 작성되었습니다.', 'redirect': url_for('board.view_post', post_id=post.id)})
@@ -128,7 +128,7 @@ def write_post():
                 return jsonify({'error': '게시글 작성 중 오류가 발생했습니다.'}), 500
             flash('게시글 작성 중 오류가 발생했습니다.', 'error')
     
-    categories = Category.query.filter_by(is_active=True).all()
+    categories = get_category_cache().categories()
     return render_template('board/write.html', categories=categories)
 
 @board_bp.route('/<int:post_id>/edit', methods=['GET', 'POST'])
@@ -149,26 +149,10 @@ def edit_post(post_id):
         post.category_id = data.get('category_id', post.category_id, type=int)
         
         try:
+            # 검색 인덱스 동기화/요약은 백그라운드에서 처리 (같은 트랜잭션에 등록)
+            enqueue_post_processing(post.id)
             db.session.commit()
-
-            # Elasticsearch 문서 업데이트
-            try:
-                es = ElasticsearchService()
-                doc = {
-                    "doc_type": "post",
-                    "title": post.title,
-                    "content": post.content,
-                    "tags": post.get_tags_list(),
-                    "category": post.category.name if post.category else None,
-                    "author": post.author.username if post.author else None,
-                    "created_at": post.created_at.isoformat() if post.created_at else None,
-                    "view_count": post.view_count,
-                    "like_count": post.get_like_count(),
-                    "post_id": post.id,
-                }
-                es.update_document(f"post-{post.id}", doc)
-            except Exception as es_e:
-                print(f"Elasticsearch 인덱스 업데이트 실패 (post edit): {es_e}")
+            get_answer_cache().invalidate_doc(f"post-{post.id}")
             
             if request.is_json:
                 return jsonify({'message': '게시글이 수정되었습니다.', 'redirect': url_for('board.view_post', post_id=post.id)})
@@ -180,7 +164,7 @@ def edit_post(post_id):
                 return jsonify({'error': '게시글 수정 중 오류가 발생했습니다.'}), 500
             flash('게시글 수정 중 오류가 발생했습니다.', 'error')
     
-    categories = Category.query.filter_by(is_active=True).all()
+    categories = get_category_cache().categories()
     return render_template('board/edit.html', post=post, categories=categories)
 
 @board_bp.route('/<int:post_id>/delete', methods=['POST'])
@@ -195,14 +179,10 @@ def delete_post(post_id):
     
     try:
         db.session.delete(post)
+        # 검색 인덱스 삭제는 아웃박스 디스패처가 처리 (같은 트랜잭션에 기록)
+        record_search_change(f"post-{post_id}")
         db.session.commit()
-
-        # Elasticsearch 문서 삭제
-        try:
-            es = ElasticsearchService()
-            es.delete_document(f"post-{post.id}")
-        except Exception as es_e:
-            print(f"Elasticsearch 문서 삭제 실패 (post delete): {es_e}")
+        get_answer_cache().invalidate_doc(f"post-{post_id}")
         
         if request.is_json:
             return jsonify({'message': '게시글이 삭제되었습니다.', 'redirect': url_for('board.list_posts')})
@@ -219,30 +199,36 @@ def delete_post(post_id):
 @login_required
 def toggle_like(post_id):
     """좋아요 토글"""
-    post = Post.query.get_or_404(post_id)
-    
-    existing_like = Like.query.filter_by(user_id=current_user.id, post_id=post_id).first()
-    
-    if existing_like:
-        db.session.delete(existing_like)
-        liked = False
-    else:
-        like = Like(user_id=current_user.id, post_id=post_id)
-        db.session.add(like)
-        liked = True
+    Post.query.get_or_404(post_id)
     
     try:
+        # 삭제된 행 수로 좋아요 여부를 판단해 동시 요청에서도 카운터가 한 번만 바뀌게 함
+        deleted = Like.query.filter_by(user_id=current_user.id, post_id=post_id)\
+            .delete(synchronize_session=False)
+        if deleted:
+            liked = False
+        else:
+            db.session.add(Like(user_id=current_user.id, post_id=post_id))
+            db.session.flush()
+            liked = True
+        post_counters.increment(post_id, 'like_count', 1 if liked else -1)
         db.session.commit()
-        return jsonify({'liked': liked, 'like_count': post.get_like_count()})
+    except IntegrityError:
+        # 같은 사용자의 동시 요청이 먼저 좋아요를 기록함
+        db.session.rollback()
+        liked = True
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': '좋아요 처리 중 오류가 발생했습니다.'}), 500
+    
+    like_count, _ = post_counters.current_counts(post_id)
+    return jsonify({'liked': liked, 'like_count': like_count})
 
 @board_bp.route('/<int:post_id>/comment', methods=['POST'])
 @login_required
 def add_comment(post_id):
     """댓글 작성"""
-    post = Post.query.get_or_404(post_id)
+    Post.query.get_or_404(post_id)
     data = request.get_json() if request.is_json else request.form
     content = data.get('content')
     parent_id = data.get('parent_id', type=int)
@@ -262,6 +248,7 @@ def add_comment(post_id):
     
     try:
         db.session.add(comment)
+        post_counters.increment(post_id, 'comment_count')
         db.session.commit()
         
         if request.is_json:
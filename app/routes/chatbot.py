@@ -3,10 +3,20 @@ import requests
 import os
 import json
 from app.models import FAQ
-from app.services.elasticsearch_service import ElasticsearchService
+from app.services.retrieval import HybridRetriever
+from app.services.elasticsearch_service import get_circuit_breaker
+from app.services.llm_service import get_llm_service
+from app.services.inference_server import get_inference_server
+from app.services.api_llm_service import APILLMService, stream_openai_chat
+from app.services.answer_cache import get_answer_cache
+from app.services.streaming import sse_response, truncate_stream, wants_stream
+from app.services.query_log import log_query
 
 chatbot_bp = Blueprint('chatbot', __name__)
 
+# 모델/OpenAI 응답이 모두 없을 때의 기본 응답 (답변 캐시에는 저장하지 않음)
+DEFAULT_RESPONSE = "죄송합니다. 해당 질문에 대한 답변을 찾을 수 없습니다. 다른 질문을 해주시거나 연락처 페이지를 확인해주세요."
+
 def _load_faq_data():
     """DB에서 활성화된 FAQ를 읽어 dict로 반환 (기존 템플릿 호환용)"""
     faqs = FAQ.query.filter_by(is_active=True).order_by(FAQ.id.asc()).all()
@@ -21,53 +31,73 @@ def chat():
 @chatbot_bp.route('/send', methods=['POST'])
 def send_message():
     """챗봇 메시지 처리 (일반 챗봇 - 간단한 답변)"""
-    from app.services.llm_service import LLMService
-    
     data = request.get_json()
     user_message = data.get('message', '').strip()
     
     if not user_message:
         return jsonify({'error': '메시지를 입력해주세요.'}), 400
     
-    # 1단계: Elasticsearch에서 FAQ/게시글 검색
-    es_service = ElasticsearchService()
-    search_result = es_service.search_documents(user_message, size=5)
-    high_score_faq_answer = None
-    related_docs = []
-
-    if search_result:
-        hits = search_result.get('hits', {}).get('hits', [])
-        related_docs = hits
-        if hits:
-            top_hit = hits[0]
-            score = top_hit.get('_score', 0)
-            source = top_hit.get('_source', {})
-            # doc_type이 faq이고 점수가 임계값 이상이면 FAQ 직접 응답 (LLM 사용 안 함)
-            if source.get('doc_type') == 'faq' and score >= 5.0:
-                high_score_faq_answer = source.get('content')
+    log_query(user_message, 'chatbot')
+    
+    # 1단계: BM25 + 벡터 하이브리드 검색으로 FAQ/게시글 조회
+    retrieval = HybridRetriever().retrieve(user_message, size=5)
+    related_docs = retrieval.hits
+    # 1위 FAQ의 신뢰도가 기준 이상이면 FAQ 직접 응답 (LLM 사용 안 함)
+    high_score_faq_answer = retrieval.faq_answer
     
-    # 점수 높은 FAQ가 있으면 바로 응답
+    if retrieval.strategy == 'unavailable':
+        # 검색 서비스 장애 시 DB 기반 FAQ 매칭으로 폴백
+        high_score_faq_answer = get_faq_response(user_message)
+    
+    # 신뢰도 높은 FAQ가 있으면 바로 응답
     if high_score_faq_answer:
-        return jsonify({'response': high_score_faq_answer, 'related_docs': related_docs})
+        if wants_stream(data):
+            return sse_response(iter([high_score_faq_answer]), related_docs=related_docs, confidence=retrieval.confidence)
+        return jsonify({'response': high_score_faq_answer, 'related_docs': related_docs, 'confidence': retrieval.confidence})
     
     # LLM을 사용한 응답 생성 (ES 검색 결과를 컨텍스트로 활용) - 100자 이내 간단한 답변
-    try:
-        llm_service = LLMService()
-        context = ""
-        if related_docs:
-            for doc in related_docs[:3]:
-                src = doc.get('_source', {})
-                title = src.get('title') or src.get('question') or ''
-                content = src.get('content', '')[:200]
-                context += f"제목: {title}\n내용: {content}\n\n"
+    context = ""
+    if related_docs:
+        for doc in related_docs[:3]:
+            src = doc.get('_source', {})
+            title = src.get('title') or src.get('question') or ''
+            content = src.get('content', '')[:200]
+            context += f"제목: {title}\n내용: {content}\n\n"
+    
+    if context:
+        prompt = f"다음 FAQ/게시글 내용을 참고하여 사용자의 질문에 간단하게(100자 이내) 한국어로 답변해줘.\n\n[컨텍스트]\n{context}\n[질문]\n{user_message}\n[답변]"
+    else:
+        prompt = user_message
+    
+    # 같은 질문/컨텍스트에 대한 캐시된 응답이 있으면 LLM 생성 생략
+    answer_cache = get_answer_cache()
+    doc_ids = [doc.get('_id') for doc in related_docs]
+    cached_response = answer_cache.get(user_message, "concise", "send", doc_ids)
+    if cached_response:
+        if wants_stream(data):
+            return sse_response(iter([cached_response]))
+        return jsonify({'response': cached_response})
+    
+    if wants_stream(data):
+        state = {'fallback': False}
+        chunks = _stream_answer(
+            prompt, max_length=100, mode="concise",
+            fallback_stream=lambda: stream_openai_response(user_message),
+            state=state
+        )
         
-        if context:
-            prompt = f"다음 FAQ/게시글 내용을 참고하여 사용자의 질문에 간단하게(100자 이내) 한국어로 답변해줘.\n\n[컨텍스트]\n{context}\n[질문]\n{user_message}\n[답변]"
-        else:
-            prompt = user_message
+        def cache_answer(response):
+            # 기본 응답은 캐시하지 않음
+            if not state['fallback']:
+                answer_cache.set(user_message, "concise", "send", doc_ids, response)
+        
+        return sse_response(truncate_stream(chunks, 100), on_complete=cache_answer)
+    
+    try:
+        inference = get_inference_server()
 
         # 일반 챗봇은 간단한 답변 (100자 이내)
-        response = llm_service.generate_response(prompt, max_length=100, mode="concise")
+        response = inference.generate(prompt, max_length=100, mode="concise")
         
         # 문자 수 제한 (100자 이내)
         if response and len(response) > 100:
@@ -83,12 +113,35 @@ def send_message():
         if response and len(response) > 100:
             response = response[:100].rsplit(' ', 1)[0] + "..."
     
+    if response:
+        answer_cache.set(user_message, "concise", "send", doc_ids, response)
+    
     # 기본 응답 (우선순위 4)
     if not response:
-        response = "죄송합니다. 해당 질문에 대한 답변을 찾을 수 없습니다. 다른 질문을 해주시거나 연락처 페이지를 확인해주세요."
+        response = DEFAULT_RESPONSE
     
     return jsonify({'response': response})
 
+def _stream_answer(prompt, max_length, mode, fallback_stream=None, state=None):
+    """LLM 스트리밍 응답 (모델 출력이 없으면 OpenAI 스트리밍, 그 외 기본 응답)
+
+    기본 응답을 내보낸 경우 state['fallback']을 True로 설정합니다.
+    """
+    produced = False
+    for chunk in get_llm_service().stream_response(prompt, max_length=max_length, mode=mode):
+        produced = True
+        yield chunk
+    
+    if not produced and fallback_stream and os.getenv('OPENAI_API_KEY'):
+        for chunk in fallback_stream():
+            produced = True
+            yield chunk
+    
+    if not produced:
+        if state is not None:
+            state['fallback'] = True
+        yield DEFAULT_RESPONSE
+
 def get_faq_response(message):
     """
     (백업용) 간단한 FAQ 매칭 로직
@@ -111,6 +164,24 @@ def get_faq_response(message):
 
     return None
 
+def _openai_request_data(message):
+    """챗봇용 OpenAI 요청 본문"""
+    return {
+        'model': 'gpt-3.5-turbo',
+        'messages': [
+            {
+                'role': 'system',
+                'content': '당신은 개발자 포트폴리오 사이트의 챗봇입니다. 간단하고 친근하게 답변해주세요.'
+            },
+            {
+                'role': 'user',
+                'content': message
+            }
+        ],
+        'max_tokens': 150,
+        'temperature': 0.7
+    }
+
 def get_openai_response(message):
     """OpenAI API를 통한 응답 생성"""
     try:
@@ -119,21 +190,7 @@ def get_openai_response(message):
             'Content-Type': 'application/json'
         }
         
-        data = {
-            'model': 'gpt-3.5-turbo',
-            'messages': [
-                {
-                    'role': 'system',
-                    'content': '당신은 개발자 포트폴리오 사이트의 챗봇입니다. 간단하고 친근하게 답변해주세요.'
-                },
-                {
-                    'role': 'user',
-                    'content': message
-                }
-            ],
-            'max_tokens': 150,
-            'temperature': 0.7
-        }
+        data = _openai_request_data(message)
         
         response = requests.post(
             'https://api.openai.com/v1/chat/completions',
@@ -152,6 +209,27 @@ def get_openai_response(message):
         print(f"OpenAI API 오류: {e}")
         return None
 
+def stream_openai_response(message):
+    """OpenAI API 스트리밍 응답 (텍스트 조각 단위)"""
+    try:
+        yield from stream_openai_chat(os.getenv('OPENAI_API_KEY'), _openai_request_data(message), timeout=10)
+    except Exception as e:
+        print(f"OpenAI API 스트리밍 오류: {e}")
+
+@chatbot_bp.route('/health')
+def health():
+    """LLM 모델 로딩 상태 확인"""
+    status = get_llm_service().get_status()
+    status['elasticsearch'] = get_circuit_breaker().stats()
+    failed = [name for name, info in status['models'].items() if info['state'] == 'failed']
+    status['status'] = 'degraded' if failed or status['elasticsearch']['state'] != 'closed' else 'ok'
+    return jsonify(status), 503 if failed else 200
+
+@chatbot_bp.route('/inference/metrics')
+def inference_metrics():
+    """추론 서버 배치 처리 통계"""
+    return jsonify(get_inference_server().metrics())
+
 @chatbot_bp.route('/faq')
 def faq():
     """FAQ 페이지"""
@@ -167,9 +245,6 @@ def advanced_chat():
 @chatbot_bp.route('/ai-chat', methods=['POST'])
 def ai_chat():
     """AI 기반 챗봇 응답"""
-    from app.services.llm_service import LLMService
-    from app.services.elasticsearch_service import ElasticsearchService
-    
     data = request.get_json()
     user_message = data.get('message', '').strip()
     mode = data.get('mode', 'concise')
@@ -178,40 +253,72 @@ def ai_chat():
     if not user_message:
         return jsonify({'error': '메시지를 입력해주세요.'}), 400
     
-    llm_service = LLMService()
-    es_service = ElasticsearchService()
+    log_query(user_message, 'chatbot')
     
-    try:
-        # 고급 챗봇은 300자 이내 상세한 답변
-        max_chars = 300
+    inference = get_inference_server()
+    retriever = HybridRetriever()
+    answer_cache = get_answer_cache()
+    stream = wants_stream(data)
+    
+    # 고급 챗봇은 300자 이내 상세한 답변
+    max_chars = 300
+    
+    def _respond(prompt=None, response=None, **extra):
+        """직접 응답 또는 LLM 응답 반환 (스트리밍 요청 시 SSE)"""
+        extra.update(mode=mode, search_mode=search_mode)
+        doc_ids = [doc.get('_id') for doc in extra.get('related_docs', [])]
+        if response is None:
+            # 같은 질문/컨텍스트에 대한 캐시된 응답이 있으면 LLM 생성 생략
+            response = answer_cache.get(user_message, mode, search_mode, doc_ids)
+        
+        if stream:
+            if response is not None:
+                chunks = iter([response])
+            else:
+                state = {'fallback': False}
+                chunks = truncate_stream(
+                    _stream_answer(
+                        prompt, max_length=300, mode=mode,
+                        fallback_stream=lambda: APILLMService().stream_response_openai(prompt, mode=mode),
+                        state=state
+                    ),
+                    max_chars
+                )
+                
+                def cache_answer(text):
+                    # 기본 응답은 캐시하지 않음
+                    if not state['fallback']:
+                        answer_cache.set(user_message, mode, search_mode, doc_ids, text)
+                
+                return sse_response(chunks, on_complete=cache_answer, **extra)
+            return sse_response(chunks, **extra)
         
+        if response is None:
+            response = inference.generate(prompt, max_length=300, mode=mode)
+            if response is None:
+                # 모델 출력이 없으면 기본 응답 (캐시하지 않음)
+                return jsonify(dict(extra, response=get_llm_service().get_fallback_response(prompt)))
+            # 문자 수 제한
+            if len(response) > max_chars:
+                response = response[:max_chars].rsplit(' ', 1)[0] + "..."
+            answer_cache.set(user_message, mode, search_mode, doc_ids, response)
+        return jsonify(dict(extra, response=response))
+    
+    try:
         if search_mode == 'faq':
-            # FAQ 모드 - 먼저 ES에서 FAQ/게시글 검색
-            search_result = es_service.search_documents(user_message, size=5)
-            related_docs = []
-            response = None
-
-            high_score_faq_answer = None
+            # FAQ 모드 - 먼저 하이브리드 검색으로 FAQ/게시글 조회
+            retrieval = retriever.retrieve(user_message, size=5)
+            related_docs = retrieval.hits
+            # 1위 FAQ의 신뢰도가 기준 이상이면 FAQ 직접 응답 (LLM 사용 안 함)
+            high_score_faq_answer = retrieval.faq_answer
 
-            if search_result:
-                hits = search_result.get('hits', {}).get('hits', [])
-                related_docs = hits
-                if hits:
-                    top_hit = hits[0]
-                    score = top_hit.get('_score', 0)
-                    source = top_hit.get('_source', {})
-                    # doc_type이 faq이고 점수가 임계값 이상이면 FAQ 직접 응답 (LLM 사용 안 함)
-                    if source.get('doc_type') == 'faq' and score >= 5.0:
-                        high_score_faq_answer = source.get('content')
-
-            # 점수 높은 FAQ가 있으면 바로 응답
+            # 신뢰도 높은 FAQ가 있으면 바로 응답
             if high_score_faq_answer:
-                return jsonify({
-                    'response': high_score_faq_answer,
-                    'related_docs': related_docs,
-                    'mode': mode,
-                    'search_mode': search_mode
-                })
+                return _respond(
+                    response=high_score_faq_answer,
+                    related_docs=related_docs,
+                    confidence=retrieval.confidence
+                )
 
             # 그 외에는 ES 결과를 컨텍스트로 하여 LLM에 전달
             context = ""
@@ -231,33 +338,17 @@ def ai_chat():
                 # ES 결과가 없으면 기존 DB 기반 FAQ 매칭을 시도
                 response = get_faq_response(user_message)
                 if response:
-                    return jsonify({
-                        'response': response,
-                        'mode': mode,
-                        'search_mode': search_mode
-                    })
+                    return _respond(response=response)
                 prompt = user_message
 
-            response = llm_service.generate_response(prompt, max_length=300, mode=mode)
-            if response and len(response) > max_chars:
-                response = response[:max_chars].rsplit(' ', 1)[0] + "..."
-
-            return jsonify({
-                'response': response,
-                'related_docs': related_docs,
-                'mode': mode,
-                'search_mode': search_mode
-            })
+            return _respond(prompt, related_docs=related_docs)
             
         elif search_mode == 'search':
-            # 검색 모드 - Elasticsearch 검색 + LLM 응답
-            search_result = es_service.search_documents(user_message, size=3)
-            related_docs = []
-            
-            if search_result:
-                related_docs = search_result.get('hits', {}).get('hits', [])
+            # 검색 모드 - 하이브리드 검색 + LLM 응답
+            related_docs = retriever.retrieve(user_message, size=3).hits
             
             # 검색 결과 기반 응답 생성
+            prompt = user_message
             if related_docs:
                 context = ""
                 for doc in related_docs:
@@ -265,34 +356,12 @@ def ai_chat():
                     context += f"내용: {doc['_source'].get('content', '')[:200]}...\n\n"
                 
                 prompt = f"다음 문서들을 참고하여 '{user_message}'에 대해 답변해주세요:\n\n{context}"
-                response = llm_service.generate_response(prompt, max_length=300, mode=mode)
-            else:
-                response = llm_service.generate_response(user_message, max_length=300, mode=mode)
             
-            # 문자 수 제한
-            if response and len(response) > max_chars:
-                response = response[:max_chars].rsplit(' ', 1)[0] + "..."
-            
-            return jsonify({
-                'response': response,
-                'related_docs': related_docs,
-                'mode': mode,
-                'search_mode': search_mode
-            })
+            return _respond(prompt, related_docs=related_docs)
             
         elif search_mode == 'ai':
             # AI 모드 - 순수 LLM 응답 (300자 이내 상세한 답변)
-            response = llm_service.generate_response(user_message, max_length=300, mode=mode)
-            
-            # 문자 수 제한
-            if response and len(response) > max_chars:
-                response = response[:max_chars].rsplit(' ', 1)[0] + "..."
-            
-            return jsonify({
-                'response': response,
-                'mode': mode,
-                'search_mode': search_mode
-            })
+            return _respond(user_message)
             
     except Exception as e:
         print(f"AI 챗봇 오류: {e}")
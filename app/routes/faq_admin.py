@@ -2,32 +2,12 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_required, current_user
 from app import db
 from app.models import FAQ
-from app.services.elasticsearch_service import ElasticsearchService
+from app.services.answer_cache import get_answer_cache
+from app.services.search_outbox import record_search_change
 
 faq_admin_bp = Blueprint('faq_admin', __name__, url_prefix='/admin/faq')
 
 
-def _index_faq_to_es(faq: FAQ):
-    """FAQ를 Elasticsearch에 인덱싱"""
-    es = ElasticsearchService()
-    es.create_index()
-    doc = {
-        "doc_type": "faq",
-        "title": faq.question,
-        "content": faq.answer,
-        "category": faq.category,
-        "created_at": faq.created_at.isoformat() if faq.created_at else None,
-        "faq_id": faq.id,
-    }
-    es.index_document(f"faq-{faq.id}", doc)
-
-
-def _delete_faq_from_es(faq_id: int):
-    """FAQ를 Elasticsearch에서 삭제"""
-    es = ElasticsearchService()
-    es.delete_document(f"faq-{faq_id}")
-
-
 @faq_admin_bp.before_request
 @login_required
 def require_admin():
@@ -58,8 +38,10 @@ def create():
     faq = FAQ(question=question, answer=answer, category=category)
     try:
         db.session.add(faq)
+        db.session.flush()  # id 확보
+        # 검색 인덱스 동기화는 아웃박스 디스패처가 처리 (같은 트랜잭션에 기록)
+        record_search_change(f"faq-{faq.id}")
         db.session.commit()
-        _index_faq_to_es(faq)
         flash("FAQ가 추가되었습니다.", "success")
     except Exception as e:
         db.session.rollback()
@@ -80,8 +62,9 @@ def update(faq_id):
     faq.is_active = request.form.get("is_active") == "on"
 
     try:
+        record_search_change(f"faq-{faq.id}")
         db.session.commit()
-        _index_faq_to_es(faq)
+        get_answer_cache().invalidate_doc(f"faq-{faq.id}")
         flash("FAQ가 수정되었습니다.", "success")
     except Exception as e:
         db.session.rollback()
@@ -96,8 +79,9 @@ def delete(faq_id):
     faq = FAQ.query.get_or_404(faq_id)
     try:
         db.session.delete(faq)
+        record_search_change(f"faq-{faq_id}")
         db.session.commit()
-        _delete_faq_from_es(faq_id)
+        get_answer_cache().invalidate_doc(f"faq-{faq_id}")
         flash("FAQ가 삭제되었습니다.", "success")
     except Exception as e:
         db.session.rollback()
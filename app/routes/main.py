@@ -1,21 +1,35 @@
 from flask import Blueprint, render_template, request, jsonify
 from flask_login import login_required, current_user
-from app.models import Post, Category
+from app.models import Post
 from app.models.profile import Profile
 from app import db
+from app.services.query_log import log_query
+from app.services.elasticsearch_service import ElasticsearchService
+from app.services.pagination import CursorPage, encode_cursor, decode_cursor
+from app.services.post_queries import published_posts, paginate_posts, POST_SORTS
+from app.services.category_cache import get_category_cache
 
 main_bp = Blueprint('main', __name__)
 
+# 검색 결과 페이지 크기
+SEARCH_PAGE_SIZE = 10
+
+# 검색 페이지 정렬 → search_documents 정렬 (relevance는 관련도순)
+ES_SORTS = {'latest': 'latest', 'relevance': None}
+
+# 조회수/좋아요순 검색: ES에서 찾을 일치 게시글 수 (관련도순 상위, 이 안에서 DB 컬럼으로 정렬)
+SEARCH_MATCH_LIMIT = 1000
+
 @main_bp.route('/')
 def index():
     """메인 페이지"""
     # 최신 게시글 6개 가져오기
-    recent_posts = Post.query.filter_by(is_published=True)\
+    recent_posts = published_posts()\
         .order_by(Post.created_at.desc())\
         .limit(6).all()
     
-    # 인기 게시글 5개 가져오기 (좋아요 수 기준)
-    popular_posts = Post.query.filter_by(is_published=True)\
+    # 인기 게시글 5개 가져오기 (DB에 반영된 조회수 기준, 조회수는 주기적으로 일괄 반영)
+    popular_posts = published_posts()\
         .order_by(Post.view_count.desc())\
         .limit(5).all()
     
@@ -41,13 +55,99 @@ def contact():
 
 @main_bp.route('/search')
 def search():
-    """검색 페이지"""
-    query = request.args.get('q', '')
+    """검색 페이지 (커서 페이지네이션)
+
+    검색어가 있으면 Elasticsearch 인덱스로 검색하고 (search_after 커서, 전체
+    건수도 ES 응답 사용), ES를 사용할 수 없을 때만 DB LIKE 검색으로
+    대체합니다. 조회수/좋아요순은 인덱스의 카운터가 최신이 아니므로 ES로
+    일치하는 게시글만 찾고 DB 카운터 컬럼으로 정렬합니다. DB 조회는 정렬 키
+    기준 키셋 커서를 사용합니다.
+    """
+    query = request.args.get('q', '').strip()
     category_id = request.args.get('category', type=int)
     sort_by = request.args.get('sort', 'latest')
+    cursor = request.args.get('cursor')
+    
+    categories = get_category_cache().categories()
+    
+    posts = None
+    if query:
+        log_query(query, 'main')
+        posts = _es_search_page(query, category_id, categories, sort_by, cursor)
+    
+    if posts is None:
+        posts = _db_search_page(query, category_id, sort_by, cursor)
+    
+    return render_template('main/search.html',
+                         posts=posts,
+                         categories=categories,
+                         query=query,
+                         selected_category=category_id,
+                         sort_by=sort_by)
+
+
+def _es_search_page(query, category_id, categories, sort_by, cursor):
+    """ES 검색 결과 페이지 (ES를 사용할 수 없으면 None)"""
+    es_service = ElasticsearchService()
+    if not es_service.available:
+        return None
+    
+    filters = {'doc_type': 'post'}
+    if category_id:
+        category = next((c for c in categories if c.id == category_id), None)
+        if category is None:
+            return CursorPage([], SEARCH_PAGE_SIZE, total=0)
+        filters['category'] = category.name
+    
+    if sort_by in POST_SORTS and sort_by not in ES_SORTS:
+        return _es_match_page(es_service, query, filters, sort_by, cursor)
     
-    # 검색 쿼리 구성
-    search_query = Post.query.filter_by(is_published=True)
+    search_after = decode_cursor(cursor)
+    # 한 건을 더 받아 다음 페이지 여부 판단
+    response = es_service.search_documents(
+        query,
+        filters=filters,
+        size=SEARCH_PAGE_SIZE + 1,
+        sort=ES_SORTS.get(sort_by, 'latest'),
+        search_after=search_after
+    )
+    if response is None:
+        return None
+    
+    hits = response['hits']['hits']
+    next_cursor = encode_cursor(hits[SEARCH_PAGE_SIZE - 1]['sort']) if len(hits) > SEARCH_PAGE_SIZE else None
+    post_ids = [hit['_source'].get('post_id') for hit in hits[:SEARCH_PAGE_SIZE]]
+    post_ids = [post_id for post_id in post_ids if post_id]
+    posts_by_id = {
+        post.id: post for post in published_posts().filter(Post.id.in_(post_ids)).all()
+    } if post_ids else {}
+    
+    total = response['hits']['total']
+    return CursorPage(
+        [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id],
+        SEARCH_PAGE_SIZE,
+        cursor=cursor if search_after else None,
+        next_cursor=next_cursor,
+        total=total['value'] if isinstance(total, dict) else total
+    )
+
+
+def _es_match_page(es_service, query, filters, sort_by, cursor):
+    """ES로 찾은 일치 게시글을 DB 카운터 컬럼 기준으로 정렬한 페이지 (ES 실패 시 None)"""
+    post_ids = es_service.search_post_ids(query, filters=filters, size=SEARCH_MATCH_LIMIT)
+    if post_ids is None:
+        return None
+    if not post_ids:
+        return CursorPage([], SEARCH_PAGE_SIZE, total=0)
+    return paginate_posts(
+        published_posts().filter(Post.id.in_(post_ids)),
+        sort_by, cursor, SEARCH_PAGE_SIZE, total=len(post_ids)
+    )
+
+
+def _db_search_page(query, category_id, sort_by, cursor):
+    """DB 검색 결과 페이지 (검색어 없는 목록 또는 ES 장애 시, 전체 건수 계산 없음)"""
+    search_query = published_posts()
     
     if query:
         search_query = search_query.filter(
@@ -61,27 +161,4 @@ def search():
     if category_id:
         search_query = search_query.filter(Post.category_id == category_id)
     
-    # 정렬
-    if sort_by == 'popular':
-        search_query = search_query.order_by(Post.view_count.desc())
-    elif sort_by == 'likes':
-        # 좋아요 수로 정렬 (복잡한 쿼리 필요)
-        search_query = search_query.order_by(Post.created_at.desc())
-    else:  # latest
-        search_query = search_query.order_by(Post.created_at.desc())
-    
-    posts = search_query.paginate(
-        page=request.args.get('page', 1, type=int),
-        per_page=10,
-        error_out=False
-    )
-    
-    categories = Category.query.filter_by(is_active=True).all()
-    
-    return render_template('main/search.html',
-                         posts=posts,
-                         categories=categories,
-                         query=query,
-                         selected_category=category_id,
-                         sort_by=sort_by)
-
+    return paginate_posts(search_query, sort_by, cursor, SEARCH_PAGE_SIZE)
@@ -4,15 +4,45 @@
 
 from flask import Blueprint, render_template, request, jsonify
 from app.services.elasticsearch_service import ElasticsearchService
-from app.services.llm_service import LLMService
-from app.models import Post, Category
+from app.services.llm_service import get_llm_service
+from app.services.inference_server import get_inference_server
+from app.services.summary_cache import get_summaries
+from app.services.search_outbox import outbox_stats
+from app.services.search_cache import get_search_cache
+from app.services.query_log import log_query, get_query_log
+from app.services.category_cache import get_category_cache
+from app.models import Post
 from app import db
 
 search_bp = Blueprint('search', __name__)
 
 # 서비스 인스턴스
 es_service = ElasticsearchService()
-llm_service = LLMService()
+llm_service = get_llm_service()
+
+def _db_search_hits(query, size=10):
+    """검색 서비스 장애 시 DB 제목/내용 검색 결과를 ES 히트 형식으로 반환"""
+    pattern = f"%{query}%"
+    posts = Post.query.filter(
+        Post.is_published == True,
+        db.or_(Post.title.ilike(pattern), Post.content.ilike(pattern))
+    ).order_by(Post.created_at.desc()).limit(size).all()
+    return [
+        {
+            '_id': f"post-{post.id}",
+            '_score': None,
+            '_source': {
+                'doc_type': 'post',
+                'title': post.title,
+                'content': post.content,
+                'tags': post.get_tags_list(),
+                'category': post.category.name if post.category else None,
+                'created_at': post.created_at.isoformat() if post.created_at else None,
+                'post_id': post.id,
+            }
+        }
+        for post in posts
+    ]
 
 @search_bp.route('/search')
 def advanced_search():
@@ -30,6 +60,8 @@ def advanced_search():
     suggestions = []
     
     if query:
+        log_query(query, 'search')
+        
         # 필터 설정
         filters = {}
         if category:
@@ -52,12 +84,16 @@ def advanced_search():
         if search_result:
             results = search_result.get('hits', {}).get('hits', [])
             total = search_result.get('hits', {}).get('total', {}).get('value', 0)
+        elif not es_service.available:
+            # 검색 서비스 장애 시 DB 검색으로 폴백
+            results = _db_search_hits(query, size=20)
+            total = len(results)
         
         # 검색어 자동완성
         suggestions = es_service.get_suggestions(query, size=5)
     
     # 카테고리 목록
-    categories = Category.query.filter_by(is_active=True).all()
+    categories = get_category_cache().categories()
     
     # 인기 검색어
     popular_searches = es_service.get_popular_searches()
@@ -99,10 +135,28 @@ def related_documents():
 
 @search_bp.route('/api/search/popular')
 def popular_searches():
-    """인기 검색어 API"""
-    popular = es_service.get_popular_searches()
+    """인기 검색어 API (메모리에 미리 집계된 결과, window=1h 또는 24h)"""
+    window = request.args.get('window', '24h')
+    if window not in ('1h', '24h'):
+        window = '24h'
+    popular = es_service.get_popular_searches(window=window)
     return jsonify(popular)
 
+@search_bp.route('/api/search/queries/metrics')
+def query_log_metrics():
+    """검색어 로그 기록/집계 상태 API"""
+    return jsonify(get_query_log().metrics())
+
+@search_bp.route('/api/search/sync')
+def search_sync_status():
+    """검색 인덱스 동기화 지연 지표 API"""
+    return jsonify(outbox_stats())
+
+@search_bp.route('/api/search/cache')
+def search_cache_stats():
+    """검색 결과 캐시 적중률 API"""
+    return jsonify(get_search_cache().stats())
+
 @search_bp.route('/search/ai')
 def ai_search():
     """AI 기반 검색"""
@@ -112,18 +166,24 @@ def ai_search():
     if not query:
         return jsonify({'error': '검색어를 입력해주세요.'})
     
+    log_query(query, 'ai_search')
+    
     # 1. Elasticsearch로 관련 문서 검색
     search_result = es_service.search_documents(query, size=5)
     relevant_docs = []
     
     if search_result:
         relevant_docs = search_result.get('hits', {}).get('hits', [])
-    
-    # 2. 관련 문서 요약
+    elif not es_service.available:
+        relevant_docs = _db_search_hits(query, size=5)
+    
+    # 2. 관련 문서 요약 (캐시에 없는 문서만 한 번에 배치 요약)
+    summaries = get_summaries(
+        [(doc['_id'], doc['_source'].get('content', '')) for doc in relevant_docs],
+        max_length=100
+    )
     summarized_docs = []
-    for doc in relevant_docs:
-        content = doc['_source'].get('content', '')
-        summary = llm_service.summarize_text(content, max_length=100)
+    for doc, summary in zip(relevant_docs, summaries):
         doc['_source']['summary'] = summary
         summarized_docs.append(doc)
     
@@ -135,7 +195,9 @@ def ai_search():
     
     prompt = f"다음 문서들을 참고하여 '{query}'에 대해 답변해주세요:\n\n{context}"
     
-    ai_response = llm_service.generate_response(prompt, mode=mode)
+    ai_response = get_inference_server().generate(prompt, mode=mode)
+    if ai_response is None:
+        ai_response = get_llm_service().get_fallback_response(prompt)
     
     return jsonify({
         'query': query,
@@ -152,6 +214,8 @@ def semantic_search():
     if not query:
         return jsonify({'error': '검색어를 입력해주세요.'})
     
+    log_query(query, 'semantic')
+    
     # 1. 쿼리 임베딩 생성
     query_embedding = llm_service.get_embeddings([query])
     
@@ -164,12 +228,21 @@ def semantic_search():
             'type': 'fallback'
         })
     
-    # 2. 의미 기반 검색 (실제 구현에서는 벡터 데이터베이스 사용)
-    # 여기서는 Elasticsearch의 more_like_this 쿼리 사용
-    search_result = es_service.search_documents(query, size=10)
+    # 2. 저장된 문서 임베딩과의 벡터 유사도 top-k 검색
+    search_result = es_service.knn_search(query_embedding[0], size=10)
+    results = search_result.get('hits', {}).get('hits', []) if search_result else []
+    
+    if not results:
+        # 임베딩이 색인되지 않은 경우 일반 검색으로 폴백
+        search_result = es_service.search_documents(query, size=10)
+        return jsonify({
+            'query': query,
+            'results': search_result.get('hits', {}).get('hits', []) if search_result else [],
+            'type': 'fallback'
+        })
     
     return jsonify({
         'query': query,
-        'results': search_result.get('hits', {}).get('hits', []) if search_result else [],
+        'results': results,
         'type': 'semantic'
     })
@@ -0,0 +1,73 @@
+"""
+챗봇 응답 캐시
+
+정규화된 질문, 응답 모드, 검색 모드, 컨텍스트로 사용된 문서 ID를
+키로 사용합니다. 문서가 수정되면 해당 문서의 버전을 올려 그 문서를
+컨텍스트로 사용한 응답이 더 이상 조회되지 않게 합니다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+
+from app.services.cache import create_cache
+
+_PUNCTUATION = re.compile(r"[\s?!.,~]+$")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_message(message):
+    """대소문자, 공백, 끝 문장부호 차이를 무시하도록 질문 정규화"""
+    normalized = _WHITESPACE.sub(" ", (message or "").strip().lower())
+    return _PUNCTUATION.sub("", normalized)
+
+
+class AnswerCache:
+    """챗봇 응답 캐시 (TTL + LRU, 문서 버전 기반 무효화)"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def _key(self, message, mode, search_mode, doc_ids):
+        doc_ids = sorted(set(doc_ids or []))
+        versions = self.backend.get_counters([f"doc:{doc_id}" for doc_id in doc_ids])
+        raw = json.dumps(
+            [normalize_message(message), mode, search_mode, list(zip(doc_ids, versions))],
+            ensure_ascii=False
+        )
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get(self, message, mode, search_mode, doc_ids=None):
+        return self.backend.get(self._key(message, mode, search_mode, doc_ids))
+
+    def set(self, message, mode, search_mode, doc_ids, response):
+        if not response:
+            return
+        self.backend.set(self._key(message, mode, search_mode, doc_ids), response)
+
+    def invalidate_doc(self, doc_id):
+        """문서 수정/삭제 시 해당 문서를 컨텍스트로 사용한 응답 무효화"""
+        self.backend.incr(f"doc:{doc_id}")
+
+    def stats(self):
+        return self.backend.stats()
+
+
+_answer_cache = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache():
+    """프로세스 전역 응답 캐시 반환"""
+    global _answer_cache
+    if _answer_cache is None:
+        with _answer_cache_lock:
+            if _answer_cache is None:
+                _answer_cache = AnswerCache(create_cache(
+                    'answer',
+                    maxsize=int(os.getenv('ANSWER_CACHE_SIZE', '1024')),
+                    ttl=int(os.getenv('ANSWER_CACHE_TTL', '600')),
+                ))
+    return _answer_cache
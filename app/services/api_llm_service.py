@@ -6,6 +6,36 @@ import requests
 import os
 import json
 
+OPENAI_CHAT_URL = 'https://api.openai.com/v1/chat/completions'
+
+
+def stream_openai_chat(api_key, data, timeout=30):
+    """OpenAI Chat Completions 스트리밍 응답을 텍스트 조각으로 반환"""
+    headers = {
+        'Authorization': f'Bearer {api_key}',
+        'Content-Type': 'application/json'
+    }
+    payload = dict(data, stream=True)
+    
+    with requests.post(OPENAI_CHAT_URL, headers=headers, json=payload, timeout=timeout, stream=True) as response:
+        if response.status_code != 200:
+            print(f"OpenAI API 오류: {response.status_code}")
+            return
+        
+        for line in response.iter_lines(decode_unicode=True):
+            # SSE 형식: "data: {...}" / 종료 시 "data: [DONE]"
+            if not line or not line.startswith('data:'):
+                continue
+            chunk = line[len('data:'):].strip()
+            if chunk == '[DONE]':
+                break
+            try:
+                delta = json.loads(chunk)['choices'][0].get('delta', {})
+            except (ValueError, KeyError, IndexError):
+                continue
+            if delta.get('content'):
+                yield delta['content']
+
 class APILLMService:
     def __init__(self):
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
@@ -59,6 +89,33 @@ class APILLMService:
             print(f"OpenAI API 오류: {e}")
             return None
     
+    def stream_response_openai(self, prompt, mode="concise"):
+        """OpenAI API 스트리밍 응답 생성 (텍스트 조각 단위)"""
+        if not self.openai_api_key:
+            return
+        
+        max_tokens = 100 if mode == "concise" else 300
+        data = {
+            'model': 'gpt-3.5-turbo',
+            'messages': [
+                {
+                    'role': 'system',
+                    'content': '당신은 개발자 포트폴리오 사이트의 AI 챗봇입니다. 간단하고 친근하게 답변해주세요.'
+                },
+                {
+                    'role': 'user',
+                    'content': prompt
+                }
+            ],
+            'max_tokens': max_tokens,
+            'temperature': 0.7
+        }
+        
+        try:
+            yield from stream_openai_chat(self.openai_api_key, data, timeout=30)
+        except Exception as e:
+            print(f"OpenAI API 스트리밍 오류: {e}")
+    
     def generate_response_huggingface(self, prompt, model="microsoft/DialoGPT-medium"):
         """HuggingFace API를 통한 응답 생성"""
         if not self.huggingface_api_key:
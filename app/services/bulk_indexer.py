@@ -0,0 +1,333 @@
+"""
+검색 인덱스 일괄 재색인 (MySQL → Elasticsearch _bulk)
+
+게시글/FAQ를 서버 측 커서(yield_per)로 읽어 청크 단위로 문서를 만들고
+(임베딩은 청크별 한 번의 배치 계산), elasticsearch.helpers.parallel_bulk로
+여러 스레드에서 전송합니다. 청크를 보낼 때마다 마지막으로 처리한 ID를
+체크포인트 파일에 기록하므로 중단되어도 이어서 실행할 수 있습니다.
+
+새 인덱스로 옮기는 동안 이전 인덱스에만 반영된 변경은 sync_changes로
+보충합니다 (재색인 시작 이후 수정된 문서 다시 색인 + DB에서 삭제/비활성화된
+문서 삭제). 별칭 교체 전후로 한 번씩 실행하여 교체 직전의 변경도 놓치지 않습니다.
+
+모든 문서는 DB 조회 직전의 document_version을 외부 버전으로 쓰므로, 재색인
+도중 아웃박스가 먼저 반영한 더 최신 내용을 덮어쓰지 않습니다 (409는 성공 처리).
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from functools import partial
+
+from elasticsearch import helpers
+
+from app import db
+from app.models import Post, FAQ, User, Category
+from app.services.document_builder import build_post_document, build_faq_document, embed_texts
+from app.services.elasticsearch_service import (
+    ElasticsearchService, document_version, is_bulk_item_applied
+)
+from app.services.search_cache import get_search_cache
+from app.services.index_manager import IndexManager, MAPPING_VERSION, version_of
+
+# 일괄 전송 요청 타임아웃 (초)
+BULK_TIMEOUT = 120
+
+# 청크 전송 최대 시도 횟수 (실패한 문서만 재전송)
+MAX_CHUNK_ATTEMPTS = 3
+
+# 재색인 순서 (문서 종류, 체크포인트 키)
+SOURCES = ('faq', 'post')
+
+# 변경분 보충 기준 시각 여유 (updated_at은 커밋 전에 기록되고 아웃박스 반영은 그 뒤에 일어남)
+SYNC_MARGIN = timedelta(minutes=5)
+
+
+def _post_rows(after_id, chunk_size, updated_since=None):
+    """게시글과 작성자/카테고리를 한 번의 스트리밍 쿼리로 조회
+
+    서버 측 커서를 읽는 동안 같은 연결에서 다른 쿼리를 실행할 수 없으므로
+    관계 지연 로딩 없이 필요한 값을 모두 컬럼으로 가져옵니다.
+    """
+    query = db.session.query(
+        Post,
+        User.username,
+        Category.name,
+        Post.like_count
+    ).outerjoin(User, Post.user_id == User.id) \
+     .outerjoin(Category, Post.category_id == Category.id) \
+     .filter(Post.id > after_id)
+    if updated_since is not None:
+        query = query.filter(Post.updated_at >= updated_since)
+    return query.order_by(Post.id.asc()).yield_per(chunk_size)
+
+
+def _faq_rows(after_id, chunk_size, updated_since=None):
+    query = FAQ.query.filter(FAQ.is_active == True, FAQ.id > after_id)
+    if updated_since is not None:
+        query = query.filter(FAQ.updated_at >= updated_since)
+    return query.order_by(FAQ.id.asc()).yield_per(chunk_size)
+
+
+def _current_doc_ids():
+    """DB 기준으로 검색 인덱스에 있어야 하는 문서 ID 집합"""
+    post_ids = {f"post-{post_id}" for post_id, in db.session.query(Post.id)}
+    faq_ids = {f"faq-{faq_id}" for faq_id, in db.session.query(FAQ.id).filter(FAQ.is_active == True)}
+    return post_ids | faq_ids
+
+
+def _chunks(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class BulkReindexer:
+    """DB 전체를 검색 인덱스로 일괄 재색인"""
+
+    def __init__(self, es_service=None, chunk_size=500, thread_count=4,
+                 with_embedding=True, checkpoint_path=None):
+        self.es_service = es_service or ElasticsearchService()
+        self.index_manager = IndexManager(self.es_service)
+        self.chunk_size = chunk_size
+        self.thread_count = thread_count
+        self.with_embedding = with_embedding
+        self.checkpoint_path = checkpoint_path
+        self.indexed = 0
+        self.errors = []
+
+    # --- 체크포인트 ---
+
+    def load_checkpoint(self):
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path) as f:
+            return json.load(f)
+
+    def _save_checkpoint(self, checkpoint):
+        if not self.checkpoint_path:
+            return
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def clear_checkpoint(self):
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    # --- 문서 생성 ---
+
+    @staticmethod
+    def _versioned(action, version):
+        action["version"] = version
+        action["version_type"] = "external"
+        return action
+
+    def _post_actions(self, chunk, index, version):
+        embeddings = embed_texts(
+            [(post.title, post.content) for post, _, _, _ in chunk]
+        ) if self.with_embedding else [None] * len(chunk)
+        for (post, author, category, like_count), embedding in zip(chunk, embeddings):
+            doc = build_post_document(
+                post, with_embedding=False,
+                author=author, category=category, like_count=int(like_count)
+            )
+            if embedding is not None:
+                doc["embedding"] = embedding
+            yield self._versioned({"_index": index, "_id": f"post-{post.id}", "_source": doc}, version)
+
+    def _faq_actions(self, chunk, index, version):
+        embeddings = embed_texts(
+            [(faq.question, faq.answer) for faq in chunk]
+        ) if self.with_embedding else [None] * len(chunk)
+        for faq, embedding in zip(chunk, embeddings):
+            doc = build_faq_document(faq, with_embedding=False)
+            if embedding is not None:
+                doc["embedding"] = embedding
+            yield self._versioned({"_index": index, "_id": f"faq-{faq.id}", "_source": doc}, version)
+
+    def _read_version(self):
+        """이제부터 읽을 DB 상태의 문서 버전 (이전 트랜잭션을 끝내 더 오래된 스냅샷을 읽지 않도록)"""
+        db.session.commit()
+        return document_version()
+
+    def _source_chunks(self, source, after_id, updated_since=None):
+        """(청크 마지막 ID, 청크, 액션 생성 함수(청크, 인덱스)) 목록"""
+        version = self._read_version()
+        if source == 'post':
+            rows = _post_rows(after_id, self.chunk_size, updated_since)
+            for chunk in _chunks(rows, self.chunk_size):
+                yield chunk[-1][0].id, chunk, partial(self._post_actions, version=version)
+        else:
+            rows = _faq_rows(after_id, self.chunk_size, updated_since)
+            for chunk in _chunks(rows, self.chunk_size):
+                yield chunk[-1].id, chunk, partial(self._faq_actions, version=version)
+
+    def _send(self, client, actions):
+        """청크 전송 (실패한 문서만 백오프 후 재전송), 최종 실패 목록 반환"""
+        failed = []
+        for attempt in range(MAX_CHUNK_ATTEMPTS):
+            by_id = {action['_id']: action for action in actions}
+            failed = []
+            results = helpers.parallel_bulk(
+                client,
+                actions,
+                thread_count=self.thread_count,
+                chunk_size=max(1, len(actions) // self.thread_count),
+                raise_on_error=False,
+                raise_on_exception=False
+            )
+            for ok, info in results:
+                if ok or is_bulk_item_applied(*next(iter(info.items()))):
+                    # 더 최신 버전이 이미 있거나 이미 없는 문서의 삭제는 성공으로 처리
+                    self.indexed += 1
+                else:
+                    failed.append(info)
+            if not failed:
+                return []
+            # 429/일시적 오류에 대비해 실패한 문서만 다시 전송
+            actions = [
+                by_id[item['_id']] for item in
+                (next(iter(info.values())) for info in failed)
+                if item.get('_id') in by_id
+            ]
+            if not actions:
+                break
+            time.sleep(2 ** attempt)
+        return failed
+
+    # --- 실행 ---
+
+    def run(self, target_version=None, resume=False, delete_old=False, progress=print):
+        """재색인 실행
+
+        target_version을 지정하면 새 버전 인덱스에 색인한 뒤 별칭을 교체하고,
+        지정하지 않으면 현재 별칭 인덱스에 덮어씁니다. 재시도 후에도 실패한
+        문서가 있으면 해당 청크 직전까지의 체크포인트를 남기고 중단합니다.
+        """
+        checkpoint = self.load_checkpoint() if resume else None
+        if checkpoint:
+            target = checkpoint['target']
+            progress(f"🔁 체크포인트에서 이어서 실행: {target} {checkpoint['last_ids']}")
+        else:
+            if target_version is not None:
+                target = self.index_manager.create_version(target_version)
+            else:
+                target = self.index_manager.ensure_index()
+            checkpoint = {
+                'target': target,
+                'swap_alias': target_version is not None,
+                'started_at': datetime.utcnow().isoformat(),
+                'last_ids': {source: 0 for source in SOURCES},
+                'indexed': 0,
+            }
+            self._save_checkpoint(checkpoint)
+
+        self.indexed = checkpoint['indexed']
+        if checkpoint['swap_alias']:
+            # 새 인덱스는 아직 검색에 쓰이지 않으므로 색인 중 refresh 생략
+            self._set_refresh_interval(target, "-1")
+
+        started = time.perf_counter()
+        started_count = self.indexed
+        client = self.es_service.es.options(request_timeout=BULK_TIMEOUT)
+
+        def report(source, last_id):
+            elapsed = time.perf_counter() - started
+            rate = (self.indexed - started_count) / elapsed if elapsed else 0.0
+            progress(f"  {source} ~#{last_id}: 누적 {self.indexed}건, {rate:.0f} docs/sec")
+
+        for source in SOURCES:
+            for last_id, chunk, build_actions in self._source_chunks(source, checkpoint['last_ids'][source]):
+                self.errors = self._send(client, list(build_actions(chunk, target)))
+                if self.errors:
+                    progress(f"❌ {source} ~#{last_id} 청크 전송 실패 ({len(self.errors)}건), 중단합니다.")
+                    return self._result(target, started, started_count)
+
+                checkpoint['last_ids'][source] = last_id
+                checkpoint['indexed'] = self.indexed
+                self._save_checkpoint(checkpoint)
+                report(source, last_id)
+
+        synced_at = None
+        if checkpoint['swap_alias']:
+            # 재색인 중 별칭 인덱스에만 반영된 변경을 새 인덱스에 보충
+            synced_at = datetime.utcnow()
+            if not self.sync_changes(target, datetime.fromisoformat(checkpoint['started_at']), progress):
+                return self._result(target, started, started_count)
+            self._set_refresh_interval(target, None)
+        self.es_service._call('indices.refresh', BULK_TIMEOUT, index=target)
+        get_search_cache().invalidate()
+
+        if checkpoint['swap_alias']:
+            self.index_manager.swap_alias(target, delete_old=delete_old)
+            # 보충 이후 별칭 교체 전까지 이전 인덱스에만 반영된 변경 보충
+            if not self.sync_changes(target, synced_at, progress):
+                return self._result(target, started, started_count)
+
+        self.clear_checkpoint()
+        return self._result(target, started, started_count)
+
+    def sync_changes(self, target, since, progress=print):
+        """since 이후 DB에서 바뀐 문서를 target에 반영 (실패 시 False)
+
+        수정/추가된 게시글/FAQ는 DB 내용으로 다시 색인하고, target에는
+        있지만 DB에서 삭제되었거나 비활성화된 문서는 삭제합니다.
+        """
+        client = self.es_service.es.options(request_timeout=BULK_TIMEOUT)
+        updated_since = since - SYNC_MARGIN
+        for source in SOURCES:
+            for last_id, chunk, build_actions in self._source_chunks(source, 0, updated_since):
+                self.errors = self._send(client, list(build_actions(chunk, target)))
+                if self.errors:
+                    progress(f"❌ 변경분 보충 실패 ({len(self.errors)}건), 중단합니다.")
+                    return False
+                progress(f"  {source}(변경분) ~#{last_id}")
+
+        # 인덱스 문서 ID를 먼저 읽은 뒤 DB와 비교 (그 사이 생성된 문서를 삭제하지 않도록)
+        indexed_ids = {
+            hit['_id'] for hit in helpers.scan(
+                client, index=target, query={"query": {"match_all": {}}, "_source": False}
+            )
+        }
+        version = self._read_version()
+        stale_ids = sorted(indexed_ids - _current_doc_ids())
+        if stale_ids:
+            self.errors = self._send(client, [
+                self._versioned({"_op_type": "delete", "_index": target, "_id": doc_id}, version)
+                for doc_id in stale_ids
+            ])
+            if self.errors:
+                progress(f"❌ 삭제 문서 반영 실패 ({len(self.errors)}건), 중단합니다.")
+                return False
+            progress(f"  삭제 문서 {len(stale_ids)}건 반영")
+        return True
+
+    def _result(self, target, started, started_count):
+        elapsed = time.perf_counter() - started
+        return {
+            'target': target,
+            'indexed': self.indexed,
+            'errors': len(self.errors),
+            'seconds': round(elapsed, 1),
+            'docs_per_sec': round((self.indexed - started_count) / elapsed, 1) if elapsed else 0.0,
+        }
+
+    def _set_refresh_interval(self, index, value):
+        self.es_service._call(
+            'indices.put_settings', BULK_TIMEOUT,
+            index=index,
+            body={"index": {"refresh_interval": value}}
+        )
+
+
+def next_version():
+    """현재 별칭 인덱스의 다음 버전 번호"""
+    return max(MAPPING_VERSION, version_of(IndexManager().current_index()) + 1)
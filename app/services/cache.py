@@ -0,0 +1,188 @@
+"""
+캐시 백엔드 (프로세스 메모리 LRU + TTL, 선택적 Redis 공유 캐시)
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:  # Redis는 선택 의존성
+    redis = None
+
+
+class TTLCache:
+    """프로세스 메모리 LRU 캐시 (항목별 TTL)"""
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.time():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def incr(self, key):
+        """만료/LRU 대상이 아닌 카운터 증가 (버전/세대 번호용)"""
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def get_counters(self, keys):
+        with self._lock:
+            return [self._counters.get(key, 0) for key in keys]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'backend': 'memory',
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else None,
+        }
+
+
+class RedisCache:
+    """Redis 공유 캐시 (모든 워커가 같은 캐시 사용)
+
+    Redis 오류는 캐시 미스로 처리하여 요청 처리를 막지 않습니다.
+    """
+
+    def __init__(self, client, namespace, ttl=300):
+        self.client = client
+        self.namespace = namespace
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key):
+        return f"{self.namespace}:{key}"
+
+    def get(self, key):
+        try:
+            raw = self.client.get(self._key(key))
+        except Exception as e:
+            print(f"⚠️ Redis 캐시 조회 실패: {e}")
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            self.client.set(self._key(key), json.dumps(value, ensure_ascii=False), ex=ttl or None)
+        except Exception as e:
+            print(f"⚠️ Redis 캐시 저장 실패: {e}")
+
+    def delete(self, key):
+        try:
+            self.client.delete(self._key(key))
+        except Exception as e:
+            print(f"⚠️ Redis 캐시 삭제 실패: {e}")
+
+    def clear(self):
+        try:
+            for key in self.client.scan_iter(match=f"{self.namespace}:*"):
+                self.client.delete(key)
+        except Exception as e:
+            print(f"⚠️ Redis 캐시 초기화 실패: {e}")
+
+    def incr(self, key):
+        try:
+            return int(self.client.incr(self._key(f"counter:{key}")))
+        except Exception as e:
+            print(f"⚠️ Redis 카운터 증가 실패: {e}")
+            return None
+
+    def get_counters(self, keys):
+        if not keys:
+            return []
+        try:
+            values = self.client.mget([self._key(f"counter:{key}") for key in keys])
+        except Exception as e:
+            print(f"⚠️ Redis 카운터 조회 실패: {e}")
+            values = [None] * len(keys)
+        return [int(value) if value is not None else 0 for value in values]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'backend': 'redis',
+            'namespace': self.namespace,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else None,
+        }
+
+
+_redis_client = None
+_redis_lock = threading.Lock()
+
+
+def _get_redis_client():
+    """REDIS_URL이 설정되어 있고 연결 가능하면 Redis 클라이언트 반환"""
+    global _redis_client
+    url = os.getenv('REDIS_URL')
+    if redis is None or not url:
+        return None
+
+    with _redis_lock:
+        if _redis_client is None:
+            try:
+                client = redis.Redis.from_url(url, socket_timeout=0.2, socket_connect_timeout=0.2)
+                client.ping()
+                _redis_client = client
+                print("✅ Redis 공유 캐시 연결 성공")
+            except Exception as e:
+                print(f"⚠️ Redis 연결 실패, 프로세스 메모리 캐시 사용: {e}")
+                _redis_client = False
+    return _redis_client or None
+
+
+def create_cache(namespace, maxsize=1024, ttl=300):
+    """캐시 생성 (Redis 사용 가능 시 공유 캐시, 아니면 메모리 캐시)"""
+    client = _get_redis_client()
+    if client is not None:
+        return RedisCache(client, namespace, ttl=ttl)
+    return TTLCache(maxsize=maxsize, ttl=ttl)
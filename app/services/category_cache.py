@@ -0,0 +1,196 @@
+"""
+카테고리 목록/카테고리별 게시글 수 읽기 모델
+
+게시판 사이드바와 글쓰기/검색 화면의 카테고리 목록, 카테고리별 게시 상태
+게시글 수를 프로세스 메모리에 두고 요청마다 조회하지 않습니다. 게시글
+작성/삭제/게시 상태 변경/카테고리 이동은 SQLAlchemy 세션 이벤트에서 모아
+커밋 후 카운트에 바로 더하고, 카테고리 자체가 바뀌면 목록을 다시 읽습니다.
+다른 워커의 변경은 공유 버전 번호(REDIS_URL 사용 시)가 바뀌었을 때, 그리고
+CATEGORY_CACHE_TTL마다 전체를 다시 읽어 맞춥니다.
+"""
+
+import os
+import threading
+import time
+from collections import namedtuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import Post, Category
+from app.services.cache import create_cache
+
+VERSION_KEY = 'version'
+
+# 템플릿에서 사용하는 카테고리 값 (세션과 무관한 읽기 전용 값)
+CategoryView = namedtuple('CategoryView', ['id', 'name', 'description'])
+
+# 세션 info에 모아 둘 변경 키
+_PENDING_KEY = 'category_cache_pending'
+
+
+class CategoryReadModel:
+    """활성 카테고리 목록 + 카테고리별 게시 상태 게시글 수"""
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._shared = create_cache('categories', maxsize=16, ttl=ttl)
+        self._categories = []
+        self._counts = {}
+        self._version = None
+        self._loaded_at = 0.0
+        self._stale = True
+        self._lock = threading.RLock()
+        self.reloads = 0
+
+    # --- 조회 ---
+
+    def _ensure_loaded(self):
+        version = self._shared.get_counters([VERSION_KEY])[0]
+        if (self._stale or version != self._version
+                or time.monotonic() - self._loaded_at >= self.ttl):
+            with self._lock:
+                self._reload(version)
+
+    def _reload(self, version):
+        categories = db.session.query(Category.id, Category.name, Category.description) \
+            .filter(Category.is_active == True).order_by(Category.id.asc()).all()
+        counts = dict(
+            db.session.query(Post.category_id, db.func.count(Post.id))
+            .filter(Post.is_published == True).group_by(Post.category_id).all()
+        )
+        self._categories = [CategoryView(*row) for row in categories]
+        self._counts = counts
+        self._version = version
+        self._loaded_at = time.monotonic()
+        self._stale = False
+        self.reloads += 1
+
+    def categories(self):
+        """활성 카테고리 목록"""
+        self._ensure_loaded()
+        return list(self._categories)
+
+    def counts(self):
+        """카테고리 ID별 게시 상태 게시글 수"""
+        self._ensure_loaded()
+        return dict(self._counts)
+
+    def total(self):
+        self._ensure_loaded()
+        return sum(self._counts.values())
+
+    def get(self, category_id):
+        return next((category for category in self.categories() if category.id == category_id), None)
+
+    # --- 변경 반영 ---
+
+    def apply(self, deltas, categories_changed=False):
+        """커밋된 변경 반영 (deltas: {카테고리 ID: 게시글 수 증감})"""
+        with self._lock:
+            if categories_changed:
+                self._stale = True
+            else:
+                for category_id, delta in deltas.items():
+                    self._counts[category_id] = max(0, self._counts.get(category_id, 0) + delta)
+            # 다른 워커가 다시 읽도록 공유 버전을 올리고, 그 사이 다른 변경이 없었으면 현재 값 유지
+            version = self._shared.incr(VERSION_KEY)
+            if version is not None and self._version is not None and version == self._version + 1:
+                self._version = version
+            else:
+                self._stale = True
+
+    def invalidate(self):
+        with self._lock:
+            self._stale = True
+        self._shared.incr(VERSION_KEY)
+
+    def stats(self):
+        return {
+            'categories': len(self._categories),
+            'total': sum(self._counts.values()),
+            'version': self._version,
+            'reloads': self.reloads,
+        }
+
+
+_category_cache = None
+_category_cache_lock = threading.Lock()
+
+
+def get_category_cache():
+    """프로세스 전역 카테고리 읽기 모델 반환"""
+    global _category_cache
+    if _category_cache is None:
+        with _category_cache_lock:
+            if _category_cache is None:
+                _category_cache = CategoryReadModel(ttl=int(os.getenv('CATEGORY_CACHE_TTL', '300')))
+    return _category_cache
+
+
+# ---------------------------------------------------------------------------
+# 세션 이벤트 (게시글/카테고리 변경 수집 → 커밋 후 반영)
+# ---------------------------------------------------------------------------
+
+def _pending(session):
+    return session.info.setdefault(_PENDING_KEY, {'deltas': {}, 'categories': False})
+
+
+def _post_state(post, attr):
+    """(변경 전, 변경 후) 값"""
+    history = inspect(post).attrs[attr].history
+    before = history.deleted[0] if history.deleted else (history.unchanged[0] if history.unchanged else None)
+    after = history.added[0] if history.added else before
+    return before, after
+
+
+def _add_delta(session, category_id, delta):
+    if category_id is None:
+        return
+    deltas = _pending(session)['deltas']
+    deltas[category_id] = deltas.get(category_id, 0) + delta
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changes(session, flush_context):
+    for obj in session.new:
+        if isinstance(obj, Post) and obj.is_published is not False:
+            _add_delta(session, obj.category_id, 1)
+        elif isinstance(obj, Category):
+            _pending(session)['categories'] = True
+    for obj in session.deleted:
+        if isinstance(obj, Post):
+            was_published, _ = _post_state(obj, 'is_published')
+            old_category, _ = _post_state(obj, 'category_id')
+            if was_published is not False:
+                _add_delta(session, old_category, -1)
+        elif isinstance(obj, Category):
+            _pending(session)['categories'] = True
+    for obj in session.dirty:
+        if isinstance(obj, Post):
+            was_published, is_published = _post_state(obj, 'is_published')
+            old_category, new_category = _post_state(obj, 'category_id')
+            if (was_published, old_category) == (is_published, new_category):
+                continue
+            if was_published is not False:
+                _add_delta(session, old_category, -1)
+            if is_published is not False:
+                _add_delta(session, new_category, 1)
+        elif isinstance(obj, Category) and session.is_modified(obj):
+            _pending(session)['categories'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_changes(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    deltas = {category_id: delta for category_id, delta in pending['deltas'].items() if delta}
+    if deltas or pending['categories']:
+        get_category_cache().apply(deltas, categories_changed=pending['categories'])
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_changes(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
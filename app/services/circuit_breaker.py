@@ -0,0 +1,102 @@
+"""
+서킷 브레이커
+
+외부 서비스(Elasticsearch 등)가 연속으로 실패하면 일정 시간 동안 호출을
+바로 거절(open)하여 요청이 타임아웃을 기다리지 않고 폴백으로 넘어가게 합니다.
+대기 시간이 지나면 한 번의 시험 호출(half-open)로 복구 여부를 확인합니다.
+"""
+
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 호출하지 않음"""
+
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    @property
+    def available(self):
+        """호출을 시도할 수 있는 상태인지 (시험 호출 슬롯을 차지하지 않음)"""
+        return self.state != self.OPEN
+
+    def allow_request(self):
+        """호출 허용 여부 (half-open에서는 한 요청만 시험 호출로 허용)"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    return False
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                self.rejected += 1
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                print(f"✅ {self.name} 서킷 닫힘 (복구됨)")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    print(f"⚠️ {self.name} 서킷 열림 ({self._failures}회 연속 실패, {self.reset_timeout}초 후 재시도)")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def call(self, func, *args, is_failure=None, **kwargs):
+        """서킷 브레이커를 거쳐 호출 (is_failure로 장애로 볼 예외를 판별)"""
+        if not self.allow_request():
+            raise CircuitOpenError(f"{self.name} 서킷이 열려 있습니다.")
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if is_failure is None or is_failure(e):
+                self.record_failure()
+            else:
+                # 요청 자체의 오류(404 등)는 서비스 장애가 아님
+                self.record_success()
+            raise
+        self.record_success()
+        return result
+
+    def stats(self):
+        return {
+            'name': self.name,
+            'state': self.state,
+            'consecutive_failures': self._failures,
+            'rejected': self.rejected,
+        }
@@ -0,0 +1,77 @@
+"""
+검색 인덱스 문서 생성 (게시글/FAQ → Elasticsearch 문서)
+"""
+
+from app.services.llm_service import get_llm_service
+
+# 임베딩 입력 텍스트 최대 길이 (문자 수)
+EMBEDDING_TEXT_LIMIT = 1000
+
+
+def _embedding_input(title, content):
+    return f"{title or ''}\n{content or ''}"[:EMBEDDING_TEXT_LIMIT]
+
+
+def embed_text(title, content):
+    """문서 임베딩 계산 (임베딩 모델이 없으면 None)"""
+    embeddings = get_llm_service().get_embeddings([_embedding_input(title, content)])
+    if embeddings is None:
+        return None
+    return [float(value) for value in embeddings[0]]
+
+
+def embed_texts(pairs):
+    """(제목, 내용) 목록의 임베딩을 한 번에 계산 (임베딩 모델이 없으면 모두 None)"""
+    if not pairs:
+        return []
+    embeddings = get_llm_service().get_embeddings(
+        [_embedding_input(title, content) for title, content in pairs]
+    )
+    if embeddings is None:
+        return [None] * len(pairs)
+    return [[float(value) for value in embedding] for embedding in embeddings]
+
+
+def build_post_document(post, with_embedding=True, author=None, category=None, like_count=None):
+    """게시글 검색 문서 생성
+
+    author/category를 넘기면 관계를 조회하지 않음 (일괄 재색인용)
+    """
+    if author is None and post.author:
+        author = post.author.username
+    if category is None and post.category:
+        category = post.category.name
+    doc = {
+        "doc_type": "post",
+        "title": post.title,
+        "content": post.content,
+        "tags": post.get_tags_list(),
+        "category": category,
+        "author": author,
+        "created_at": post.created_at.isoformat() if post.created_at else None,
+        "view_count": post.view_count,
+        "like_count": post.get_like_count() if like_count is None else like_count,
+        "post_id": post.id,
+    }
+    if with_embedding:
+        embedding = embed_text(post.title, post.content)
+        if embedding is not None:
+            doc["embedding"] = embedding
+    return doc
+
+
+def build_faq_document(faq, with_embedding=True):
+    """FAQ 검색 문서 생성"""
+    doc = {
+        "doc_type": "faq",
+        "title": faq.question,
+        "content": faq.answer,
+        "category": faq.category,
+        "created_at": faq.created_at.isoformat() if faq.created_at else None,
+        "faq_id": faq.id,
+    }
+    if with_embedding:
+        embedding = embed_text(faq.question, faq.answer)
+        if embedding is not None:
+            doc["embedding"] = embedding
+    return doc
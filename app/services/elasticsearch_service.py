@@ -2,122 +2,169 @@
 Elasticsearch 검색 서비스
 """
 
-from elasticsearch import Elasticsearch
+from elasticsearch import Elasticsearch, ApiError, TransportError, ConflictError, NotFoundError
 from flask import current_app
 import json
 import os
+import threading
+import time
+
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.search_cache import get_search_cache
+from app.services.suggestions import get_suggestion_index
+from app.services.query_log import get_query_log
+
+# 임베딩 모델(all-MiniLM-L6-v2) 벡터 차원
+EMBEDDING_DIMS = 384
+
+# 검색 인덱스 별칭 (인덱스 버전 관리는 index_manager 참고)
+INDEX_ALIAS = 'portfolio_documents'
+
+# 검색 결과에서 제외할 필드 (임베딩 벡터는 응답 크기만 늘림)
+SOURCE_EXCLUDES = ["embedding"]
+
+# search_documents 정렬 옵션 (None은 관련도순, 마지막 post_id는 search_after 커서용 동률 해소)
+# 조회수/좋아요 수는 인덱스에 문서를 다시 쓸 때만 갱신되므로 정렬에 쓰지 않음
+# (해당 정렬은 search_post_ids로 일치 문서만 찾고 DB 카운터 컬럼으로 정렬)
+_TIEBREAKER = {"post_id": {"order": "desc", "unmapped_type": "integer"}}
+SORT_ORDERS = {
+    None: [{"_score": {"order": "desc"}}, {"created_at": {"order": "desc"}}, _TIEBREAKER],
+    'latest': [{"created_at": {"order": "desc"}}, _TIEBREAKER],
+}
+
+# 검색어 로그가 쌓이기 전에 보여줄 인기 검색어
+DEFAULT_POPULAR_SEARCHES = [
+    "Python", "Flask", "Docker", "MySQL", "JavaScript",
+    "웹 개발", "포트폴리오", "프로젝트", "Git", "API"
+]
+
+# 작업별 요청 타임아웃 (초) - 사용자 요청 경로의 검색은 짧게
+SEARCH_TIMEOUT = float(os.getenv('ES_SEARCH_TIMEOUT', '2'))
+WRITE_TIMEOUT = float(os.getenv('ES_WRITE_TIMEOUT', '5'))
+ADMIN_TIMEOUT = float(os.getenv('ES_ADMIN_TIMEOUT', '30'))
+
+# 프로세스 전역 클라이언트 (연결 풀 공유) 및 서킷 브레이커
+_client = None
+_client_lock = threading.Lock()
+_breaker = CircuitBreaker(
+    'elasticsearch',
+    failure_threshold=int(os.getenv('ES_BREAKER_FAILURES', '5')),
+    reset_timeout=float(os.getenv('ES_BREAKER_RESET_SECONDS', '30'))
+)
+
+
+def get_elasticsearch_client():
+    """프로세스 전역 Elasticsearch 클라이언트 반환"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = Elasticsearch(
+                    [os.getenv('ELASTICSEARCH_URL', 'http://elasticsearch:9200')],
+                    request_timeout=SEARCH_TIMEOUT,
+                    # 재시도는 한 번만 (느린 클러스터에서 요청이 오래 묶이지 않도록)
+                    max_retries=1,
+                    retry_on_timeout=False,
+                    connections_per_node=int(os.getenv('ES_CONNECTIONS_PER_NODE', '10')),
+                    http_compress=True
+                )
+    return _client
+
+
+def get_circuit_breaker():
+    return _breaker
+
+
+def document_version():
+    """문서 쓰기용 ES 외부 버전 (현재 시각, 마이크로초)
+
+    검색 문서를 쓰는 모든 경로(아웃박스, 일괄 재색인, 단건 쓰기)는 DB에서
+    문서를 읽기 직전에 이 값을 받아 version_type=external로 씁니다. 나중에
+    읽은 DB 상태일수록 버전이 크므로 늦게 도착한 오래된 쓰기는 409로
+    거절되고, 이전의 내부 버전/아웃박스 ID 버전 문서는 모두 이보다 작습니다.
+    """
+    return time.time_ns() // 1000
+
+
+def is_bulk_item_applied(op_type, item):
+    """bulk 실패 항목 중 정상으로 볼 수 있는 경우
+
+    409: 더 나중에 읽은 DB 상태가 이미 반영됨 (document_version 참고)
+    404: 이미 없는 문서의 삭제
+    """
+    status = item.get('status')
+    if status == 409:
+        return True
+    return op_type == 'delete' and status == 404
+
+
+def _is_outage(error):
+    """서킷 브레이커 실패로 집계할 예외 (연결/타임아웃, 5xx, 429)"""
+    if isinstance(error, TransportError):
+        return True
+    if isinstance(error, ApiError):
+        return error.status_code >= 500 or error.status_code == 429
+    return False
+
 
 class ElasticsearchService:
-    def __init__(self):
-        self.es = Elasticsearch(
-            [os.getenv('ELASTICSEARCH_URL', 'http://elasticsearch:9200')],
-            timeout=30,
-            max_retries=10,
-            retry_on_timeout=True
-        )
-        self.index_name = 'portfolio_documents'
+    def __init__(self, client=None):
+        self.es = client or get_elasticsearch_client()
+        # 실제 인덱스는 버전별(portfolio_documents_v{N})로 관리되고 별칭으로 접근
+        self.index_name = INDEX_ALIAS
     
-    def create_index(self):
-        """Elasticsearch 인덱스 생성"""
-        if not self.es.indices.exists(index=self.index_name):
-            mapping = {
-                "mappings": {
-                    "properties": {
-                        "doc_type": {
-                            "type": "keyword"  # 'faq' 또는 'post'
-                        },
-                        "title": {
-                            "type": "text",
-                            "analyzer": "standard"
-                        },
-                        "content": {
-                            "type": "text",
-                            "analyzer": "standard"
-                        },
-                        "tags": {
-                            "type": "keyword"
-                        },
-                        "category": {
-                            "type": "keyword"
-                        },
-                        "author": {
-                            "type": "keyword"
-                        },
-                        "created_at": {
-                            "type": "date"
-                        },
-                        "view_count": {
-                            "type": "integer"
-                        },
-                        "like_count": {
-                            "type": "integer"
-                        },
-                        "faq_id": {
-                            "type": "integer"
-                        },
-                        "post_id": {
-                            "type": "integer"
-                        },
-                        "score_hint": {
-                            "type": "float"
-                        }
-                    }
-                }
-            }
-            
-            self.es.indices.create(index=self.index_name, body=mapping)
-            print(f"✅ Elasticsearch 인덱스 '{self.index_name}' 생성됨")
+    @property
+    def available(self):
+        """서킷이 열려 있으면 False (호출자가 바로 DB 폴백 사용)"""
+        return _breaker.available
     
-    def index_document(self, doc_id, document):
-        """문서 인덱싱"""
+    def _call(self, api, timeout, **kwargs):
+        """작업별 타임아웃과 서킷 브레이커를 적용하여 API 호출 (예: 'search', 'indices.exists')"""
+        target = self.es.options(request_timeout=timeout)
+        for name in api.split('.'):
+            target = getattr(target, name)
+        return _breaker.call(target, is_failure=_is_outage, **kwargs)
+    
+    def index_document(self, doc_id, document, version=None):
+        """문서 인덱싱 (version: 문서를 만들기 전에 받은 document_version)"""
         try:
-            self.es.index(
-                index=self.index_name,
-                id=doc_id,
-                body=document
+            self._call(
+                'index', WRITE_TIMEOUT, index=self.index_name, id=doc_id, body=document,
+                version=version or document_version(), version_type='external'
             )
+            get_search_cache().invalidate()
+            return True
+        except ConflictError:
+            # 더 최신 내용이 이미 반영됨
             return True
         except Exception as e:
             print(f"❌ 문서 인덱싱 실패: {e}")
             return False
     
-    def search_documents(self, query, filters=None, size=10, from_=0):
-        """문서 검색"""
-        search_body = {
-            "query": {
-                "bool": {
-                    "must": [
-                        {
-                            "multi_match": {
-                                "query": query,
-                                "fields": ["title^2", "content", "tags"],
-                                "type": "best_fields",
-                                "fuzziness": "AUTO"
-                            }
+    def _search_query(self, query, filters=None):
+        """검색어 + 필터 bool 쿼리"""
+        search_query = {
+            "bool": {
+                "must": [
+                    {
+                        "multi_match": {
+                            "query": query,
+                            "fields": ["title^2", "content", "tags"],
+                            "type": "best_fields",
+                            "fuzziness": "AUTO"
                         }
-                    ]
-                }
-            },
-            "highlight": {
-                "fields": {
-                    "title": {},
-                    "content": {
-                        "fragment_size": 150,
-                        "number_of_fragments": 3
                     }
-                }
-            },
-            "sort": [
-                {"_score": {"order": "desc"}},
-                {"created_at": {"order": "desc"}}
-            ],
-            "size": size,
-            "from": from_
+                ]
+            }
         }
         
         # 필터 추가
         if filters:
             filter_conditions = []
+            if filters.get('doc_type'):
+                filter_conditions.append({
+                    "term": {"doc_type": filters['doc_type']}
+                })
             if filters.get('category'):
                 filter_conditions.append({
                     "term": {"category": filters['category']}
@@ -137,41 +184,118 @@ class ElasticsearchService:
                 })
             
             if filter_conditions:
-                search_body["query"]["bool"]["filter"] = filter_conditions
+                search_query["bool"]["filter"] = filter_conditions
+        return search_query
+    
+    def search_documents(self, query, filters=None, size=10, from_=0, sort=None, search_after=None):
+        """문서 검색 (같은 검색어/필터/정렬/페이지는 결과 캐시 사용)
+
+        sort: None(관련도), 'latest'
+        search_after: 이전 페이지 마지막 결과의 sort 값 (지정하면 from_ 대신 사용)
+        """
+        cache = get_search_cache()
+        cached = cache.get(query, filters, size, from_, sort, search_after)
+        if cached is not None:
+            return cached
+        
+        search_body = {
+            "query": self._search_query(query, filters),
+            "highlight": {
+                "fields": {
+                    "title": {},
+                    "content": {
+                        "fragment_size": 150,
+                        "number_of_fragments": 3
+                    }
+                }
+            },
+            "sort": SORT_ORDERS.get(sort, SORT_ORDERS[None]),
+            "size": size,
+            "_source": {"excludes": SOURCE_EXCLUDES}
+        }
+        if search_after:
+            search_body["search_after"] = search_after
+        else:
+            search_body["from"] = from_
         
         try:
-            response = self.es.search(index=self.index_name, body=search_body)
+            response = self._call('search', SEARCH_TIMEOUT, index=self.index_name, body=search_body).body
+            cache.set(query, filters, size, from_, response, sort, search_after)
             return response
         except Exception as e:
             print(f"❌ 검색 실패: {e}")
             return None
     
-    def get_suggestions(self, query, size=5):
-        """검색어 자동완성"""
-        suggest_body = {
-            "suggest": {
-                "title_suggest": {
-                    "prefix": query,
-                    "completion": {
-                        "field": "title.suggest",
-                        "size": size
-                    }
-                }
-            }
+    def search_post_ids(self, query, filters=None, size=1000):
+        """검색어와 일치하는 게시글 ID (관련도순 상위 size개, 실패 시 None)
+
+        조회수/좋아요순처럼 DB 컬럼으로 정렬할 때 일치 여부만 ES로 판단합니다.
+        """
+        cache = get_search_cache()
+        cached = cache.get(query, filters, size, 0, 'post_ids')
+        if cached is not None:
+            return cached
+        
+        search_body = {
+            "query": self._search_query(query, filters),
+            "size": size,
+            "_source": ["post_id"],
+            "track_total_hits": False
+        }
+        try:
+            response = self._call('search', SEARCH_TIMEOUT, index=self.index_name, body=search_body)
+            post_ids = [
+                hit['_source']['post_id'] for hit in response['hits']['hits']
+                if hit.get('_source', {}).get('post_id')
+            ]
+            cache.set(query, filters, size, 0, post_ids, 'post_ids')
+            return post_ids
+        except Exception as e:
+            print(f"❌ 검색 실패: {e}")
+            return None
+    
+    def knn_search(self, query_vector, size=10, num_candidates=100, filters=None):
+        """임베딩 벡터 유사도 기반 top-k 검색"""
+        knn = {
+            "field": "embedding",
+            "query_vector": [float(value) for value in query_vector],
+            "k": size,
+            "num_candidates": max(num_candidates, size)
         }
+        if filters and filters.get('doc_type'):
+            knn["filter"] = {"term": {"doc_type": filters['doc_type']}}
         
         try:
-            response = self.es.search(index=self.index_name, body=suggest_body)
-            return response.get('suggest', {}).get('title_suggest', [])
+            response = self._call(
+                'search', SEARCH_TIMEOUT,
+                index=self.index_name,
+                body={
+                    "knn": knn,
+                    "size": size,
+                    "_source": {"excludes": SOURCE_EXCLUDES}
+                }
+            )
+            return response
         except Exception as e:
-            print(f"❌ 자동완성 실패: {e}")
-            return []
+            print(f"❌ 벡터 검색 실패: {e}")
+            return None
+    
+    def get_suggestions(self, query, size=5):
+        """검색어 자동완성 ([{'text': 문구}], 프로세스 내 접두사 인덱스 사용, ES 조회 없음)"""
+        index = get_suggestion_index()
+        try:
+            index.ensure_fresh(current_app._get_current_object())
+            if not index.has_queries:
+                index.set_queries({term: 1 for term in self.get_popular_searches()})
+        except Exception as e:
+            print(f"❌ 자동완성 인덱스 준비 실패: {e}")
+        return [{'text': text} for text in index.suggest(query, size)]
     
     def get_related_documents(self, doc_id, size=5):
         """관련 문서 추천"""
         try:
             # 문서 정보 가져오기
-            doc = self.es.get(index=self.index_name, id=doc_id)
+            doc = self._call('get', SEARCH_TIMEOUT, index=self.index_name, id=doc_id)
             doc_source = doc['_source']
             
             # 유사 문서 검색
@@ -189,42 +313,39 @@ class ElasticsearchService:
                         "max_query_terms": 12
                     }
                 },
-                "size": size
+                "size": size,
+                "_source": {"excludes": SOURCE_EXCLUDES}
             }
             
-            response = self.es.search(index=self.index_name, body=related_query)
+            response = self._call('search', SEARCH_TIMEOUT, index=self.index_name, body=related_query)
             return response.get('hits', {}).get('hits', [])
         except Exception as e:
             print(f"❌ 관련 문서 검색 실패: {e}")
             return []
     
-    def get_popular_searches(self, size=10):
-        """인기 검색어"""
-        # 실제 구현에서는 검색 로그를 분석하여 인기 검색어를 추출
-        # 여기서는 샘플 데이터 반환
-        return [
-            "Python", "Flask", "Docker", "MySQL", "JavaScript",
-            "웹 개발", "포트폴리오", "프로젝트", "Git", "API"
-        ]
+    def get_popular_searches(self, size=10, window='24h'):
+        """인기 검색어 (검색어 로그 집계 결과, 기록이 없으면 기본 목록)"""
+        popular = get_query_log().popular(size=size, window=window)
+        if popular:
+            return popular
+        return DEFAULT_POPULAR_SEARCHES[:size]
     
-    def delete_document(self, doc_id):
+    def delete_document(self, doc_id, version=None):
         """문서 삭제"""
         try:
-            self.es.delete(index=self.index_name, id=doc_id)
+            self._call(
+                'delete', WRITE_TIMEOUT, index=self.index_name, id=doc_id,
+                version=version or document_version(), version_type='external'
+            )
+            get_search_cache().invalidate()
+            return True
+        except (ConflictError, NotFoundError):
+            # 더 최신 내용이 이미 반영되었거나 이미 삭제됨
             return True
         except Exception as e:
             print(f"❌ 문서 삭제 실패: {e}")
             return False
     
-    def update_document(self, doc_id, document):
+    def update_document(self, doc_id, document, version=None):
         """문서 업데이트"""
-        try:
-            self.es.index(
-                index=self.index_name,
-                id=doc_id,
-                body=document
-            )
-            return True
-        except Exception as e:
-            print(f"❌ 문서 업데이트 실패: {e}")
-            return False
+        return self.index_document(doc_id, document, version=version)
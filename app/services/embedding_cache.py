@@ -0,0 +1,249 @@
+"""
+임베딩 캐시 (콘텐츠 해시 키, 메모리 LRU + 디스크 memmap)
+
+같은 텍스트는 한 번만 인코딩합니다. 메모리 계층은 최근 사용한
+벡터를 보관하고, 디스크 계층은 float32 memmap 파일에 벡터를 저장해
+재시작 후에도 재사용합니다. 두 계층 모두 가장 오래 사용하지 않은
+항목부터 교체합니다.
+"""
+
+import fcntl
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+# SHA-1 다이제스트 길이
+KEY_BYTES = 20
+
+
+def content_key(text, model_name):
+    """모델 이름 + 텍스트의 SHA-1 다이제스트 (20바이트)"""
+    return hashlib.sha1(f"{model_name}\0{text}".encode('utf-8')).digest()
+
+
+class DiskEmbeddingStore:
+    """memmap 기반 고정 용량 벡터 저장소
+
+    vectors.f32 : (capacity, dims) float32 벡터
+    keys.bin    : (capacity, 20) uint8 콘텐츠 해시 (빈 슬롯은 모두 0)
+    used.f64    : (capacity,) 마지막 사용 시각 (LRU 교체용)
+
+    여러 워커 프로세스가 같은 파일을 공유하므로 쓰기는 파일 잠금으로
+    직렬화합니다. 쓰기는 슬롯 키를 먼저 지운 뒤 벡터를 쓰고 마지막에 키를
+    기록하며, 읽기는 벡터를 복사한 뒤 키를 다시 확인하므로 다른 프로세스가
+    그 사이 교체한 슬롯은 캐시 미스로 처리됩니다.
+    """
+
+    def __init__(self, path, dims, capacity=50000):
+        self.path = path
+        self.dims = dims
+        self.capacity = capacity
+        os.makedirs(path, exist_ok=True)
+        self._lock_file = open(os.path.join(path, '.lock'), 'w')
+
+        with self._file_lock():
+            self._open_files()
+
+        self._slots = {}
+        occupied = self.keys.any(axis=1)
+        for slot in np.flatnonzero(occupied):
+            self._slots[self._key_at(slot)] = int(slot)
+        self._free = [int(slot) for slot in np.flatnonzero(~occupied)[::-1]]
+
+    @contextmanager
+    def _file_lock(self):
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _open_files(self):
+        path = self.path
+        dims = self.dims
+        capacity = self.capacity
+        meta_path = os.path.join(path, 'meta.txt')
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                saved_dims, saved_capacity = (int(value) for value in f.read().split())
+            if saved_dims != dims or saved_capacity != capacity:
+                # 모델/설정이 바뀌면 기존 파일은 사용할 수 없으므로 새로 생성
+                for name in ('vectors.f32', 'keys.bin', 'used.f64'):
+                    file_path = os.path.join(path, name)
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+        with open(meta_path, 'w') as f:
+            f.write(f"{dims} {capacity}")
+
+        self.vectors = self._open('vectors.f32', np.float32, (capacity, dims))
+        self.keys = self._open('keys.bin', np.uint8, (capacity, KEY_BYTES))
+        self.used = self._open('used.f64', np.float64, (capacity,))
+
+    def _open(self, name, dtype, shape):
+        file_path = os.path.join(self.path, name)
+        mode = 'r+' if os.path.exists(file_path) else 'w+'
+        return np.memmap(file_path, dtype=dtype, mode=mode, shape=shape)
+
+    def _key_at(self, slot):
+        return self.keys[slot].tobytes()
+
+    def get(self, key):
+        slot = self._slots.get(key)
+        if slot is None:
+            return None
+        if self._key_at(slot) != key:
+            # 다른 프로세스가 이 슬롯을 교체함
+            del self._slots[key]
+            return None
+        vector = np.array(self.vectors[slot])
+        if self._key_at(slot) != key:
+            # 복사하는 동안 다른 프로세스가 슬롯을 교체함 (벡터가 섞였을 수 있음)
+            self._slots.pop(key, None)
+            return None
+        self.used[slot] = time.time()
+        return vector
+
+    def put_many(self, items):
+        """(키, 벡터) 목록 저장"""
+        with self._file_lock():
+            for key, vector in items:
+                self._put(key, vector)
+            self.vectors.flush()
+            self.keys.flush()
+            self.used.flush()
+
+    def _put(self, key, vector):
+        slot = self._slots.get(key)
+        if slot is None or self._key_at(slot) != key:
+            slot = None
+            while self._free:
+                candidate = self._free.pop()
+                if not self.keys[candidate].any():
+                    slot = candidate
+                    break
+            if slot is None:
+                # 가장 오래 사용하지 않은 슬롯 교체
+                slot = int(np.argmin(self.used))
+                self._slots.pop(self._key_at(slot), None)
+            self._slots[key] = slot
+        # 키를 지운 뒤 벡터를 쓰고 마지막에 키 기록 (읽는 쪽이 쓰는 중인 벡터를 사용하지 않도록)
+        self.keys[slot] = 0
+        self.vectors[slot] = vector
+        self.keys[slot] = np.frombuffer(key, dtype=np.uint8)
+        self.used[slot] = time.time()
+
+    def __len__(self):
+        return len(self._slots)
+
+
+class EmbeddingCache:
+    """콘텐츠 해시 기반 2계층 임베딩 캐시"""
+
+    def __init__(self, memory_size=4096, disk_path=None, disk_capacity=50000):
+        self.memory_size = memory_size
+        self.disk_path = disk_path
+        self.disk_capacity = disk_capacity
+        self._memory = OrderedDict()
+        self._disk = None
+        self._disk_failed = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _get_disk(self, dims):
+        if self._disk is None and self.disk_path and not self._disk_failed:
+            try:
+                self._disk = DiskEmbeddingStore(self.disk_path, dims, self.disk_capacity)
+            except Exception as e:
+                print(f"⚠️ 디스크 임베딩 캐시 사용 불가: {e}")
+                self._disk_failed = True
+        return self._disk
+
+    def _remember(self, key, vector):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys):
+        """키별 벡터 목록 반환 (없으면 None)"""
+        results = []
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                elif self._disk is not None and (vector := self._disk.get(key)) is not None:
+                    self._remember(key, vector)
+                    self.disk_hits += 1
+                else:
+                    self.misses += 1
+                results.append(vector)
+        return results
+
+    def put_many(self, keys, vectors):
+        if not keys:
+            return
+        with self._lock:
+            disk = self._get_disk(len(vectors[0]))
+            items = []
+            for key, vector in zip(keys, vectors):
+                vector = np.asarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                items.append((key, vector))
+            if disk is not None:
+                try:
+                    disk.put_many(items)
+                except Exception as e:
+                    print(f"⚠️ 디스크 임베딩 캐시 저장 실패: {e}")
+
+    def load_disk(self, dims):
+        """디스크 계층을 미리 열어 이전 실행의 벡터를 재사용"""
+        if self._disk is not None or self._disk_failed:
+            return
+        with self._lock:
+            self._get_disk(dims)
+
+    def stats(self):
+        total = self.hits + self.disk_hits + self.misses
+        return {
+            'memory_size': len(self._memory),
+            'disk_size': len(self._disk) if self._disk is not None else 0,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.hits + self.disk_hits) / total, 4) if total else None,
+        }
+
+
+def _default_disk_path():
+    path = os.getenv('EMBEDDING_CACHE_DIR')
+    if path is None:
+        from app.services.model_registry import MODELS_DIR
+        path = os.path.join(MODELS_DIR, 'embedding_cache')
+    return path or None
+
+
+_embedding_cache = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache():
+    """프로세스 전역 임베딩 캐시 반환"""
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache(
+                    memory_size=int(os.getenv('EMBEDDING_CACHE_SIZE', '4096')),
+                    disk_path=_default_disk_path(),
+                    disk_capacity=int(os.getenv('EMBEDDING_CACHE_DISK_CAPACITY', '50000')),
+                )
+    return _embedding_cache
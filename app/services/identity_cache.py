@@ -0,0 +1,112 @@
+"""
+로그인 사용자 식별 정보 캐시 (Flask-Login user_loader용)
+
+인증된 요청마다 users 테이블을 조회하지 않도록 사용자 ID별 읽기 전용
+스냅샷(id, username, is_admin)을 프로세스 메모리에 짧은 TTL로 보관합니다.
+사용자 정보가 바뀌거나 삭제되면 SQLAlchemy 이벤트에서 바로 제거하고,
+다른 워커의 캐시는 IDENTITY_CACHE_TTL 안에 만료됩니다.
+"""
+
+import os
+import threading
+from collections import namedtuple
+
+from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import User
+from app.services.cache import TTLCache
+
+# 세션 info에 모아 둘 변경 사용자 ID 키
+_PENDING_KEY = 'identity_cache_pending'
+
+
+class UserSnapshot(namedtuple('UserSnapshotBase', ['id', 'username', 'is_admin']), UserMixin):
+    """current_user로 사용하는 읽기 전용 사용자 정보"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return f'<UserSnapshot {self.username}>'
+
+
+class IdentityCache:
+    """사용자 ID -> UserSnapshot 캐시 (cache-aside)"""
+
+    def __init__(self, ttl=60, maxsize=10000):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def load(self, user_id):
+        """스냅샷 반환 (없으면 DB에서 읽어 저장, 존재하지 않는 사용자면 None)"""
+        snapshot = self._cache.get(user_id)
+        if snapshot is not None:
+            return snapshot
+        row = db.session.query(User.id, User.username, User.is_admin) \
+            .filter(User.id == user_id).first()
+        if row is None:
+            return None
+        snapshot = UserSnapshot(row.id, row.username, bool(row.is_admin))
+        self._cache.set(user_id, snapshot)
+        return snapshot
+
+    def invalidate(self, user_id):
+        self._cache.delete(user_id)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        return self._cache.stats()
+
+
+_identity_cache = None
+_identity_cache_lock = threading.Lock()
+
+
+def get_identity_cache():
+    """프로세스 전역 사용자 식별 정보 캐시 반환"""
+    global _identity_cache
+    if _identity_cache is None:
+        with _identity_cache_lock:
+            if _identity_cache is None:
+                _identity_cache = IdentityCache(
+                    ttl=int(os.getenv('IDENTITY_CACHE_TTL', '60')),
+                    maxsize=int(os.getenv('IDENTITY_CACHE_SIZE', '10000')),
+                )
+    return _identity_cache
+
+
+def load_user(user_id):
+    """Flask-Login user_loader"""
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+    return get_identity_cache().load(user_id)
+
+
+# ---------------------------------------------------------------------------
+# 사용자 변경 시 무효화
+# ---------------------------------------------------------------------------
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _user_changed(mapper, connection, target):
+    # 커밋 전 다른 요청이 이전 값을 다시 캐시할 수 있으므로 커밋 후에도 한 번 더 제거
+    get_identity_cache().invalidate(target.id)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session):
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        get_identity_cache().invalidate(user_id)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
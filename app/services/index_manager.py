@@ -0,0 +1,273 @@
+"""
+검색 인덱스 수명 주기 관리
+
+실제 인덱스는 portfolio_documents_v{N} 으로 만들고 portfolio_documents
+별칭으로 읽고 씁니다. 문서 쓰기 경로는 인덱스 존재 여부를 확인하지
+않으며, 인덱스 생성과 매핑 확인은 앱 시작 시(ensure_index) 한 번만 합니다.
+
+매핑을 바꿀 때는 INDEX_MAPPING과 MAPPING_VERSION을 함께 올리고
+`flask search-index migrate`로 새 버전 인덱스에 재색인한 뒤 별칭을
+한 번의 요청으로 교체합니다 (읽기/쓰기 중단 없음). 재색인 중 이전
+인덱스에만 반영된 수정/삭제는 별칭 교체 전후에 DB 기준으로 보충합니다.
+"""
+
+import os
+from datetime import datetime
+
+from elasticsearch import NotFoundError, BadRequestError
+
+from app.services.search_cache import get_search_cache
+from app.services.elasticsearch_service import (
+    ElasticsearchService, INDEX_ALIAS, EMBEDDING_DIMS, ADMIN_TIMEOUT
+)
+
+# 매핑 버전 (INDEX_MAPPING을 바꾸면 함께 올림)
+MAPPING_VERSION = 1
+
+# 서버 측 재색인 타임아웃 (초)
+REINDEX_TIMEOUT = float(os.getenv('ES_REINDEX_TIMEOUT', '3600'))
+
+INDEX_MAPPING = {
+    "properties": {
+        "doc_type": {
+            "type": "keyword"  # 'faq' 또는 'post'
+        },
+        "title": {
+            "type": "text",
+            "analyzer": "standard"
+        },
+        "content": {
+            "type": "text",
+            "analyzer": "standard"
+        },
+        "tags": {
+            "type": "keyword"
+        },
+        "category": {
+            "type": "keyword"
+        },
+        "author": {
+            "type": "keyword"
+        },
+        "created_at": {
+            "type": "date"
+        },
+        "view_count": {
+            "type": "integer"
+        },
+        "like_count": {
+            "type": "integer"
+        },
+        "faq_id": {
+            "type": "integer"
+        },
+        "post_id": {
+            "type": "integer"
+        },
+        "score_hint": {
+            "type": "float"
+        },
+        "embedding": {
+            "type": "dense_vector",
+            "dims": EMBEDDING_DIMS,
+            "index": True,
+            "similarity": "cosine"
+        }
+    }
+}
+
+
+def index_name_for(version):
+    """버전별 실제 인덱스 이름"""
+    return f"{INDEX_ALIAS}_v{version}"
+
+
+def version_of(index_name):
+    """인덱스 이름의 버전 (버전 없는 기존 인덱스는 0)"""
+    prefix = f"{INDEX_ALIAS}_v"
+    if index_name and index_name.startswith(prefix) and index_name[len(prefix):].isdigit():
+        return int(index_name[len(prefix):])
+    return 0
+
+
+class IndexManager:
+    """별칭 기반 인덱스 생성/검증/재색인"""
+
+    def __init__(self, es_service=None):
+        self.es_service = es_service or ElasticsearchService()
+        self.alias = INDEX_ALIAS
+
+    def _call(self, api, timeout=ADMIN_TIMEOUT, **kwargs):
+        return self.es_service._call(api, timeout, **kwargs)
+
+    def alias_targets(self):
+        """별칭이 가리키는 인덱스 목록"""
+        try:
+            return sorted(self._call('indices.get_alias', name=self.alias).keys())
+        except NotFoundError:
+            return []
+
+    def current_index(self):
+        targets = self.alias_targets()
+        return targets[-1] if targets else None
+
+    def is_legacy_index(self):
+        """별칭 이름과 같은 이름의 (버전 없는) 인덱스가 있는지"""
+        return bool(self._call('indices.exists', index=self.alias)) and not self.alias_targets()
+
+    def create_version(self, version, with_alias=False):
+        """버전 인덱스 생성 (이미 있으면 그대로 사용)"""
+        index = index_name_for(version)
+        body = {"mappings": INDEX_MAPPING}
+        if with_alias:
+            # 인덱스 생성과 별칭 연결을 한 요청으로 처리 (여러 워커가 동시에 시작해도 안전)
+            body["aliases"] = {self.alias: {}}
+        try:
+            self._call('indices.create', index=index, body=body)
+            print(f"✅ Elasticsearch 인덱스 '{index}' 생성됨")
+        except BadRequestError as e:
+            if getattr(e, 'error', None) != 'resource_already_exists_exception':
+                raise
+        return index
+
+    def verify_mapping(self, index=None):
+        """기대 매핑과 비교하여 (누락 필드, 타입이 다른 필드) 반환"""
+        index = index or self.alias
+        response = self._call('indices.get_mapping', index=index)
+        actual = {}
+        for mapping in response.values():
+            actual.update(mapping.get('mappings', {}).get('properties', {}))
+
+        missing = []
+        conflicts = []
+        for field, expected in INDEX_MAPPING['properties'].items():
+            current = actual.get(field)
+            if current is None:
+                missing.append(field)
+            elif current.get('type') != expected['type'] or current.get('dims') != expected.get('dims'):
+                conflicts.append(field)
+        return missing, conflicts
+
+    def ensure_index(self):
+        """앱 시작 시 인덱스/별칭 준비 및 매핑 확인"""
+        if self.is_legacy_index():
+            print(f"⚠️ 버전 없는 기존 인덱스 '{self.alias}' 사용 중. "
+                  f"`flask search-index migrate`로 버전 인덱스로 전환하세요.")
+            index = self.alias
+        else:
+            index = self.current_index()
+            if index is None:
+                index = self.create_version(MAPPING_VERSION, with_alias=True)
+                return index
+
+        missing, conflicts = self.verify_mapping(index)
+        if missing:
+            # 필드 추가는 기존 문서 재색인 없이 가능
+            self._call(
+                'indices.put_mapping',
+                index=index,
+                body={"properties": {field: INDEX_MAPPING['properties'][field] for field in missing}}
+            )
+            print(f"✅ 인덱스 '{index}'에 매핑 추가: {', '.join(missing)}")
+        if conflicts:
+            print(f"⚠️ 인덱스 '{index}' 매핑 불일치: {', '.join(conflicts)} "
+                  f"(`flask search-index migrate` 필요)")
+        elif version_of(index) < MAPPING_VERSION:
+            print(f"⚠️ 인덱스 '{index}'가 매핑 버전 {MAPPING_VERSION}보다 오래됨 "
+                  f"(`flask search-index migrate` 필요)")
+        return index
+
+    def swap_alias(self, new_index, delete_old=False):
+        """별칭을 새 인덱스로 원자적으로 교체"""
+        actions = []
+        if self.is_legacy_index():
+            # 별칭과 같은 이름의 인덱스는 별칭 추가와 같은 요청에서 삭제해야 함
+            actions.append({"remove_index": {"index": self.alias}})
+            old_indices = []
+        else:
+            old_indices = [index for index in self.alias_targets() if index != new_index]
+            for index in old_indices:
+                actions.append({"remove": {"index": index, "alias": self.alias}})
+        actions.append({"add": {"index": new_index, "alias": self.alias}})
+        self._call('indices.update_aliases', body={"actions": actions})
+        get_search_cache().invalidate()
+        print(f"✅ 별칭 '{self.alias}' → '{new_index}'")
+
+        if delete_old:
+            self._delete_indices(old_indices)
+        return old_indices
+
+    def migrate(self, version=None, delete_old=False):
+        """현재 인덱스를 새 버전 인덱스로 서버 측 재색인 후 별칭 교체"""
+        legacy = self.is_legacy_index()
+        source = self.alias if legacy else self.current_index()
+        if version is None:
+            version = max(MAPPING_VERSION, version_of(source) + 1)
+        target = index_name_for(version)
+        if source == target:
+            raise ValueError(f"이미 '{target}'을 사용 중입니다.")
+
+        self.create_version(version)
+        if source is None:
+            self.swap_alias(target, delete_old=delete_old)
+            return target
+
+        # 순환 import 방지 (bulk_indexer가 이 모듈을 사용)
+        from app.services.bulk_indexer import BulkReindexer
+
+        reindexer = BulkReindexer(self.es_service)
+        started_at = datetime.utcnow()
+        self._reindex(source, target)
+        # 재색인 중 수정/추가/삭제된 문서를 DB 기준으로 보충
+        synced_at = datetime.utcnow()
+        if not reindexer.sync_changes(target, started_at):
+            raise RuntimeError(f"'{target}' 변경분 보충 실패, 별칭을 교체하지 않았습니다.")
+        self._call('indices.refresh', index=target)
+        self.swap_alias(target)
+        # 보충 이후 별칭 교체 전까지 이전 인덱스에만 반영된 변경 보충 (이전 인덱스 삭제는 그 뒤에)
+        if not reindexer.sync_changes(target, synced_at):
+            raise RuntimeError(f"'{target}' 교체 후 변경분 보충 실패, `flask reindex`로 다시 맞추세요.")
+        if delete_old and not legacy:
+            # 버전 없는 기존 인덱스는 별칭 교체 요청에서 이미 삭제됨
+            self._delete_indices([source])
+        return target
+
+    def _delete_indices(self, indices):
+        for index in indices:
+            self._call('indices.delete', index=index)
+            print(f"🗑️ 이전 인덱스 '{index}' 삭제")
+
+    def _reindex(self, source, target):
+        response = self._call(
+            'reindex', REINDEX_TIMEOUT,
+            body={"source": {"index": source}, "dest": {"index": target}},
+            conflicts='proceed',
+            wait_for_completion=True,
+            refresh=True
+        )
+        print(f"✅ 재색인 {source} → {target}: {response.get('created', 0)}건 생성, "
+              f"{response.get('updated', 0)}건 갱신")
+        return response
+
+    def status(self):
+        """별칭/버전 인덱스 상태"""
+        try:
+            indices = self._call('indices.get', index=f"{self.alias}*")
+        except NotFoundError:
+            indices = {}
+        targets = set(self.alias_targets())
+        versions = []
+        for index in sorted(indices.keys()):
+            count = self._call('count', index=index).get('count', 0)
+            versions.append({
+                'index': index,
+                'version': version_of(index),
+                'docs': count,
+                'aliased': index in targets,
+            })
+        return {
+            'alias': self.alias,
+            'mapping_version': MAPPING_VERSION,
+            'legacy': self.is_legacy_index(),
+            'indices': versions,
+        }
@@ -0,0 +1,109 @@
+"""
+추론 백엔드 (CPU 배포용 모델 로딩 방식 선택)
+
+LLM_BACKEND 환경 변수로 선택합니다.
+  - eager : 기본 PyTorch fp32 (기존 동작)
+  - int8  : PyTorch 동적 int8 양자화 (Linear 레이어)
+  - onnx  : ONNX Runtime (optimum 설치 필요, 선택 의존성)
+
+generate()의 디코딩 루프는 TorchScript로 변환할 수 없어 TorchScript
+백엔드는 제공하지 않습니다.
+"""
+
+import os
+
+import torch
+from transformers import AutoModelForCausalLM, AutoModelForSeq2SeqLM
+
+try:
+    from optimum.onnxruntime import ORTModelForCausalLM, ORTModelForSeq2SeqLM
+except ImportError:  # ONNX Runtime 백엔드는 선택 의존성
+    ORTModelForCausalLM = None
+    ORTModelForSeq2SeqLM = None
+
+BACKENDS = ('eager', 'int8', 'onnx')
+
+
+def get_backend_name():
+    """설정된 추론 백엔드 이름 (알 수 없는 값이면 eager)"""
+    backend = os.getenv('LLM_BACKEND', 'eager').strip().lower()
+    if backend not in BACKENDS:
+        print(f"⚠️ 알 수 없는 LLM_BACKEND '{backend}', eager 사용")
+        return 'eager'
+    return backend
+
+
+def int8_artifact_path(model_dir):
+    """download_models.py --export int8 로 저장한 양자화 모델 경로"""
+    return f"{model_dir.rstrip(os.sep)}_int8.pt"
+
+
+def onnx_artifact_path(model_dir):
+    """download_models.py --export onnx 로 저장한 ONNX 모델 경로"""
+    return f"{model_dir.rstrip(os.sep)}_onnx"
+
+
+def _conv1d_to_linear(module):
+    """GPT-2 계열의 Conv1D 레이어를 동일한 nn.Linear로 교체
+
+    GPT-2는 어텐션/MLP에 transformers Conv1D(x @ W + b)를 사용하므로
+    그대로는 동적 양자화 대상(nn.Linear)에 포함되지 않습니다.
+    """
+    from transformers.pytorch_utils import Conv1D
+
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            in_features, out_features = child.weight.shape
+            linear = torch.nn.Linear(in_features, out_features)
+            linear.weight.data = child.weight.data.t().contiguous()
+            linear.bias.data = child.bias.data
+            setattr(module, name, linear)
+        else:
+            _conv1d_to_linear(child)
+    return module
+
+
+def quantize_int8(model):
+    """Linear 레이어 동적 int8 양자화 (CPU 전용)"""
+    model = _conv1d_to_linear(model)
+    model.eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load(model_class, ort_class, source, backend, device):
+    if backend == 'onnx':
+        if ort_class is None:
+            print("⚠️ optimum[onnxruntime]이 설치되지 않아 eager 백엔드 사용")
+        else:
+            onnx_path = onnx_artifact_path(source)
+            if os.path.isdir(onnx_path):
+                return ort_class.from_pretrained(onnx_path)
+            # 사전 변환된 모델이 없으면 로딩 시 변환
+            return ort_class.from_pretrained(source, export=True)
+
+    if backend == 'int8':
+        if device != 'cpu':
+            print("⚠️ int8 동적 양자화는 CPU 전용입니다. eager 백엔드 사용")
+        else:
+            artifact = int8_artifact_path(source)
+            if os.path.exists(artifact):
+                model = torch.load(artifact)
+            else:
+                model = quantize_int8(model_class.from_pretrained(source))
+            model.eval()
+            return model
+
+    model = model_class.from_pretrained(source)
+    model.to(device)
+    model.eval()
+    return model
+
+
+def load_causal_lm(source, backend, device):
+    """생성 모델 로딩"""
+    return _load(AutoModelForCausalLM, ORTModelForCausalLM, source, backend, device)
+
+
+def load_seq2seq_lm(source, backend, device):
+    """요약 모델 로딩"""
+    return _load(AutoModelForSeq2SeqLM, ORTModelForSeq2SeqLM, source, backend, device)
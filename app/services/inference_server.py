@@ -0,0 +1,173 @@
+"""
+LLM 추론 서버 (요청 큐 + 동적 배치)
+
+여러 요청의 프롬프트를 큐에 모아 최대 대기 시간 안에 하나의
+generate 호출로 처리합니다. 모델은 프로세스당 하나만 메모리에
+올라가므로 별도 프로세스 대신 전용 추론 스레드를 사용합니다.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from app.services.llm_service import get_llm_service
+
+
+class InferenceServer:
+    """프롬프트를 동적 배치로 묶어 생성하는 추론 서버"""
+
+    def __init__(self, llm_service=None, max_batch_size=8, max_wait_ms=20, num_workers=1):
+        self.llm_service = llm_service or get_llm_service()
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.num_workers = num_workers
+        self._queue = queue.Queue()
+        self._workers = []
+        self._start_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._batch_metrics = {}
+
+    def start(self):
+        """추론 스레드 시작 (최초 요청 시 자동 호출)"""
+        with self._start_lock:
+            if self._workers:
+                return
+            for i in range(self.num_workers):
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"inference-worker-{i}",
+                    daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+
+    def submit(self, prompt, max_length=150, mode="concise"):
+        """프롬프트를 큐에 등록하고 Future 반환"""
+        if not self._workers:
+            self.start()
+        future = Future()
+        self._queue.put({
+            'prompt': prompt,
+            'key': (max_length, mode),
+            'future': future,
+            'enqueued_at': time.time(),
+        })
+        return future
+
+    def generate(self, prompt, max_length=150, mode="concise", timeout=120):
+        """프롬프트 응답 생성 (배치 처리 완료까지 대기, 모델 출력이 없으면 None)"""
+        return self.submit(prompt, max_length=max_length, mode=mode).result(timeout=timeout)
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def _collect_batch(self, pending):
+        """첫 요청과 같은 생성 설정의 요청을 최대 대기 시간 동안 모음"""
+        first = pending.pop(0) if pending else self._queue.get()
+        batch = [first]
+
+        # 이전에 설정이 달라 보류된 요청 먼저 합류
+        for item in list(pending):
+            if len(batch) >= self.max_batch_size:
+                break
+            if item['key'] == first['key']:
+                pending.remove(item)
+                batch.append(item)
+
+        deadline = time.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item['key'] == first['key']:
+                batch.append(item)
+            else:
+                pending.append(item)
+        return batch
+
+    def _worker_loop(self):
+        pending = []
+        while True:
+            batch = self._collect_batch(pending)
+            max_length, mode = batch[0]['key']
+            started = time.time()
+            try:
+                responses = self.llm_service.generate_batch(
+                    [item['prompt'] for item in batch],
+                    max_length=max_length,
+                    mode=mode
+                )
+                for item, response in zip(batch, responses):
+                    item['future'].set_result(response)
+            except Exception as e:
+                print(f"❌ 배치 추론 실패: {e}")
+                for item in batch:
+                    if not item['future'].done():
+                        item['future'].set_exception(e)
+            finished = time.time()
+            self._record_batch(batch, started, finished)
+
+    def _record_batch(self, batch, started, finished):
+        size = len(batch)
+        with self._metrics_lock:
+            stats = self._batch_metrics.setdefault(size, {
+                'batches': 0,
+                'requests': 0,
+                'generate_seconds': 0.0,
+                'latency_seconds': 0.0,
+                'max_latency_seconds': 0.0,
+            })
+            stats['batches'] += 1
+            stats['requests'] += size
+            stats['generate_seconds'] += finished - started
+            for item in batch:
+                latency = finished - item['enqueued_at']
+                stats['latency_seconds'] += latency
+                stats['max_latency_seconds'] = max(stats['max_latency_seconds'], latency)
+
+    def metrics(self):
+        """배치 크기별 처리량/지연 시간 통계"""
+        with self._metrics_lock:
+            by_batch_size = {}
+            for size, stats in sorted(self._batch_metrics.items()):
+                by_batch_size[size] = {
+                    'batches': stats['batches'],
+                    'requests': stats['requests'],
+                    'avg_generate_seconds': round(stats['generate_seconds'] / stats['batches'], 4),
+                    'avg_latency_seconds': round(stats['latency_seconds'] / stats['requests'], 4),
+                    'max_latency_seconds': round(stats['max_latency_seconds'], 4),
+                    'requests_per_second': round(
+                        stats['requests'] / stats['generate_seconds'], 2
+                    ) if stats['generate_seconds'] else None,
+                }
+        return {
+            'queue_depth': self.queue_depth(),
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': int(self.max_wait * 1000),
+            'workers': len(self._workers),
+            'by_batch_size': by_batch_size,
+        }
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def get_inference_server():
+    """프로세스 전역 추론 서버 반환"""
+    global _server
+    if _server is None:
+        with _server_lock:
+            if _server is None:
+                _server = InferenceServer(
+                    max_batch_size=int(os.getenv('INFERENCE_MAX_BATCH_SIZE', '8')),
+                    max_wait_ms=int(os.getenv('INFERENCE_MAX_WAIT_MS', '20')),
+                    num_workers=int(os.getenv('INFERENCE_WORKERS', '1')),
+                )
+    return _server
@@ -0,0 +1,220 @@
+"""
+백그라운드 작업 큐 (DB 작업 테이블 + 프로세스 내 작업 스레드)
+
+요청 처리 중에는 작업을 jobs 테이블에 등록만 하고(같은 트랜잭션),
+작업 스레드가 게시글 요약, 카운터 보정 등을 처리합니다. 실패한 작업은
+지수 백오프로 재시도하며, 최대 시도 횟수를 넘으면 failed로 남아
+`flask jobs replay`로 다시 실행할 수 있습니다.
+"""
+
+import os
+import threading
+import traceback
+from datetime import datetime, timedelta
+
+from app import db
+from app.models import Job
+
+# 작업 종류별 처리 함수
+_handlers = {}
+
+# 재시도 대기 시간 기준 (초, 2배씩 증가)
+RETRY_BASE_SECONDS = 5
+
+# running 상태로 이 시간 이상 남은 작업은 작업자가 죽은 것으로 보고 다시 가져감
+STALE_JOB_SECONDS = 600
+
+
+def job_handler(kind):
+    """작업 처리 함수 등록 데코레이터"""
+    def decorator(func):
+        _handlers[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(kind, payload=None, max_attempts=5):
+    """작업 등록 (커밋은 호출한 쪽의 트랜잭션에서 수행)"""
+    job = Job(kind=kind, payload=payload or {}, max_attempts=max_attempts)
+    db.session.add(job)
+    return job
+
+
+def _claim_job():
+    """실행할 작업 하나를 가져와 running으로 표시"""
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=STALE_JOB_SECONDS)
+    job = Job.query.filter(
+        db.or_(
+            db.and_(Job.status == 'pending', Job.run_after <= now),
+            db.and_(Job.status == 'running', Job.locked_at < stale_before)
+        )
+    ).order_by(Job.id.asc()).with_for_update(skip_locked=True).first()
+
+    if job is None:
+        db.session.rollback()
+        return None
+
+    job.status = 'running'
+    job.locked_at = now
+    job.attempts += 1
+    db.session.commit()
+    return job
+
+
+def _run_job(job):
+    """작업 실행 및 결과 기록"""
+    handler = _handlers.get(job.kind)
+    try:
+        if handler is None:
+            raise ValueError(f"알 수 없는 작업 종류: {job.kind}")
+        handler(**(job.payload or {}))
+        job.status = 'done'
+        job.last_error = None
+        db.session.commit()
+        return True
+    except Exception as e:
+        db.session.rollback()
+        job = db.session.get(Job, job.id)
+        job.last_error = f"{e}\n{traceback.format_exc()}"[-2000:]
+        if job.attempts >= job.max_attempts:
+            job.status = 'failed'
+            print(f"❌ 작업 실패 (재시도 중단): {job.kind} #{job.id}: {e}")
+        else:
+            job.status = 'pending'
+            job.run_after = datetime.utcnow() + timedelta(
+                seconds=RETRY_BASE_SECONDS * (2 ** (job.attempts - 1))
+            )
+            print(f"⚠️ 작업 실패 (재시도 예정): {job.kind} #{job.id}: {e}")
+        job.locked_at = None
+        db.session.commit()
+        return False
+
+
+def run_pending(limit=None):
+    """대기 중인 작업을 현재 스레드에서 처리하고 (성공, 실패) 수 반환"""
+    succeeded = failed = 0
+    while limit is None or succeeded + failed < limit:
+        job = _claim_job()
+        if job is None:
+            break
+        if _run_job(job):
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
+
+
+def replay(job_ids=None, status='failed'):
+    """실패한(또는 지정한) 작업을 다시 대기 상태로 되돌림"""
+    query = Job.query
+    if job_ids:
+        query = query.filter(Job.id.in_(job_ids))
+    else:
+        query = query.filter(Job.status == status)
+    count = query.update({
+        Job.status: 'pending',
+        Job.attempts: 0,
+        Job.run_after: datetime.utcnow(),
+        Job.locked_at: None,
+    }, synchronize_session=False)
+    db.session.commit()
+    return count
+
+
+def queue_stats():
+    """상태별 작업 수와 가장 오래된 대기 작업의 지연 시간"""
+    counts = dict(
+        db.session.query(Job.status, db.func.count(Job.id)).group_by(Job.status).all()
+    )
+    oldest = db.session.query(db.func.min(Job.created_at)).filter(Job.status == 'pending').scalar()
+    return {
+        'pending': counts.get('pending', 0),
+        'running': counts.get('running', 0),
+        'done': counts.get('done', 0),
+        'failed': counts.get('failed', 0),
+        'oldest_pending_seconds': round((datetime.utcnow() - oldest).total_seconds(), 1) if oldest else 0,
+    }
+
+
+class JobWorker:
+    """jobs 테이블을 폴링하는 프로세스 내 작업 스레드 풀"""
+
+    def __init__(self, app, num_threads=1, poll_interval=1.0):
+        self.app = app
+        self.num_threads = num_threads
+        self.poll_interval = poll_interval
+        self._threads = []
+        self._stop = threading.Event()
+
+    def start(self):
+        for i in range(self.num_threads):
+            thread = threading.Thread(target=self._loop, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"✅ 백그라운드 작업 스레드 {self.num_threads}개 시작")
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            processed = 0
+            try:
+                with self.app.app_context():
+                    processed = sum(run_pending(limit=10))
+            except Exception as e:
+                print(f"❌ 작업 스레드 오류: {e}")
+            if not processed:
+                self._stop.wait(self.poll_interval)
+
+
+def start_job_worker(app):
+    """JOB_WORKER_THREADS 설정에 따라 작업 스레드 시작"""
+    num_threads = int(os.getenv('JOB_WORKER_THREADS', '1'))
+    if num_threads <= 0:
+        return None
+    worker = JobWorker(
+        app,
+        num_threads=num_threads,
+        poll_interval=float(os.getenv('JOB_POLL_INTERVAL', '1.0'))
+    )
+    worker.start()
+    return worker
+
+
+# ---------------------------------------------------------------------------
+# 작업 처리 함수
+# ---------------------------------------------------------------------------
+
+@job_handler('summarize_post')
+def summarize_post(post_id):
+    """게시글 요약 생성 (Post.summary 및 요약 캐시 저장, 모델을 사용할 수 없으면 재시도)"""
+    from app.models import Post
+    from app.services.summary_cache import get_summaries
+
+    post = db.session.get(Post, post_id)
+    if post is None:
+        return
+    get_summaries([(f"post-{post.id}", post.content)], max_length=100, strict=True)
+
+
+@job_handler('reconcile_post_counters')
+def reconcile_post_counters(batch_size=1000):
+    """게시글 좋아요/댓글 카운터 보정"""
+    from app.services import post_counters
+
+    repaired = post_counters.reconcile(batch_size=batch_size)
+    if repaired:
+        print(f"🔧 게시글 카운터 {repaired}건 보정")
+
+
+def enqueue_post_processing(post_id):
+    """게시글 작성/수정 후 처리 등록 (검색 인덱스 동기화, 요약)
+
+    검색 인덱싱(임베딩 포함)은 search_outbox 디스패처가 배치로 처리합니다.
+    """
+    from app.services.search_outbox import record_search_change
+
+    record_search_change(f"post-{post_id}")
+    enqueue('summarize_post', {'post_id': post_id})
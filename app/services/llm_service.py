@@ -2,144 +2,121 @@
 HuggingFace LLM 서비스 (KoGPT2, KoBART)
 """
 
+import threading
+
+import numpy as np
 import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM, AutoModelForSeq2SeqLM
-from sentence_transformers import SentenceTransformer
-import os
-import re
+from transformers import StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+
+from app.services.embedding_cache import content_key, get_embedding_cache
+from app.services.model_registry import get_model_registry
+
+def truncate_summary(text, max_length=100):
+    """요약 모델을 사용할 수 없을 때의 대체 요약 (앞부분 잘라내기)"""
+    text = text or ""
+    return text[:max_length] + "..." if len(text) > max_length else text
 
 class LLMService:
-    def __init__(self):
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        print(f"🔧 LLM 서비스 초기화 - 사용 디바이스: {self.device}")
-        self.embedding_model = None
-        self.generation_model = None
-        self.summarization_model = None
-        self.tokenizer = None
-        self.summarization_tokenizer = None
-        
-        # 모델 로딩
-        self._load_models()
-        
-        # 모델 로딩 상태 확인
-        self._check_models_loaded()
+    """모델 레지스트리를 공유하는 LLM 서비스 (모델은 처음 필요할 때 로딩)"""
+
+    def __init__(self, registry=None):
+        self.registry = registry or get_model_registry()
+        self.device = self.registry.device
     
-    def _load_models(self):
-        """로컬 경량화 모델 로딩"""
-        try:
-            models_dir = "/app/models"
-            
-            # 1. 임베딩 모델 로딩
-            print("🔄 로컬 임베딩 모델 로딩 중...")
-            embedding_path = os.path.join(models_dir, "embedding_model")
-            if os.path.exists(embedding_path):
-                try:
-                self.embedding_model = SentenceTransformer(embedding_path)
-                print("✅ 로컬 임베딩 모델 로딩 완료")
-                except Exception as e:
-                    print(f"⚠️ 로컬 임베딩 모델 로딩 실패 (버전 호환성 문제 가능): {e}")
-                    print("   HuggingFace에서 최신 모델을 다운로드합니다...")
-                    # 기존 모델 삭제 (버전 호환성 문제 해결)
-                    import shutil
-                    try:
-                        shutil.rmtree(embedding_path)
-                        print(f"   기존 모델 디렉토리 삭제: {embedding_path}")
-                    except:
-                        pass
-                    self.embedding_model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
-            else:
-                print("⚠️ 로컬 임베딩 모델을 찾을 수 없습니다. 기본 모델 사용...")
-                self.embedding_model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
-            
-            # 2. 생성 모델 로딩
-            print("🔄 로컬 생성 모델 로딩 중...")
-            generation_path = os.path.join(models_dir, "generation_model")
-            if os.path.exists(generation_path):
-                self.tokenizer = AutoTokenizer.from_pretrained(generation_path)
-                self.generation_model = AutoModelForCausalLM.from_pretrained(generation_path)
-                self.generation_model.to(self.device)
-                # pad_token 설정 (distilgpt2는 기본적으로 pad_token이 없음)
-                if self.tokenizer.pad_token is None:
-                    self.tokenizer.pad_token = self.tokenizer.eos_token
-                print("✅ 로컬 생성 모델 로딩 완료")
-            else:
-                print("⚠️ 로컬 생성 모델을 찾을 수 없습니다. 기본 모델 사용...")
-                self.tokenizer = AutoTokenizer.from_pretrained('distilgpt2')
-                self.generation_model = AutoModelForCausalLM.from_pretrained('distilgpt2')
-                self.generation_model.to(self.device)
-                # pad_token 설정 (distilgpt2는 기본적으로 pad_token이 없음)
-                if self.tokenizer.pad_token is None:
-                    self.tokenizer.pad_token = self.tokenizer.eos_token
-                print("✅ 기본 생성 모델 로딩 완료")
-            
-            # 3. 요약 모델 로딩
-            print("🔄 로컬 요약 모델 로딩 중...")
-            summarization_path = os.path.join(models_dir, "summarization_model")
-            if os.path.exists(summarization_path):
-                self.summarization_tokenizer = AutoTokenizer.from_pretrained(summarization_path)
-                self.summarization_model = AutoModelForSeq2SeqLM.from_pretrained(summarization_path)
-                self.summarization_model.to(self.device)
-                print("✅ 로컬 요약 모델 로딩 완료")
-            else:
-                print("⚠️ 로컬 요약 모델을 찾을 수 없습니다. 기본 모델 사용...")
-                self.summarization_tokenizer = AutoTokenizer.from_pretrained('facebook/bart-large-cnn')
-                self.summarization_model = AutoModelForSeq2SeqLM.from_pretrained('facebook/bart-large-cnn')
-                self.summarization_model.to(self.device)
-            
-            print("🎉 모든 로컬 모델 로딩 완료!")
-            
-        except Exception as e:
-            print(f"❌ 모델 로딩 실패: {e}")
-            import traceback
-            traceback.print_exc()
-            print("🔄 기본 응답 모드로 전환...")
-            # 모델 로딩 실패 시 기본 응답 모드로 전환
-            self.embedding_model = None
-            self.generation_model = None
-            self.summarization_model = None
+    def _component(self, name, key):
+        bundle = self.registry.get(name)
+        return bundle.get(key) if bundle else None
     
-    def _check_models_loaded(self):
-        """모델 로딩 상태 확인 및 로그 출력"""
-        print("\n" + "="*60)
-        print("📊 모델 로딩 상태 확인:")
-        print("="*60)
-        print(f"  임베딩 모델: {'✅ 로드됨' if self.embedding_model is not None else '❌ 로드 실패'}")
-        print(f"  생성 모델: {'✅ 로드됨' if self.generation_model is not None else '❌ 로드 실패'}")
-        print(f"  생성 토크나이저: {'✅ 로드됨' if self.tokenizer is not None else '❌ 로드 실패'}")
-        print(f"  요약 모델: {'✅ 로드됨' if self.summarization_model is not None else '❌ 로드 실패'}")
-        print("="*60)
-        
-        if self.generation_model is None or self.tokenizer is None:
-            print("⚠️ 경고: 생성 모델이 로드되지 않았습니다!")
-            print("   LLM 응답 생성이 불가능하며, 기본 응답만 사용됩니다.")
-            print("   원인 확인:")
-            print("   1. 모델 다운로드 실패 확인")
-            print("   2. 메모리 부족 확인")
-            print("   3. Docker 컨테이너 로그 확인: docker compose logs web")
-        print()
+    @property
+    def embedding_model(self):
+        return self._component('embedding', 'model')
+    
+    @property
+    def generation_model(self):
+        return self._component('generation', 'model')
+    
+    @property
+    def tokenizer(self):
+        return self._component('generation', 'tokenizer')
+    
+    @property
+    def summarization_model(self):
+        return self._component('summarization', 'model')
+    
+    @property
+    def summarization_tokenizer(self):
+        return self._component('summarization', 'tokenizer')
+    
+    def get_status(self):
+        """모델 로딩 상태 반환"""
+        return self.registry.status()
     
     def get_embeddings(self, texts):
-        """텍스트 임베딩 생성"""
-        if self.embedding_model is None:
+        """텍스트 임베딩 생성 (캐시에 없는 텍스트만 한 번에 인코딩)"""
+        model = self.embedding_model
+        if model is None:
             return None
         
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+        
         try:
-            embeddings = self.embedding_model.encode(texts)
-            return embeddings
+            cache = get_embedding_cache()
+            cache.load_disk(model.get_sentence_embedding_dimension())
+            model_name = self.registry.get('embedding').get('source', '')
+            keys = [content_key(text, model_name) for text in texts]
+            vectors = cache.get_many(keys)
+            
+            missing = [i for i, vector in enumerate(vectors) if vector is None]
+            if missing:
+                encoded = model.encode([texts[i] for i in missing], batch_size=32)
+                cache.put_many([keys[i] for i in missing], encoded)
+                for i, vector in zip(missing, encoded):
+                    vectors[i] = np.asarray(vector, dtype=np.float32)
+            
+            embeddings = np.vstack(vectors)
+            return embeddings[0] if single else embeddings
         except Exception as e:
             print(f"❌ 임베딩 생성 실패: {e}")
             return None
     
+    def similarity_scores(self, query, candidates):
+        """질문 하나와 여러 후보 텍스트의 코사인 유사도 (한 번의 행렬 연산)"""
+        if not candidates:
+            return []
+        embeddings = self.get_embeddings([query] + list(candidates))
+        if embeddings is None:
+            return [0.0] * len(candidates)
+        
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        normalized = embeddings / np.clip(norms, 1e-12, None)
+        scores = normalized[1:] @ normalized[0]
+        return [float(score) for score in scores]
+    
     def summarize_text(self, text, max_length=100):
-        """텍스트 요약"""
-        if self.summarization_model is None or self.summarization_tokenizer is None:
-            # 모델이 없으면 간단한 요약
-            return text[:max_length] + "..." if len(text) > max_length else text
+        """텍스트 요약 (모델을 사용할 수 없으면 앞부분을 잘라 반환)"""
+        summary = self.summarize_batch([text], max_length=max_length)[0]
+        return summary if summary is not None else truncate_summary(text, max_length)
+    
+    def summarize_batch(self, texts, max_length=100):
+        """여러 텍스트를 한 번의 패딩된 generate 호출로 요약
+
+        모델이 없거나 생성에 실패하면 해당 항목은 None (호출하는 쪽에서
+        truncate_summary로 대체하고, 대체 요약은 저장하지 않음)
+        """
+        if not texts:
+            return []
+        
+        model = self.summarization_model
+        tokenizer = self.summarization_tokenizer
+        if model is None or tokenizer is None:
+            return [None] * len(texts)
         
         try:
             # 입력 텍스트 전처리
-            inputs = self.summarization_tokenizer(
-                text,
+            inputs = tokenizer(
+                texts,
                 max_length=512,
                 padding=True,
                 truncation=True,
@@ -148,8 +125,9 @@ class LLMService:
             
             # 요약 생성
             with torch.no_grad():
-                summary_ids = self.summarization_model.generate(
+                summary_ids = model.generate(
                     inputs.input_ids,
+                    attention_mask=inputs.attention_mask,
                     max_length=max_length,
                     min_length=30,
                     length_penalty=2.0,
@@ -157,72 +135,141 @@ class LLMService:
                     early_stopping=True
                 )
             
-            summary = self.summarization_tokenizer.decode(summary_ids[0], skip_special_tokens=True)
-            return summary
+            return tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
             
         except Exception as e:
             print(f"❌ 요약 생성 실패: {e}")
-            return text[:max_length] + "..." if len(text) > max_length else text
+            return [None] * len(texts)
     
     def generate_response(self, prompt, max_length=150, mode="concise"):
-        """응답 생성"""
-        if self.generation_model is None or self.tokenizer is None:
-            # 모델이 없으면 기본 응답
-            print(f"⚠️ LLM 모델이 로드되지 않아 기본 응답을 반환합니다.")
-            print(f"   generation_model: {self.generation_model is not None}")
-            print(f"   tokenizer: {self.tokenizer is not None}")
-            return self._get_fallback_response(prompt)
+        """응답 생성 (모델을 사용할 수 없으면 기본 응답 반환)"""
+        response = self.generate_batch([prompt], max_length=max_length, mode=mode)[0]
+        return response if response is not None else self.get_fallback_response(prompt)
+    
+    def generate_batch(self, prompts, max_length=150, mode="concise"):
+        """여러 프롬프트를 한 번의 generate 호출로 응답 생성
+
+        모델이 없거나 생성에 실패하면(빈 응답 포함) 해당 항목은 None (호출하는
+        쪽에서 get_fallback_response 등으로 대체하고, 대체 응답은 캐시하지 않음)
+        """
+        model = self.generation_model
+        tokenizer = self.tokenizer
+        if model is None or tokenizer is None:
+            print("⚠️ LLM 모델이 로드되지 않아 응답을 생성하지 않습니다.")
+            return [None] * len(prompts)
         
         try:
-            # 프롬프트 전처리
-            if mode == "concise":
-                formatted_prompt = f"질문: {prompt}\n답변:"
-            else:
-                formatted_prompt = f"질문: {prompt}\n상세한 답변:"
+            formatted_prompts = [self._format_prompt(prompt, mode) for prompt in prompts]
             
-            # 토크나이징
-            inputs = self.tokenizer(
-                formatted_prompt,
+            # 토크나이징 (레지스트리에서 왼쪽 패딩으로 설정됨)
+            inputs = tokenizer(
+                formatted_prompts,
                 return_tensors="pt",
                 padding=True,
                 truncation=True,
                 max_length=256
             ).to(self.device)
             
+            # max_length는 패딩을 제외한 가장 긴 프롬프트 기준으로 적용
+            longest_prompt = int(inputs.attention_mask.sum(dim=1).max())
+            max_new_tokens = max(max_length - longest_prompt, 1)
+            
             # 생성
             with torch.no_grad():
-                outputs = self.generation_model.generate(
+                outputs = model.generate(
                     inputs.input_ids,
-                    max_length=max_length,
+                    attention_mask=inputs.attention_mask,
+                    max_new_tokens=max_new_tokens,
                     num_return_sequences=1,
                     temperature=0.7,
                     do_sample=True,
-                    pad_token_id=self.tokenizer.eos_token_id,
-                    eos_token_id=self.tokenizer.eos_token_id
+                    pad_token_id=tokenizer.eos_token_id,
+                    eos_token_id=tokenizer.eos_token_id
                 )
             
             # 응답 디코딩
-            response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            
-            # 프롬프트 부분 제거
-            if "답변:" in response:
-                response = response.split("답변:")[-1].strip()
-            if "상세한 답변:" in response:
-                response = response.split("상세한 답변:")[-1].strip()
-            
-            # 빈 응답 체크
-            if not response or len(response.strip()) == 0:
-                return self._get_fallback_response(prompt)
-            
-            return response
+            responses = []
+            for output in outputs:
+                response = self._clean_response(tokenizer.decode(output, skip_special_tokens=True))
+                # 빈 응답 체크
+                responses.append(response or None)
+            return responses
             
         except Exception as e:
             print(f"❌ 응답 생성 실패: {e}")
             import traceback
             traceback.print_exc()
-            return self._get_fallback_response(prompt)
+            return [None] * len(prompts)
     
-    def _get_fallback_response(self, prompt):
+    def stream_response(self, prompt, max_length=150, mode="concise"):
+        """응답을 토큰 단위로 생성하며 텍스트 조각을 반환 (제너레이터)
+
+        모델이 없거나 생성된 텍스트가 없으면 아무것도 내보내지 않습니다
+        (호출하는 쪽에서 기본 응답으로 대체).
+        """
+        model = self.generation_model
+        tokenizer = self.tokenizer
+        if model is None or tokenizer is None:
+            return
+        
+        inputs = tokenizer(
+            self._format_prompt(prompt, mode),
+            return_tensors="pt",
+            truncation=True,
+            max_length=256
+        ).to(self.device)
+        max_new_tokens = max(max_length - inputs.input_ids.shape[1], 1)
+        
+        streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True, timeout=120)
+        stop_event = threading.Event()
+        
+        def _generate():
+            try:
+                with torch.no_grad():
+                    model.generate(
+                        inputs.input_ids,
+                        attention_mask=inputs.attention_mask,
+                        max_new_tokens=max_new_tokens,
+                        temperature=0.7,
+                        do_sample=True,
+                        pad_token_id=tokenizer.eos_token_id,
+                        eos_token_id=tokenizer.eos_token_id,
+                        streamer=streamer,
+                        stopping_criteria=StoppingCriteriaList([_StopOnEvent(stop_event)])
+                    )
+            except Exception as e:
+                print(f"❌ 스트리밍 응답 생성 실패: {e}")
+                streamer.end()
+        
+        threading.Thread(target=_generate, daemon=True).start()
+        
+        produced = False
+        try:
+            for text in streamer:
+                if not produced:
+                    text = text.lstrip()
+                if text:
+                    produced = True
+                    yield text
+        finally:
+            # 클라이언트가 연결을 끊거나 글자 수 제한에 도달하면 생성 중단
+            stop_event.set()
+    
+    def _format_prompt(self, prompt, mode):
+        """프롬프트 전처리"""
+        if mode == "concise":
+            return f"질문: {prompt}\n답변:"
+        return f"질문: {prompt}\n상세한 답변:"
+    
+    def _clean_response(self, response):
+        """생성 결과에서 프롬프트 부분 제거"""
+        if "답변:" in response:
+            response = response.split("답변:")[-1].strip()
+        if "상세한 답변:" in response:
+            response = response.split("상세한 답변:")[-1].strip()
+        return response.strip()
+    
+    def get_fallback_response(self, prompt):
         """모델 로딩 실패 시 기본 응답"""
         fallback_responses = {
             "자기소개": "안녕하세요! 풀스택 개발자입니다. Python, Flask, JavaScript 등을 사용하여 웹 애플리케이션을 개발합니다.",
@@ -245,12 +292,30 @@ class LLMService:
             return 0.0
         
         try:
-            embeddings = self.embedding_model.encode([text1, text2])
-            similarity = torch.cosine_similarity(
-                torch.tensor(embeddings[0]).unsqueeze(0),
-                torch.tensor(embeddings[1]).unsqueeze(0)
-            )
-            return float(similarity[0])
+            return self.similarity_scores(text1, [text2])[0]
         except Exception as e:
             print(f"❌ 유사도 계산 실패: {e}")
             return 0.0
+
+class _StopOnEvent(StoppingCriteria):
+    """외부 이벤트로 generate를 중단하는 조건"""
+
+    def __init__(self, event):
+        self.event = event
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return self.event.is_set()
+
+
+_llm_service = None
+_llm_service_lock = threading.Lock()
+
+
+def get_llm_service():
+    """프로세스 전역 LLMService 반환 (모델은 레지스트리에서 공유)"""
+    global _llm_service
+    if _llm_service is None:
+        with _llm_service_lock:
+            if _llm_service is None:
+                _llm_service = LLMService()
+    return _llm_service
@@ -0,0 +1,171 @@
+"""
+모델 레지스트리 (워커 프로세스당 1회 로딩)
+
+임베딩/생성/요약 모델을 처음 필요할 때 한 번만 로딩하고,
+같은 프로세스의 모든 요청이 공유합니다.
+"""
+
+import os
+import threading
+import time
+
+import torch
+from transformers import AutoTokenizer
+from sentence_transformers import SentenceTransformer
+
+from app.services.inference_backend import get_backend_name, load_causal_lm, load_seq2seq_lm
+
+MODELS_DIR = os.getenv('MODELS_DIR', '/app/models')
+
+# 로컬 모델이 없을 때 사용할 HuggingFace 기본 모델
+DEFAULT_MODELS = {
+    'embedding': 'sentence-transformers/all-MiniLM-L6-v2',
+    'generation': 'distilgpt2',
+    'summarization': 'facebook/bart-large-cnn',
+}
+
+
+class ModelRegistry:
+    """프로세스 단위 모델 레지스트리 (지연 로딩, 스레드 안전)"""
+
+    MODEL_NAMES = ('embedding', 'generation', 'summarization')
+
+    def __init__(self, models_dir=None, backend=None):
+        self.models_dir = models_dir or MODELS_DIR
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.backend = backend or get_backend_name()
+        self._models = {}
+        self._errors = {}
+        self._load_seconds = {}
+        self._locks = {name: threading.Lock() for name in self.MODEL_NAMES}
+
+    def get(self, name):
+        """모델 번들 반환 (최초 호출 시 로딩, 실패 시 None)"""
+        bundle = self._models.get(name)
+        if bundle is not None or name in self._errors:
+            return bundle
+
+        with self._locks[name]:
+            # 다른 스레드가 먼저 로딩했을 수 있으므로 다시 확인
+            if name in self._models or name in self._errors:
+                return self._models.get(name)
+
+            print(f"🔄 {name} 모델 로딩 중... (디바이스: {self.device}, 백엔드: {self.backend})")
+            started = time.time()
+            try:
+                bundle = getattr(self, f'_load_{name}')()
+                self._models[name] = bundle
+                print(f"✅ {name} 모델 로딩 완료 ({time.time() - started:.1f}s)")
+            except Exception as e:
+                print(f"❌ {name} 모델 로딩 실패: {e}")
+                import traceback
+                traceback.print_exc()
+                self._errors[name] = str(e)
+            finally:
+                self._load_seconds[name] = round(time.time() - started, 3)
+
+        return self._models.get(name)
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def reset(self, name=None):
+        """로딩 결과 초기화 (실패한 모델 재시도용)"""
+        names = [name] if name else list(self.MODEL_NAMES)
+        for model_name in names:
+            with self._locks[model_name]:
+                self._models.pop(model_name, None)
+                self._errors.pop(model_name, None)
+                self._load_seconds.pop(model_name, None)
+
+    def warm_up(self, names=None):
+        """앱 시작 시 모델 사전 로딩"""
+        for name in names or self.MODEL_NAMES:
+            if name in self.MODEL_NAMES:
+                self.get(name)
+        return self.status()
+
+    def status(self):
+        """모델 로딩 상태 (헬스 체크용)"""
+        models = {}
+        for name in self.MODEL_NAMES:
+            if name in self._models:
+                state = 'loaded'
+            elif name in self._errors:
+                state = 'failed'
+            else:
+                state = 'not_loaded'
+            models[name] = {
+                'state': state,
+                'load_seconds': self._load_seconds.get(name),
+                'error': self._errors.get(name),
+            }
+        return {
+            'device': self.device,
+            'backend': self.backend,
+            'models_dir': self.models_dir,
+            'models': models,
+        }
+
+    def _local_path(self, name):
+        path = os.path.join(self.models_dir, f"{name}_model")
+        return path if os.path.exists(path) else None
+
+    def _load_embedding(self):
+        path = self._local_path('embedding')
+        if path:
+            try:
+                return {'model': SentenceTransformer(path), 'source': path}
+            except Exception as e:
+                print(f"⚠️ 로컬 임베딩 모델 로딩 실패 (버전 호환성 문제 가능): {e}")
+                print("   HuggingFace에서 최신 모델을 다운로드합니다...")
+                # 기존 모델 삭제 (버전 호환성 문제 해결)
+                import shutil
+                try:
+                    shutil.rmtree(path)
+                    print(f"   기존 모델 디렉토리 삭제: {path}")
+                except Exception:
+                    pass
+        else:
+            print("⚠️ 로컬 임베딩 모델을 찾을 수 없습니다. 기본 모델 사용...")
+        return {
+            'model': SentenceTransformer(DEFAULT_MODELS['embedding']),
+            'source': DEFAULT_MODELS['embedding'],
+        }
+
+    def _load_generation(self):
+        path = self._local_path('generation')
+        if not path:
+            print("⚠️ 로컬 생성 모델을 찾을 수 없습니다. 기본 모델 사용...")
+        source = path or DEFAULT_MODELS['generation']
+        tokenizer = AutoTokenizer.from_pretrained(source)
+        model = load_causal_lm(source, self.backend, self.device)
+        # pad_token 설정 (distilgpt2는 기본적으로 pad_token이 없음)
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        # 배치 생성 시 프롬프트 끝에서 이어서 생성하도록 왼쪽 패딩
+        tokenizer.padding_side = "left"
+        return {'model': model, 'tokenizer': tokenizer}
+
+    def _load_summarization(self):
+        path = self._local_path('summarization')
+        if not path:
+            print("⚠️ 로컬 요약 모델을 찾을 수 없습니다. 기본 모델 사용...")
+        source = path or DEFAULT_MODELS['summarization']
+        tokenizer = AutoTokenizer.from_pretrained(source)
+        model = load_seq2seq_lm(source, self.backend, self.device)
+        return {'model': model, 'tokenizer': tokenizer}
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    """프로세스 전역 모델 레지스트리 반환"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
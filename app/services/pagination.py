@@ -0,0 +1,102 @@
+"""
+키셋(커서) 페이지네이션
+
+OFFSET/COUNT(*) 대신 마지막 행의 정렬 키 (예: created_at, id) 다음부터
+읽습니다. 정렬 키와 같은 순서의 복합 인덱스가 있으면 깊은 페이지도 인덱스
+범위 조회 한 번으로 처리됩니다. 커서는 정렬 키 값을 담은 URL-safe 문자열입니다.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(values):
+    """정렬 키 값 목록을 커서 문자열로 변환"""
+    raw = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        separators=(',', ':')
+    )
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, columns=None):
+    """커서 문자열을 정렬 키 값 목록으로 변환 (잘못된 커서면 None)
+
+    columns를 넘기면 DateTime 컬럼 값은 datetime으로 되돌림
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw.decode('utf-8'))
+        if not isinstance(values, list):
+            return None
+        if columns is not None:
+            if len(values) != len(columns):
+                return None
+            values = [
+                datetime.fromisoformat(value)
+                if value is not None and column.type.python_type is datetime else value
+                for column, value in zip(columns, values)
+            ]
+        return values
+    except (ValueError, TypeError, NotImplementedError):
+        return None
+
+
+class CursorPage:
+    """키셋 페이지 (다음 페이지 커서만 제공, total은 근사/캐시 값)"""
+
+    def __init__(self, items, per_page, cursor=None, next_cursor=None, total=None):
+        self.items = items
+        self.per_page = per_page
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+        self.total = total
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def is_first(self):
+        return self.cursor is None
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+def _after(columns, values):
+    """내림차순 정렬 키 (c1, c2, ...)에서 values 다음 행 조건
+
+    (c1 < v1) OR (c1 = v1 AND c2 < v2) OR ... 형태로 풀어 써서
+    MySQL이 복합 인덱스 범위 조회를 사용할 수 있게 합니다.
+    """
+    conditions = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        equal = [prev == prev_value for prev, prev_value in zip(columns[:i], values[:i])]
+        conditions.append(and_(*equal, column < value))
+    return or_(*conditions)
+
+
+def keyset_paginate(query, columns, cursor=None, per_page=10, total=None):
+    """columns 내림차순 키셋 페이지 (마지막 컬럼은 고유 키, 보통 id)
+
+    한 건을 더 읽어 다음 페이지 여부를 판단하며 COUNT 쿼리는 실행하지 않습니다.
+    """
+    values = decode_cursor(cursor, columns)
+    if values is not None:
+        query = query.filter(_after(columns, values))
+    else:
+        cursor = None
+    rows = query.order_by(*[column.desc() for column in columns]).limit(per_page + 1).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+    return CursorPage(rows, per_page, cursor=cursor, next_cursor=next_cursor, total=total)
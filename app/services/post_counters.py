@@ -0,0 +1,69 @@
+"""
+게시글 좋아요/댓글 카운터
+
+Post.like_count/comment_count는 좋아요·댓글을 기록하는 트랜잭션 안에서
+`UPDATE posts SET x = x + 1` 형태로 증감하므로 동시 요청에도 값이 유실되지
+않습니다. 직접 SQL 수정이나 일부 실패로 생긴 차이는 reconcile()이 실제
+likes/comments 집계와 비교해 바로잡습니다.
+"""
+
+from app import db
+from app.models import Post, Like, Comment
+
+COUNTER_COLUMNS = {
+    'like_count': (Post.like_count, Like),
+    'comment_count': (Post.comment_count, Comment),
+}
+
+
+def increment(post_id, counter, delta=1):
+    """카운터 원자적 증감 (커밋은 호출한 쪽의 트랜잭션에서 수행)"""
+    column, _ = COUNTER_COLUMNS[counter]
+    Post.query.filter(Post.id == post_id).update({
+        column: column + delta,
+        # 카운터 변경은 게시글 수정으로 보지 않음 (검색/자동완성 변경분 동기화 제외)
+        Post.updated_at: Post.updated_at,
+    }, synchronize_session=False)
+
+
+def current_counts(post_id):
+    """(좋아요 수, 댓글 수)를 DB에서 다시 읽음"""
+    return db.session.query(Post.like_count, Post.comment_count) \
+        .filter(Post.id == post_id).one()
+
+
+def reconcile(batch_size=1000):
+    """카운터와 실제 집계가 다른 게시글을 찾아 보정하고 보정한 행 수 반환
+
+    ID 범위별로 집계하며, 집계 후 카운터가 바뀐 게시글(동시 좋아요 등)은
+    건너뛰고 다음 실행에서 다시 확인합니다.
+    """
+    repaired = 0
+    last_id = 0
+    while True:
+        posts = db.session.query(Post.id, Post.like_count, Post.comment_count) \
+            .filter(Post.id > last_id).order_by(Post.id.asc()).limit(batch_size).all()
+        if not posts:
+            break
+        first_id, last_id = posts[0].id, posts[-1].id
+
+        actual = {}
+        for counter, (_, model) in COUNTER_COLUMNS.items():
+            actual[counter] = dict(
+                db.session.query(model.post_id, db.func.count(model.id))
+                .filter(model.post_id.between(first_id, last_id))
+                .group_by(model.post_id).all()
+            )
+
+        for post in posts:
+            for counter, (column, _) in COUNTER_COLUMNS.items():
+                observed = getattr(post, counter)
+                expected = actual[counter].get(post.id, 0)
+                if observed == expected:
+                    continue
+                repaired += Post.query.filter(Post.id == post.id, column == observed).update({
+                    column: expected,
+                    Post.updated_at: Post.updated_at,
+                }, synchronize_session=False)
+        db.session.commit()
+    return repaired
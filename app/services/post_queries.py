@@ -0,0 +1,82 @@
+"""
+게시판 화면용 조회 (N+1 쿼리 방지)
+
+목록/메인 화면의 게시글은 작성자와 카테고리를 JOIN으로 함께 읽고
+좋아요/댓글 수는 Post의 카운터 컬럼을 사용하므로, 게시글 수와 관계없이
+페이지당 쿼리 수가 일정합니다. 상세 화면의 댓글은 게시글의 모든 댓글을
+작성자와 함께 한 번에 읽은 뒤 메모리에서 트리로 조립하여 replies/parent
+접근 시 추가 쿼리가 발생하지 않게 합니다. 목록은 정렬 키별 키셋 커서로
+페이지를 나눕니다 (OFFSET/COUNT 없음).
+"""
+
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models import Post, Comment
+from app.services.pagination import keyset_paginate
+
+# 목록 정렬별 키셋 정렬 키 (모두 내림차순, Post 복합 인덱스와 같은 순서)
+POST_SORTS = {
+    'latest': (Post.created_at, Post.id),
+    'popular': (Post.view_count, Post.id),
+    'likes': (Post.like_count, Post.id),
+}
+
+
+def post_list_options():
+    """목록 화면 게시글 로딩 옵션 (작성자/카테고리 JOIN)"""
+    return (joinedload(Post.author), joinedload(Post.category))
+
+
+def published_posts():
+    """작성자/카테고리를 함께 읽는 게시 상태 게시글 쿼리"""
+    return Post.query.options(*post_list_options()).filter(Post.is_published == True)
+
+
+def paginate_posts(query, sort_by='latest', cursor=None, per_page=10, total=None):
+    """정렬 키 기준 키셋 페이지 (알 수 없는 정렬은 최신순)"""
+    columns = POST_SORTS.get(sort_by, POST_SORTS['latest'])
+    return keyset_paginate(query, columns, cursor=cursor, per_page=per_page, total=total)
+
+
+def post_summary(post):
+    """목록 JSON 항목 (무한 스크롤용)"""
+    return {
+        'id': post.id,
+        'title': post.title,
+        'tags': post.get_tags_list(),
+        'author': post.author.username if post.author else None,
+        'category': post.category.name if post.category else None,
+        'view_count': post.view_count,
+        'like_count': post.get_like_count(),
+        'comment_count': post.get_comment_count(),
+        'created_at': post.created_at.isoformat() if post.created_at else None,
+    }
+
+
+def get_post_or_404(post_id):
+    """상세 화면 게시글 (작성자/카테고리 포함)"""
+    return Post.query.options(*post_list_options()).filter(Post.id == post_id).first_or_404()
+
+
+def load_comment_tree(post_id):
+    """게시글의 최상위 댓글 목록 (각 댓글의 replies를 미리 채움, 쿼리 1회)"""
+    comments = Comment.query.options(joinedload(Comment.author)) \
+        .filter(Comment.post_id == post_id) \
+        .order_by(Comment.created_at.asc(), Comment.id.asc()).all()
+
+    by_id = {comment.id: comment for comment in comments}
+    children = {comment.id: [] for comment in comments}
+    roots = []
+    for comment in comments:
+        parent = by_id.get(comment.parent_id)
+        if parent is None:
+            roots.append(comment)
+        else:
+            children[parent.id].append(comment)
+
+    # 관계를 로딩된 값으로 채워 템플릿에서 지연 로딩이 일어나지 않게 함
+    for comment in comments:
+        set_committed_value(comment, 'replies', children[comment.id])
+        set_committed_value(comment, 'parent', by_id.get(comment.parent_id))
+    return roots
@@ -0,0 +1,298 @@
+"""
+검색어 로그 및 인기 검색어 집계
+
+검색/챗봇 요청은 검색어를 메모리 큐에 넣기만 하고(요청 경로에서 I/O 없음),
+백그라운드 스레드가 회전 JSONL 파일에 기록하면서 시간 구간별
+Space-Saving(heavy hitters) 요약에 집계합니다. 주기적으로 최근 1시간/24시간
+상위 검색어를 미리 계산해 두므로 인기 검색어 API는 메모리 값만 반환합니다.
+재시작 시에는 JSONL 파일의 최근 기록으로 집계를 복구합니다.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+from app.services.answer_cache import normalize_message
+
+# 집계 시간 구간 길이 (초) 및 보관 기간
+BUCKET_SECONDS = 300
+RETENTION_SECONDS = 24 * 3600
+
+# 인기 검색어 계산 구간
+WINDOWS = {'1h': 3600, '24h': RETENTION_SECONDS}
+
+# 구간별 Space-Saving 카운터 수 (상위 항목 정확도와 메모리의 균형)
+SKETCH_CAPACITY = 200
+
+# 검색어 그룹 (검색창 검색어와 챗봇 질문은 따로 집계)
+SOURCE_GROUPS = {
+    'search': 'search',
+    'semantic': 'search',
+    'ai_search': 'search',
+    'main': 'search',
+    'chatbot': 'chatbot',
+}
+
+# 검색어 최대 길이 (그 이상은 잘라서 기록)
+MAX_QUERY_LENGTH = 200
+
+
+class SpaceSaving:
+    """Space-Saving heavy hitters 요약 (고정 개수 카운터, 과대 추정만 발생)"""
+
+    def __init__(self, capacity=SKETCH_CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+
+    def add(self, key, count=1):
+        if key in self.counts or len(self.counts) < self.capacity:
+            self.counts[key] = self.counts.get(key, 0) + count
+            return
+        # 가장 작은 카운터를 새 항목으로 교체 (이전 값을 이어받음)
+        victim = min(self.counts, key=self.counts.get)
+        self.counts[key] = self.counts.pop(victim) + count
+
+    def merge_into(self, totals):
+        for key, count in self.counts.items():
+            totals[key] = totals.get(key, 0) + count
+
+
+class QueryStats:
+    """시간 구간별 요약을 합쳐 슬라이딩 윈도 상위 검색어 계산"""
+
+    def __init__(self):
+        self._buckets = {group: deque() for group in set(SOURCE_GROUPS.values())}
+        self._display = {}  # 정규화 검색어 -> 마지막으로 본 원래 표기
+        self._top = {}
+        self._lock = threading.Lock()
+
+    def add(self, group, key, display, ts):
+        buckets = self._buckets[group]
+        start = int(ts // BUCKET_SECONDS) * BUCKET_SECONDS
+        with self._lock:
+            if not buckets or buckets[-1][0] < start:
+                buckets.append((start, SpaceSaving()))
+            elif buckets[-1][0] > start:
+                # 파일 복구 시 오래된 기록은 해당 구간 찾기
+                for bucket_start, sketch in buckets:
+                    if bucket_start == start:
+                        sketch.add(key)
+                        break
+                self._display[key] = display
+                return
+            buckets[-1][1].add(key)
+            self._display[key] = display
+
+    def aggregate(self, now=None, size=20):
+        """윈도별 상위 검색어 재계산"""
+        now = now or time.time()
+        top = {}
+        with self._lock:
+            for group, buckets in self._buckets.items():
+                while buckets and buckets[0][0] < now - RETENTION_SECONDS:
+                    buckets.popleft()
+                for window, seconds in WINDOWS.items():
+                    totals = {}
+                    for bucket_start, sketch in buckets:
+                        if bucket_start >= now - seconds:
+                            sketch.merge_into(totals)
+                    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:size]
+                    top[(group, window)] = [(self._display.get(key, key), count) for key, count in ranked]
+            live = {key for buckets in self._buckets.values() for _, sketch in buckets for key in sketch.counts}
+            self._display = {key: value for key, value in self._display.items() if key in live}
+        self._top = top
+        return top
+
+    def top(self, group='search', window='24h'):
+        return self._top.get((group, window), [])
+
+
+class QueryLog:
+    """검색어 로그 기록 스레드 + 인기 검색어 집계"""
+
+    def __init__(self, path=None, max_bytes=10 * 1024 * 1024, backups=5,
+                 aggregate_interval=30, queue_size=10000):
+        self.path = path
+        self.aggregate_interval = aggregate_interval
+        self.stats = QueryStats()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._listeners = []
+        self.dropped = 0
+        self.logged = 0
+
+        self._file_logger = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self._file_logger = logging.getLogger(f"query_log.{path}")
+            self._file_logger.setLevel(logging.INFO)
+            self._file_logger.propagate = False
+            self._file_logger.handlers = [handler]
+
+    def log(self, query, source='search'):
+        """검색어 기록 (요청 경로에서 호출, 큐가 가득 차면 버림)"""
+        query = (query or '').strip()[:MAX_QUERY_LENGTH]
+        if len(query) < 2 or source not in SOURCE_GROUPS:
+            return
+        try:
+            self._queue.put_nowait((time.time(), source, query))
+        except queue.Full:
+            self.dropped += 1
+
+    def on_aggregate(self, listener):
+        """집계 후 호출할 함수 등록 (인기 검색어 기반 캐시 예열 등)"""
+        self._listeners.append(listener)
+
+    def start(self):
+        self._replay_file()
+        self.stats.aggregate()
+        self._thread = threading.Thread(target=self._loop, name="query-log", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _record(self, ts, source, query):
+        key = normalize_message(query)
+        if not key:
+            return
+        self.stats.add(SOURCE_GROUPS[source], key, query, ts)
+        self.logged += 1
+        if self._file_logger is not None:
+            self._file_logger.info(json.dumps({'ts': round(ts, 3), 'source': source, 'q': query}, ensure_ascii=False))
+
+    def _drain(self):
+        while True:
+            try:
+                ts, source, query = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._record(ts, source, query)
+
+    def _loop(self):
+        next_aggregate = time.monotonic() + self.aggregate_interval
+        while not self._stop.is_set():
+            try:
+                ts, source, query = self._queue.get(timeout=1.0)
+                self._record(ts, source, query)
+                self._drain()
+            except queue.Empty:
+                pass
+            except Exception as e:
+                print(f"⚠️ 검색어 로그 기록 실패: {e}")
+
+            if time.monotonic() >= next_aggregate:
+                next_aggregate = time.monotonic() + self.aggregate_interval
+                self.stats.aggregate()
+                for listener in self._listeners:
+                    try:
+                        listener(self)
+                    except Exception as e:
+                        print(f"⚠️ 인기 검색어 후처리 실패: {e}")
+
+    def _replay_file(self):
+        """현재/직전 로그 파일에서 보관 기간 내 기록을 읽어 집계 복구"""
+        if not self.path:
+            return
+        since = time.time() - RETENTION_SECONDS
+        for path in (f"{self.path}.1", self.path):
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        if entry.get('ts', 0) >= since and entry.get('source') in SOURCE_GROUPS:
+                            key = normalize_message(entry.get('q'))
+                            if key:
+                                self.stats.add(SOURCE_GROUPS[entry['source']], key, entry['q'], entry['ts'])
+            except OSError as e:
+                print(f"⚠️ 검색어 로그 읽기 실패: {e}")
+
+    def popular(self, size=10, window='24h', group='search'):
+        return [query for query, _ in self.stats.top(group, window)[:size]]
+
+    def metrics(self):
+        return {
+            'logged': self.logged,
+            'dropped': self.dropped,
+            'queue_depth': self._queue.qsize(),
+            'top': {
+                f"{group}:{window}": self.stats.top(group, window)[:10]
+                for group in set(SOURCE_GROUPS.values()) for window in WINDOWS
+            },
+        }
+
+
+_query_log = None
+_query_log_lock = threading.Lock()
+
+
+def get_query_log():
+    """프로세스 전역 검색어 로그 반환"""
+    global _query_log
+    if _query_log is None:
+        with _query_log_lock:
+            if _query_log is None:
+                _query_log = QueryLog(
+                    path=os.getenv('QUERY_LOG_PATH', 'logs/query_log.jsonl') or None,
+                    max_bytes=int(os.getenv('QUERY_LOG_MAX_BYTES', str(10 * 1024 * 1024))),
+                    backups=int(os.getenv('QUERY_LOG_BACKUPS', '5')),
+                    aggregate_interval=float(os.getenv('POPULAR_REFRESH_SECONDS', '30')),
+                )
+    return _query_log
+
+
+def log_query(query, source='search'):
+    get_query_log().log(query, source)
+
+
+def _prewarm_caches(app, size):
+    """인기 검색어로 자동완성/검색 결과 캐시 예열 (인덱스 세대가 바뀌었을 때만)"""
+    state = {'generation': None}
+
+    def listener(query_log):
+        from app.services.elasticsearch_service import ElasticsearchService
+        from app.services.search_cache import get_search_cache
+        from app.services.suggestions import get_suggestion_index
+
+        top = query_log.stats.top('search', '24h')
+        if top:
+            get_suggestion_index().set_queries(dict(top))
+
+        generation = get_search_cache().generation()
+        if generation == state['generation']:
+            return
+        state['generation'] = generation
+        es_service = ElasticsearchService()
+        if not es_service.available:
+            return
+        with app.app_context():
+            # 고급 검색(20건), AI 검색(5건), 챗봇 하이브리드 검색 후보(10건)와 같은 키로 조회
+            for query, _ in top[:size]:
+                es_service.search_documents(query, size=20)
+                es_service.search_documents(query, size=5)
+            for query, _ in query_log.stats.top('chatbot', '1h')[:size]:
+                es_service.search_documents(query, size=10)
+    return listener
+
+
+def start_query_log(app):
+    """QUERY_LOG_ENABLED 설정에 따라 검색어 로그 스레드 시작"""
+    if os.getenv('QUERY_LOG_ENABLED', 'true').lower() != 'true':
+        return None
+    query_log = get_query_log()
+    query_log.on_aggregate(_prewarm_caches(app, int(os.getenv('CACHE_PREWARM_SIZE', '10'))))
+    query_log.start()
+    return query_log
@@ -0,0 +1,128 @@
+"""
+하이브리드 검색 (BM25 + 벡터 유사도, Reciprocal Rank Fusion)
+
+챗봇 RAG 컨텍스트 조회와 FAQ 즉시 응답 판단에 사용합니다.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.elasticsearch_service import ElasticsearchService
+from app.services.llm_service import get_llm_service
+
+# RRF 상수 (순위 1과 2의 점수 차이를 완만하게 만드는 값, 일반적으로 60)
+RRF_K = 60
+
+# FAQ 즉시 응답 기준 (질문-FAQ 코사인 유사도, 인덱스 크기와 무관)
+FAQ_CONFIDENCE_THRESHOLD = float(os.getenv('FAQ_CONFIDENCE_THRESHOLD', '0.7'))
+
+# 임베딩을 사용할 수 없을 때의 기존 BM25 점수 기준
+LEGACY_FAQ_SCORE_THRESHOLD = 5.0
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="retrieval")
+
+
+def reciprocal_rank_fusion(ranked_lists, k=RRF_K):
+    """여러 순위 목록을 RRF 점수로 합쳐 (문서 ID, 점수, 히트) 목록 반환"""
+    scores = {}
+    hits = {}
+    for ranked in ranked_lists:
+        for rank, hit in enumerate(ranked, start=1):
+            doc_id = hit['_id']
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+            # 하이라이트가 있는 BM25 결과를 우선 보관
+            hits.setdefault(doc_id, hit)
+    ordered = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return [(doc_id, score, hits[doc_id]) for doc_id, score in ordered]
+
+
+class RetrievalResult:
+    """하이브리드 검색 결과"""
+
+    def __init__(self, hits, confidence=None, faq_answer=None, strategy='hybrid'):
+        self.hits = hits
+        self.confidence = confidence
+        self.faq_answer = faq_answer
+        self.strategy = strategy
+
+    @property
+    def doc_ids(self):
+        return [hit.get('_id') for hit in self.hits]
+
+
+class HybridRetriever:
+    """BM25와 벡터 검색을 병렬 실행 후 RRF로 결합"""
+
+    def __init__(self, es_service=None, llm_service=None, candidates=10):
+        self.es_service = es_service or ElasticsearchService()
+        self.llm_service = llm_service or get_llm_service()
+        self.candidates = candidates
+
+    def _keyword_hits(self, query):
+        result = self.es_service.search_documents(query, size=self.candidates)
+        return result.get('hits', {}).get('hits', []) if result else []
+
+    def _vector_hits(self, query):
+        embeddings = self.llm_service.get_embeddings([query])
+        if embeddings is None:
+            return None
+        result = self.es_service.knn_search(embeddings[0], size=self.candidates)
+        return result.get('hits', {}).get('hits', []) if result else []
+
+    def retrieve(self, query, size=5):
+        """질문에 대한 컨텍스트 문서와 FAQ 즉시 응답 신뢰도 반환"""
+        if not self.es_service.available:
+            # 검색 서비스 장애 중에는 임베딩 계산/타임아웃 대기 없이 바로 반환
+            return RetrievalResult([], strategy='unavailable')
+
+        keyword_future = _executor.submit(self._keyword_hits, query)
+        vector_future = _executor.submit(self._vector_hits, query)
+
+        keyword_hits = keyword_future.result()
+        try:
+            vector_hits = vector_future.result()
+        except Exception as e:
+            print(f"❌ 벡터 검색 실패: {e}")
+            vector_hits = None
+
+        if not vector_hits:
+            # 임베딩을 사용할 수 없으면 BM25 결과와 기존 점수 기준 사용
+            return self._keyword_only(keyword_hits[:size])
+
+        fused = reciprocal_rank_fusion([keyword_hits, vector_hits])[:size]
+        hits = []
+        for doc_id, score, hit in fused:
+            hits.append(dict(hit, _score=round(score, 6)))
+
+        confidence, faq_answer = self._faq_confidence(hits, vector_hits)
+        return RetrievalResult(hits, confidence=confidence, faq_answer=faq_answer)
+
+    def _faq_confidence(self, hits, vector_hits):
+        """결합 1위 문서가 FAQ이면 질문과의 코사인 유사도를 신뢰도로 사용"""
+        if not hits:
+            return None, None
+        top = hits[0]
+        if top.get('_source', {}).get('doc_type') != 'faq':
+            return None, None
+
+        for hit in vector_hits:
+            if hit['_id'] == top['_id']:
+                # cosine similarity의 ES 점수는 (1 + cos) / 2
+                confidence = round(2 * hit.get('_score', 0) - 1, 4)
+                break
+        else:
+            return None, None
+
+        faq_answer = None
+        if confidence >= FAQ_CONFIDENCE_THRESHOLD:
+            faq_answer = top['_source'].get('content')
+        return confidence, faq_answer
+
+    def _keyword_only(self, hits):
+        faq_answer = None
+        if hits:
+            top = hits[0]
+            source = top.get('_source', {})
+            if source.get('doc_type') == 'faq' and top.get('_score', 0) >= LEGACY_FAQ_SCORE_THRESHOLD:
+                faq_answer = source.get('content')
+        return RetrievalResult(hits, faq_answer=faq_answer, strategy='keyword')
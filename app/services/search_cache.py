@@ -0,0 +1,88 @@
+"""
+검색 결과 캐시
+
+정규화한 검색어, 필터, 정렬, size/from(또는 search_after)을 키로 search_documents 응답을 짧은
+TTL 동안 재사용합니다. 인덱스에 쓰기가 일어나면 세대 번호를 올려 이전
+세대의 결과가 더 이상 조회되지 않게 합니다 (Redis 사용 시 워커 간 공유,
+메모리 캐시에서는 프로세스별 세대 + TTL로 최신성 보장).
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+
+from app.services.cache import create_cache
+from app.services.answer_cache import normalize_message
+
+GENERATION_KEY = 'generation'
+
+
+def _canonical_filters(filters):
+    """필터 dict를 순서와 무관한 형태로 정규화 (빈 값 제거)"""
+    canonical = {}
+    for name, value in (filters or {}).items():
+        if not value:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = sorted(str(item).strip() for item in value if str(item).strip())
+        canonical[name] = value
+    return canonical
+
+
+class SearchResultCache:
+    """search_documents 응답 캐시 (TTL + 세대 기반 무효화)"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.invalidations = 0
+
+    def generation(self):
+        return self.backend.get_counters([GENERATION_KEY])[0]
+
+    def _key(self, query, filters, size, from_, sort, search_after):
+        raw = json.dumps(
+            [self.generation(), normalize_message(query), _canonical_filters(filters), size, from_, sort, search_after],
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get(self, query, filters, size, from_, sort=None, search_after=None):
+        value = self.backend.get(self._key(query, filters, size, from_, sort, search_after))
+        # 호출하는 쪽에서 결과를 수정하는 경우가 있어 복사본 반환
+        return copy.deepcopy(value) if value is not None else None
+
+    def set(self, query, filters, size, from_, response, sort=None, search_after=None):
+        # 저장한 뒤에도 호출하는 쪽이 response를 수정할 수 있으므로 복사본 저장
+        self.backend.set(self._key(query, filters, size, from_, sort, search_after), copy.deepcopy(response))
+
+    def invalidate(self):
+        """인덱스 쓰기 후 호출 (이전 세대 결과는 TTL로 자연 만료)"""
+        self.invalidations += 1
+        self.backend.incr(GENERATION_KEY)
+
+    def stats(self):
+        stats = self.backend.stats()
+        stats['generation'] = self.generation()
+        stats['invalidations'] = self.invalidations
+        return stats
+
+
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache():
+    """프로세스 전역 검색 결과 캐시 반환"""
+    global _search_cache
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                _search_cache = SearchResultCache(create_cache(
+                    'search',
+                    maxsize=int(os.getenv('SEARCH_CACHE_SIZE', '2048')),
+                    ttl=int(os.getenv('SEARCH_CACHE_TTL', '30')),
+                ))
+    return _search_cache
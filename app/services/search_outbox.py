@@ -0,0 +1,259 @@
+"""
+검색 인덱스 동기화 아웃박스
+
+게시글/FAQ를 변경하는 요청은 같은 트랜잭션에 search_outbox 행만 기록하고,
+디스패처 스레드가 배치로 읽어 Elasticsearch에 반영합니다. 문서 내용은
+처리 시점의 DB 상태로 만들고 DB를 읽기 직전의 document_version을 ES 외부
+버전으로 사용하므로 (일괄 재색인/단건 쓰기와 같은 기준), 같은 문서를 여러
+작업자가 처리해도 오래된 쓰기가 새 쓰기를 덮어쓰지 않습니다. 실패한 문서는
+지수 백오프로 재시도합니다.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from elasticsearch import helpers
+from sqlalchemy.orm import joinedload
+
+from app import db
+from app.models import SearchOutbox, Post, FAQ
+from app.services.document_builder import build_post_document, build_faq_document, embed_texts
+from app.services.elasticsearch_service import (
+    ElasticsearchService, WRITE_TIMEOUT, document_version, is_bulk_item_applied
+)
+from app.services.search_cache import get_search_cache
+
+# 재시도 대기 시간 기준 (초, 2배씩 증가) 및 최대 시도 횟수
+RETRY_BASE_SECONDS = 5
+MAX_ATTEMPTS = 8
+
+# 디스패처 처리 통계 (프로세스 단위)
+_metrics = {
+    'dispatched': 0,
+    'failed': 0,
+    'batches': 0,
+    'last_batch_ms': None,
+    'last_dispatch_at': None,
+}
+_metrics_lock = threading.Lock()
+
+
+def record_search_change(doc_id):
+    """검색 문서 변경 기록 (커밋은 호출한 쪽의 트랜잭션에서 수행)"""
+    row = SearchOutbox(doc_id=doc_id)
+    db.session.add(row)
+    return row
+
+
+def _split_doc_ids(doc_ids):
+    post_ids = []
+    faq_ids = []
+    for doc_id in doc_ids:
+        kind, _, raw_id = doc_id.partition('-')
+        if kind == 'post':
+            post_ids.append(int(raw_id))
+        elif kind == 'faq':
+            faq_ids.append(int(raw_id))
+    return post_ids, faq_ids
+
+
+def _load_documents(doc_ids):
+    """문서 ID별 현재 검색 문서 (삭제/비활성이면 None)"""
+    post_ids, faq_ids = _split_doc_ids(doc_ids)
+    documents = {doc_id: None for doc_id in doc_ids}
+
+    posts = Post.query.options(joinedload(Post.author), joinedload(Post.category)) \
+        .filter(Post.id.in_(post_ids)).all() if post_ids else []
+    faqs = FAQ.query.filter(FAQ.id.in_(faq_ids), FAQ.is_active == True).all() if faq_ids else []
+
+    # 배치 전체 임베딩을 한 번에 계산
+    embeddings = embed_texts(
+        [(post.title, post.content) for post in posts] + [(faq.question, faq.answer) for faq in faqs]
+    )
+    for post, embedding in zip(posts, embeddings[:len(posts)]):
+        doc = build_post_document(post, with_embedding=False)
+        if embedding is not None:
+            doc["embedding"] = embedding
+        documents[f"post-{post.id}"] = doc
+    for faq, embedding in zip(faqs, embeddings[len(posts):]):
+        doc = build_faq_document(faq, with_embedding=False)
+        if embedding is not None:
+            doc["embedding"] = embedding
+        documents[f"faq-{faq.id}"] = doc
+    return documents
+
+
+def dispatch_batch(es_service=None, batch_size=200):
+    """대기 중인 아웃박스 행을 배치로 ES에 반영하고 (반영, 실패) 문서 수 반환"""
+    es_service = es_service or ElasticsearchService()
+    if not es_service.available:
+        return 0, 0
+
+    started = time.perf_counter()
+    now = datetime.utcnow()
+    rows = SearchOutbox.query.filter(
+        SearchOutbox.status == 'pending',
+        SearchOutbox.next_attempt_at <= now
+    ).order_by(SearchOutbox.id.asc()).limit(batch_size).with_for_update(skip_locked=True).all()
+
+    if not rows:
+        db.session.rollback()
+        return 0, 0
+
+    # 같은 문서의 여러 변경은 하나로 합침 (내용은 현재 DB 상태 기준)
+    rows_by_doc = {}
+    for row in rows:
+        rows_by_doc.setdefault(row.doc_id, []).append(row)
+
+    errors = {}
+    try:
+        # 문서를 읽기 전에 버전을 정해야 이보다 나중에 읽은 쓰기가 항상 이김
+        version = document_version()
+        documents = _load_documents(list(rows_by_doc))
+        actions = []
+        for doc_id in rows_by_doc:
+            action = {
+                "_index": es_service.index_name,
+                "_id": doc_id,
+                "version": version,
+                "version_type": "external",
+            }
+            if documents[doc_id] is None:
+                action["_op_type"] = "delete"
+            else:
+                action["_source"] = documents[doc_id]
+            actions.append(action)
+
+        client = es_service.es.options(request_timeout=WRITE_TIMEOUT * 4)
+        # 검색 결과 캐시 무효화 전에 변경이 검색에 보이도록 refresh까지 대기
+        for ok, info in helpers.streaming_bulk(
+            client, actions, raise_on_error=False, raise_on_exception=False, max_retries=2,
+            refresh='wait_for'
+        ):
+            if ok:
+                continue
+            op_type, item = next(iter(info.items()))
+            if not is_bulk_item_applied(op_type, item):
+                errors[item.get('_id')] = str(item.get('error') or item.get('status'))[:2000]
+    except Exception as e:
+        errors = {doc_id: str(e)[:2000] for doc_id in rows_by_doc}
+
+    retry_at = datetime.utcnow()
+    for doc_id, doc_rows in rows_by_doc.items():
+        if doc_id not in errors:
+            for row in doc_rows:
+                db.session.delete(row)
+            continue
+        for row in doc_rows:
+            row.attempts += 1
+            row.last_error = errors[doc_id]
+            if row.attempts >= MAX_ATTEMPTS:
+                row.status = 'failed'
+                print(f"❌ 검색 인덱스 동기화 실패 (재시도 중단): {doc_id} #{row.id}")
+            else:
+                row.next_attempt_at = retry_at + timedelta(
+                    seconds=RETRY_BASE_SECONDS * (2 ** (row.attempts - 1))
+                )
+    db.session.commit()
+
+    dispatched = len(rows_by_doc) - len(errors)
+    if dispatched:
+        get_search_cache().invalidate()
+    with _metrics_lock:
+        _metrics['dispatched'] += dispatched
+        _metrics['failed'] += len(errors)
+        _metrics['batches'] += 1
+        _metrics['last_batch_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        _metrics['last_dispatch_at'] = datetime.utcnow().isoformat()
+    if errors:
+        print(f"⚠️ 검색 인덱스 동기화 실패 {len(errors)}건 (재시도 예정)")
+    return dispatched, len(errors)
+
+
+def drain(batch_size=200, max_batches=None):
+    """대기 중인 행을 현재 스레드에서 처리 (재시도 대기 중인 행은 제외)"""
+    total_dispatched = total_failed = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        dispatched, failed = dispatch_batch(batch_size=batch_size)
+        if not dispatched and not failed:
+            break
+        total_dispatched += dispatched
+        total_failed += failed
+        batches += 1
+    return total_dispatched, total_failed
+
+
+def retry_failed():
+    """재시도 중단된 행을 다시 대기 상태로 변경"""
+    count = SearchOutbox.query.filter(SearchOutbox.status == 'failed').update({
+        SearchOutbox.status: 'pending',
+        SearchOutbox.attempts: 0,
+        SearchOutbox.next_attempt_at: datetime.utcnow(),
+    }, synchronize_session=False)
+    db.session.commit()
+    return count
+
+
+def outbox_stats():
+    """아웃박스 적체/지연 지표 (lag_seconds: 가장 오래된 미반영 변경의 경과 시간)"""
+    counts = dict(
+        db.session.query(SearchOutbox.status, db.func.count(SearchOutbox.id))
+        .group_by(SearchOutbox.status).all()
+    )
+    oldest = db.session.query(db.func.min(SearchOutbox.created_at)) \
+        .filter(SearchOutbox.status == 'pending').scalar()
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    metrics.update({
+        'pending': counts.get('pending', 0),
+        'failed_rows': counts.get('failed', 0),
+        'lag_seconds': round((datetime.utcnow() - oldest).total_seconds(), 1) if oldest else 0,
+    })
+    return metrics
+
+
+class OutboxDispatcher:
+    """search_outbox 테이블을 폴링하여 ES에 반영하는 스레드"""
+
+    def __init__(self, app, batch_size=200, poll_interval=1.0):
+        self.app = app
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name="search-outbox", daemon=True)
+        self._thread.start()
+        print("✅ 검색 인덱스 동기화 스레드 시작")
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            dispatched = 0
+            try:
+                with self.app.app_context():
+                    dispatched, _ = dispatch_batch(batch_size=self.batch_size)
+            except Exception as e:
+                print(f"❌ 검색 인덱스 동기화 스레드 오류: {e}")
+            # 배치가 가득 찼으면 바로 다음 배치 처리
+            if dispatched < self.batch_size:
+                self._stop.wait(self.poll_interval)
+
+
+def start_outbox_dispatcher(app):
+    """SEARCH_OUTBOX_DISPATCHER 설정에 따라 동기화 스레드 시작"""
+    if os.getenv('SEARCH_OUTBOX_DISPATCHER', 'true').lower() != 'true':
+        return None
+    dispatcher = OutboxDispatcher(
+        app,
+        batch_size=int(os.getenv('SEARCH_OUTBOX_BATCH_SIZE', '200')),
+        poll_interval=float(os.getenv('SEARCH_OUTBOX_POLL_INTERVAL', '1.0'))
+    )
+    dispatcher.start()
+    return dispatcher
@@ -0,0 +1,86 @@
+"""
+스트리밍 응답 유틸리티 (Server-Sent Events)
+"""
+
+import json
+
+from flask import Response, stream_with_context
+
+
+def truncate_stream(chunks, max_chars):
+    """텍스트 조각 스트림에 글자 수 제한을 점진적으로 적용
+
+    전체 응답에 `response[:max_chars].rsplit(' ', 1)[0] + "..."`를 적용한
+    결과와 같은 텍스트를 내보냅니다. 잘림 위치는 공백에서만 생기므로
+    마지막 공백 이후의 텍스트는 다음 조각이 올 때까지 보류합니다.
+    """
+    buffer = ""
+    emitted = 0
+
+    for chunk in chunks:
+        buffer += chunk
+
+        if len(buffer) > max_chars:
+            final = buffer[:max_chars].rsplit(' ', 1)[0] + "..."
+            if len(final) > emitted:
+                yield final[emitted:]
+            # 제너레이터를 닫아 상위 스트림(생성)을 중단
+            close = getattr(chunks, 'close', None)
+            if close:
+                close()
+            return
+
+        safe_end = buffer.rfind(' ')
+        if safe_end > emitted:
+            yield buffer[emitted:safe_end]
+            emitted = safe_end
+
+    if len(buffer) > emitted:
+        yield buffer[emitted:]
+
+
+def wants_stream(data=None):
+    """요청 본문의 stream 플래그 또는 Accept 헤더로 스트리밍 여부 판단"""
+    from flask import request
+
+    if data and data.get('stream'):
+        return True
+    return 'text/event-stream' in request.headers.get('Accept', '')
+
+
+def _sse(payload):
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def sse_response(chunks, on_complete=None, **extra):
+    """텍스트 조각 스트림을 SSE 응답으로 변환
+
+    각 조각은 {"delta": ...} 이벤트로, 마지막에는 전체 응답과
+    extra 필드를 담은 {"done": true, ...} 이벤트를 보냅니다.
+    on_complete는 스트림이 오류 없이 끝나면 전체 응답으로 호출됩니다.
+    """
+    def _events():
+        parts = []
+        completed = False
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                yield _sse({'delta': chunk})
+            completed = True
+        except Exception as e:
+            print(f"❌ 스트리밍 중 오류: {e}")
+            yield _sse({'error': '응답 생성 중 오류가 발생했습니다.'})
+        response = "".join(parts)
+        if on_complete and completed:
+            on_complete(response)
+        yield _sse(dict(extra, done=True, response=response))
+
+    return Response(
+        stream_with_context(_events()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            # nginx 프록시 버퍼링 비활성화 (첫 토큰 즉시 전달)
+            'X-Accel-Buffering': 'no',
+        }
+    )
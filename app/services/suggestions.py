@@ -0,0 +1,227 @@
+"""
+검색어 자동완성 (프로세스 내 정렬 접두사 인덱스)
+
+게시글 제목/태그, FAQ 질문, 인기 검색어를 정규화한 키로 정렬된 목록에
+보관하고 bisect로 접두사 범위를 찾습니다. 제목 중간 단어부터 입력해도
+찾을 수 있도록 단어 시작 위치마다 키를 추가합니다. 키 입력마다 호출되므로
+요청 경로에서는 DB/ES를 조회하지 않으며, 변경분은 백그라운드에서
+updated_at 기준으로 주기적으로 반영하고 삭제 반영을 위해 가끔 전체를
+다시 만듭니다. 최초 생성도 백그라운드에서 하며, 그동안은 인기 검색어만
+제안합니다.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+
+from app.services.answer_cache import normalize_message
+
+# 출처별 기본 가중치 (같은 문구가 여러 곳에 있으면 합산)
+TITLE_WEIGHT = 3
+FAQ_WEIGHT = 3
+TAG_WEIGHT = 1
+
+# 한 문구에서 키를 만들 단어 시작 위치 수
+MAX_WORD_KEYS = 5
+
+# 접두사 하나당 순위 계산에 사용할 최대 후보 수 (짧은 접두사의 응답 시간 제한)
+MAX_CANDIDATES = 300
+
+
+def _word_keys(text):
+    """문구의 단어 시작 위치별 정규화 키"""
+    words = normalize_message(text).split(' ')
+    return {' '.join(words[i:]) for i in range(min(len(words), MAX_WORD_KEYS)) if words[i]}
+
+
+class SuggestionIndex:
+    """정렬 접두사 인덱스 (출처별 가중치 합산)"""
+
+    def __init__(self, refresh_interval=60, rebuild_interval=600):
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self._keys = []        # (정규화 키, 문구) 정렬 목록
+        self._weights = {}     # 문구 -> {출처: 가중치}
+        self._sources = {}     # 출처(문서 ID 등) -> {문구: 가중치}
+        self._lock = threading.RLock()
+        self._bulk = False     # 일괄 생성 중이면 _keys를 나중에 한 번만 정렬
+        self._ready = False
+        self._refreshing = False
+        self._synced_at = None
+        self._rebuilt_at = 0.0
+        self._refreshed_at = 0.0
+
+    # --- 변경 ---
+
+    def _add_text(self, source, text, weight):
+        text = (text or '').strip()
+        if not text:
+            return
+        refs = self._weights.get(text)
+        if refs is None:
+            refs = self._weights[text] = {}
+            for key in _word_keys(text):
+                if self._bulk:
+                    self._keys.append((key, text))
+                else:
+                    insort(self._keys, (key, text))
+        refs[source] = refs.get(source, 0) + weight
+        self._sources.setdefault(source, {})[text] = refs[source]
+
+    def _remove_source(self, source):
+        for text in self._sources.pop(source, {}):
+            refs = self._weights.get(text)
+            if refs is None:
+                continue
+            refs.pop(source, None)
+            if refs:
+                continue
+            del self._weights[text]
+            for key in _word_keys(text):
+                if self._bulk:
+                    self._keys.remove((key, text))
+                    continue
+                i = bisect_left(self._keys, (key, text))
+                if i < len(self._keys) and self._keys[i] == (key, text):
+                    del self._keys[i]
+
+    def set_document(self, doc_id, title, tags=(), weight=TITLE_WEIGHT):
+        """문서의 제목/태그 반영 (이전 값은 교체)"""
+        with self._lock:
+            self._remove_source(doc_id)
+            self._add_text(doc_id, title, weight)
+            for tag in tags or ():
+                self._add_text(doc_id, tag, TAG_WEIGHT)
+
+    def remove_document(self, doc_id):
+        with self._lock:
+            self._remove_source(doc_id)
+
+    def set_queries(self, counts):
+        """인기 검색어 반영 ({검색어: 횟수}, 이전 목록은 교체)"""
+        with self._lock:
+            for source in [source for source in self._sources if source.startswith('query:')]:
+                self._remove_source(source)
+            for query, count in counts.items():
+                self._add_text(f"query:{normalize_message(query)}", query, count)
+
+    # --- 조회 ---
+
+    def suggest(self, prefix, size=5):
+        """접두사로 시작하는(또는 단어가 접두사로 시작하는) 문구를 가중치 순으로 반환"""
+        key = normalize_message(prefix)
+        if not key:
+            return []
+        with self._lock:
+            candidates = {}
+            i = bisect_left(self._keys, (key,))
+            while i < len(self._keys) and len(candidates) < MAX_CANDIDATES:
+                entry_key, text = self._keys[i]
+                if not entry_key.startswith(key):
+                    break
+                if text not in candidates:
+                    candidates[text] = sum(self._weights[text].values())
+                i += 1
+        ranked = sorted(candidates.items(), key=lambda item: (-item[1], len(item[0]), item[0]))
+        return [text for text, _ in ranked[:size]]
+
+    @property
+    def has_queries(self):
+        return any(source.startswith('query:') for source in self._sources)
+
+    def __len__(self):
+        return len(self._weights)
+
+    # --- DB 동기화 ---
+
+    def _load(self, since=None):
+        """since 이후 변경된 게시글/FAQ 반영 (since가 없으면 전체)"""
+        from app.models import Post, FAQ
+
+        posts = Post.query.with_entities(Post.id, Post.title, Post.tags, Post.is_published)
+        faqs = FAQ.query.with_entities(FAQ.id, FAQ.question, FAQ.is_active)
+        if since is not None:
+            posts = posts.filter(Post.updated_at >= since)
+            faqs = faqs.filter(FAQ.updated_at >= since)
+
+        for post_id, title, tags, is_published in posts.yield_per(1000):
+            if is_published:
+                tag_list = [tag.strip() for tag in tags.split(',')] if tags else []
+                self.set_document(f"post-{post_id}", title, tag_list)
+            else:
+                self.remove_document(f"post-{post_id}")
+        for faq_id, question, is_active in faqs.yield_per(1000):
+            if is_active:
+                self.set_document(f"faq-{faq_id}", question, weight=FAQ_WEIGHT)
+            else:
+                self.remove_document(f"faq-{faq_id}")
+
+    def rebuild(self):
+        """DB 전체로 인덱스 재생성 (삭제된 문서 반영, 잠금은 교체할 때만 사용)"""
+        fresh = SuggestionIndex(self.refresh_interval, self.rebuild_interval)
+        fresh._bulk = True
+        started_at = datetime.utcnow()
+        fresh._load()
+        fresh._keys.sort()
+        fresh._bulk = False
+        with self._lock:
+            queries = {
+                text: weight
+                for source, texts in self._sources.items() if source.startswith('query:')
+                for text, weight in texts.items()
+            }
+            fresh.set_queries(queries)
+            self._keys, self._weights, self._sources = fresh._keys, fresh._weights, fresh._sources
+            self._synced_at = started_at
+            self._ready = True
+        self._rebuilt_at = self._refreshed_at = time.monotonic()
+
+    def refresh(self):
+        """마지막 동기화 이후 변경분만 반영"""
+        started_at = datetime.utcnow()
+        self._load(since=self._synced_at)
+        self._synced_at = started_at
+        self._refreshed_at = time.monotonic()
+
+    def ensure_fresh(self, app):
+        """아직 없거나 오래되었으면 백그라운드에서 생성/갱신 (요청은 기다리지 않음)"""
+        now = time.monotonic()
+        if self._ready and now - self._refreshed_at < self.refresh_interval:
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        full = not self._ready or now - self._rebuilt_at >= self.rebuild_interval
+        threading.Thread(target=self._background_refresh, args=(app, full), daemon=True).start()
+
+    def _background_refresh(self, app, full):
+        try:
+            with app.app_context():
+                if full:
+                    self.rebuild()
+                else:
+                    self.refresh()
+        except Exception as e:
+            print(f"⚠️ 자동완성 인덱스 갱신 실패: {e}")
+        finally:
+            self._refreshing = False
+
+
+_suggestion_index = None
+_suggestion_index_lock = threading.Lock()
+
+
+def get_suggestion_index():
+    """프로세스 전역 자동완성 인덱스 반환"""
+    global _suggestion_index
+    if _suggestion_index is None:
+        with _suggestion_index_lock:
+            if _suggestion_index is None:
+                _suggestion_index = SuggestionIndex(
+                    refresh_interval=float(os.getenv('SUGGEST_REFRESH_SECONDS', '60')),
+                    rebuild_interval=float(os.getenv('SUGGEST_REBUILD_SECONDS', '600')),
+                )
+    return _suggestion_index
@@ -0,0 +1,91 @@
+"""
+문서 요약 캐시
+
+검색 문서 ID와 내용 해시가 같으면 저장된 요약을 재사용하고,
+없는 문서만 한 번의 배치 요약으로 생성합니다. 게시글 요약은
+Post.summary 컬럼에도 기록합니다. 요약 모델을 사용할 수 없을 때의
+대체 요약(앞부분 잘라내기)은 응답에만 쓰고 저장하지 않으므로, 모델이
+준비되면 다음 요청이나 요약 작업 재시도에서 다시 생성됩니다.
+"""
+
+import hashlib
+
+from app import db
+from app.models import DocumentSummary, Post
+from app.services.llm_service import get_llm_service, truncate_summary
+
+# Post.summary 컬럼 길이
+POST_SUMMARY_LENGTH = 500
+
+
+def content_hash(text):
+    return hashlib.sha1((text or "").encode('utf-8')).hexdigest()
+
+
+def get_summaries(documents, max_length=100, strict=False):
+    """(문서 ID, 내용) 목록의 요약을 같은 순서로 반환
+
+    strict=True면 요약을 생성하지 못한 문서가 있을 때 (생성된 요약은
+    저장한 뒤) RuntimeError 발생 - 백그라운드 작업 재시도용
+    """
+    if not documents:
+        return []
+
+    doc_ids = [doc_id for doc_id, _ in documents]
+    hashes = [content_hash(content) for _, content in documents]
+    cached = {
+        row.doc_id: row
+        for row in DocumentSummary.query.filter(DocumentSummary.doc_id.in_(doc_ids)).all()
+    }
+
+    summaries = [None] * len(documents)
+    missing = []
+    for i, (doc_id, digest) in enumerate(zip(doc_ids, hashes)):
+        row = cached.get(doc_id)
+        # 이전 버전에서 저장된 대체 요약은 다시 생성
+        if (row is not None and row.content_hash == digest
+                and row.summary != truncate_summary(documents[i][1], max_length)):
+            summaries[i] = row.summary
+        else:
+            missing.append(i)
+
+    if not missing:
+        return summaries
+
+    generated = get_llm_service().summarize_batch(
+        [documents[i][1] for i in missing],
+        max_length=max_length
+    )
+
+    failed = 0
+    try:
+        for i, summary in zip(missing, generated):
+            if summary is None:
+                summaries[i] = truncate_summary(documents[i][1], max_length)
+                failed += 1
+                continue
+            summaries[i] = summary
+            doc_id = doc_ids[i]
+            row = cached.get(doc_id)
+            if row is None:
+                row = DocumentSummary(doc_id=doc_id)
+                db.session.add(row)
+                cached[doc_id] = row
+            row.content_hash = hashes[i]
+            row.summary = summary
+
+            if doc_id.startswith('post-'):
+                # 요약 저장은 게시글 수정이 아니므로 updated_at 유지
+                Post.query.filter_by(id=int(doc_id[len('post-'):])).update(
+                    {Post.summary: summary[:POST_SUMMARY_LENGTH], Post.updated_at: Post.updated_at},
+                    synchronize_session=False
+                )
+        db.session.commit()
+    except Exception as e:
+        # 캐시 저장 실패는 검색 응답에 영향을 주지 않음
+        db.session.rollback()
+        print(f"❌ 요약 캐시 저장 실패: {e}")
+
+    if failed and strict:
+        raise RuntimeError(f"요약 모델을 사용할 수 없습니다 ({failed}건 생성 실패).")
+    return summaries
@@ -0,0 +1,247 @@
+"""
+게시글 조회수 (write-behind 버퍼)
+
+조회 요청은 조회수를 버퍼(프로세스 메모리, REDIS_URL 사용 시 워커 간 공유
+Redis 해시)에 더하기만 하고, 플러시 스레드가 주기적으로 모아 둔 증가분을
+`UPDATE posts SET view_count = view_count + CASE id ... END` 한 번으로
+반영합니다. 봇 요청(VIEW_SKIP_BOTS)과 같은 사용자의 반복 조회
+(VIEW_DEDUP_SECONDS, 기본 비활성화)는 선택적으로 제외합니다.
+목록/인기 게시글 정렬은 DB에 반영된 값만 사용합니다.
+"""
+
+import atexit
+import hashlib
+import os
+import re
+import threading
+import uuid
+
+from app import db
+from app.models import Post
+from app.services.cache import create_cache, _get_redis_client
+
+# 봇/미리보기 요청 User-Agent (조회수에서 제외)
+BOT_USER_AGENT = re.compile(
+    r'bot|crawl|spider|slurp|preview|facebookexternalhit|headless|curl|wget|python-requests|httpx',
+    re.IGNORECASE
+)
+
+# Redis 버퍼 해시 키
+REDIS_PENDING_KEY = 'views:pending'
+
+
+class MemoryViewBuffer:
+    """프로세스 메모리 조회수 버퍼"""
+
+    backend = 'memory'
+
+    def __init__(self):
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def add(self, post_id, count=1):
+        with self._lock:
+            self._counts[post_id] = self._counts.get(post_id, 0) + count
+
+    def take(self):
+        """쌓인 증가분을 꺼내고 버퍼를 비움"""
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        return counts
+
+    def restore(self, counts):
+        """반영에 실패한 증가분을 다시 버퍼에 더함"""
+        for post_id, count in counts.items():
+            self.add(post_id, count)
+
+    def pending(self, post_id):
+        return self._counts.get(post_id, 0)
+
+    def size(self):
+        return len(self._counts)
+
+
+class RedisViewBuffer:
+    """Redis 해시 조회수 버퍼 (모든 워커가 공유, 꺼낼 때는 키 이름 변경으로 원자적 처리)"""
+
+    backend = 'redis'
+
+    def __init__(self, client):
+        self.client = client
+
+    def add(self, post_id, count=1):
+        try:
+            self.client.hincrby(REDIS_PENDING_KEY, post_id, count)
+        except Exception as e:
+            print(f"⚠️ Redis 조회수 기록 실패: {e}")
+
+    def take(self):
+        flushing_key = f"views:flushing:{uuid.uuid4().hex}"
+        try:
+            if not self.client.exists(REDIS_PENDING_KEY):
+                return {}
+            self.client.rename(REDIS_PENDING_KEY, flushing_key)
+        except Exception as e:
+            # 다른 워커가 먼저 가져간 경우 (no such key) 포함
+            if 'no such key' not in str(e).lower():
+                print(f"⚠️ Redis 조회수 버퍼 조회 실패: {e}")
+            return {}
+        pipe = self.client.pipeline()
+        pipe.hgetall(flushing_key)
+        pipe.delete(flushing_key)
+        raw, _ = pipe.execute()
+        return {int(post_id): int(count) for post_id, count in raw.items()}
+
+    def restore(self, counts):
+        if not counts:
+            return
+        pipe = self.client.pipeline()
+        for post_id, count in counts.items():
+            pipe.hincrby(REDIS_PENDING_KEY, post_id, count)
+        pipe.execute()
+
+    def pending(self, post_id):
+        try:
+            return int(self.client.hget(REDIS_PENDING_KEY, post_id) or 0)
+        except Exception:
+            return 0
+
+    def size(self):
+        try:
+            return int(self.client.hlen(REDIS_PENDING_KEY))
+        except Exception:
+            return None
+
+
+class ViewCounter:
+    """조회 기록(중복/봇 제외) 및 DB 일괄 반영"""
+
+    def __init__(self, buffer, dedup_seconds=0, skip_bots=True):
+        self.buffer = buffer
+        self.skip_bots = skip_bots
+        self._seen = create_cache('views-seen', maxsize=100000, ttl=dedup_seconds) if dedup_seconds else None
+        self._flush_lock = threading.Lock()
+        self.recorded = 0
+        self.skipped = 0
+        self.flushed = 0
+        self.flush_failures = 0
+
+    def record(self, post_id, viewer=None, user_agent=None):
+        """조회 1회 기록, 조회수에 반영할 조회면 True"""
+        if self.skip_bots and user_agent and BOT_USER_AGENT.search(user_agent):
+            self.skipped += 1
+            return False
+        if self._seen is not None and viewer:
+            key = f"{post_id}:{viewer}"
+            if self._seen.get(key) is not None:
+                self.skipped += 1
+                return False
+            self._seen.set(key, 1)
+        self.buffer.add(post_id)
+        self.recorded += 1
+        return True
+
+    def pending(self, post_id):
+        """아직 DB에 반영되지 않은 조회수"""
+        return self.buffer.pending(post_id)
+
+    def flush(self):
+        """버퍼의 증가분을 UPDATE 한 번으로 반영하고 반영한 게시글 수 반환"""
+        with self._flush_lock:
+            counts = self.buffer.take()
+            if not counts:
+                return 0
+            try:
+                Post.query.filter(Post.id.in_(list(counts))).update({
+                    Post.view_count: db.func.coalesce(Post.view_count, 0) + db.case(counts, value=Post.id, else_=0),
+                    # 조회수 변경은 게시글 수정으로 보지 않음
+                    Post.updated_at: Post.updated_at,
+                }, synchronize_session=False)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                self.buffer.restore(counts)
+                self.flush_failures += 1
+                print(f"❌ 조회수 반영 실패 (다음 주기에 재시도): {e}")
+                return 0
+            self.flushed += sum(counts.values())
+            return len(counts)
+
+    def stats(self):
+        return {
+            'backend': self.buffer.backend,
+            'recorded': self.recorded,
+            'skipped': self.skipped,
+            'flushed': self.flushed,
+            'flush_failures': self.flush_failures,
+            'pending_posts': self.buffer.size(),
+        }
+
+
+def viewer_key(user_id=None, remote_addr=None, user_agent=None):
+    """중복 조회 판단용 식별자 (로그인 사용자는 ID, 아니면 IP+User-Agent 해시)"""
+    if user_id:
+        return f"u{user_id}"
+    raw = f"{remote_addr or ''}|{user_agent or ''}"
+    return 'a' + hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+_view_counter = None
+_view_counter_lock = threading.Lock()
+
+
+def get_view_counter():
+    """프로세스 전역 조회수 카운터 반환"""
+    global _view_counter
+    if _view_counter is None:
+        with _view_counter_lock:
+            if _view_counter is None:
+                client = _get_redis_client()
+                _view_counter = ViewCounter(
+                    RedisViewBuffer(client) if client is not None else MemoryViewBuffer(),
+                    dedup_seconds=int(os.getenv('VIEW_DEDUP_SECONDS', '0')),
+                    skip_bots=os.getenv('VIEW_SKIP_BOTS', 'true').lower() == 'true',
+                )
+    return _view_counter
+
+
+class ViewCountFlusher:
+    """조회수 버퍼를 주기적으로 DB에 반영하는 스레드"""
+
+    def __init__(self, app, counter, interval=10.0):
+        self.app = app
+        self.counter = counter
+        self.interval = interval
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name="view-counter", daemon=True)
+        self._thread.start()
+        # 종료 시 메모리 버퍼에 남은 조회수 반영
+        atexit.register(self.flush_now)
+
+    def stop(self):
+        self._stop.set()
+
+    def flush_now(self):
+        try:
+            with self.app.app_context():
+                self.counter.flush()
+        except Exception as e:
+            print(f"❌ 조회수 반영 스레드 오류: {e}")
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.flush_now()
+
+
+def start_view_counter(app):
+    """VIEW_FLUSH_INTERVAL 주기로 조회수 반영 스레드 시작"""
+    flusher = ViewCountFlusher(
+        app,
+        get_view_counter(),
+        interval=float(os.getenv('VIEW_FLUSH_INTERVAL', '10'))
+    )
+    flusher.start()
+    return flusher
@@ -5,9 +5,15 @@
 
 import os
 import sys
+from flask_migrate import upgrade
 from app import create_app, db
 from app.models import User, Post, Comment, Like, Category, FAQ
 from app.services.elasticsearch_service import ElasticsearchService
+from app.services.index_manager import IndexManager
+from app.services.search_outbox import record_search_change, drain
+
+# Alembic 마이그레이션 디렉토리
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
 
 def init_database():
     """데이터베이스 초기화"""
@@ -19,6 +25,10 @@ def init_database():
             db.create_all()
             print("✅ 데이터베이스 테이블이 생성되었습니다.")
             
+            # 기존 테이블에 새 컬럼/인덱스 적용 및 카운터 채우기 (create_all은 기존 테이블을 변경하지 않음)
+            upgrade(directory=MIGRATIONS_DIR)
+            print("✅ 데이터베이스 마이그레이션이 적용되었습니다.")
+            
             # 기본 카테고리 생성
             categories = [
                 Category(name='공지사항', description='중요한 공지사항'),
@@ -45,36 +55,26 @@ def init_database():
             ]
 
             es = ElasticsearchService()
-            es.create_index()
+            # 인덱스/별칭 생성 및 매핑 확인 (누락 필드는 추가)
+            IndexManager(es).ensure_index()
 
+            # ES 반영은 검색 아웃박스를 거침 (다른 쓰기 경로와 같은 외부 버전 기준)
             for question, answer in faq_seed:
                 existing = FAQ.query.filter_by(question=question).first()
                 if existing:
                     # 이미 존재하면 ES만 동기화
-                    es.index_document(f"faq-{existing.id}", {
-                        "doc_type": "faq",
-                        "title": existing.question,
-                        "content": existing.answer,
-                        "category": existing.category,
-                        "created_at": existing.created_at.isoformat() if existing.created_at else None,
-                        "faq_id": existing.id,
-                    })
+                    record_search_change(f"faq-{existing.id}")
                     continue
 
                 faq = FAQ(question=question, answer=answer, category=None, is_active=True)
                 db.session.add(faq)
                 db.session.flush()  # id 확보
-                es.index_document(f"faq-{faq.id}", {
-                    "doc_type": "faq",
-                    "title": faq.question,
-                    "content": faq.answer,
-                    "category": faq.category,
-                    "created_at": faq.created_at.isoformat() if faq.created_at else None,
-                    "faq_id": faq.id,
-                })
+                record_search_change(f"faq-{faq.id}")
 
             db.session.commit()
-            print("✅ 기본 FAQ가 DB 및 Elasticsearch에 등록되었습니다.")
+            dispatched, failed = drain()
+            # 반영하지 못한 변경은 서버의 아웃박스 디스패처가 재시도
+            print(f"✅ 기본 FAQ가 DB에 등록되었습니다 (Elasticsearch 반영 {dispatched}건, 실패 {failed}건).")
             
         except Exception as e:
             print(f"❌ 데이터베이스 초기화 중 오류 발생: {e}")
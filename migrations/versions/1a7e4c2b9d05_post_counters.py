@@ -0,0 +1,75 @@
+"""post like/comment counters
+
+게시글 좋아요/댓글 수 카운터 컬럼과 정렬용 인덱스 추가.
+
+이 저장소의 DB는 지금까지 앱 시작 시 db.create_all()로 만들어졌으므로
+(새 테이블은 생성되지만 기존 테이블의 컬럼/인덱스는 추가되지 않음),
+각 단계는 현재 스키마를 확인한 뒤 없는 것만 추가합니다. 새로 추가한
+카운터는 likes/comments 테이블의 현재 집계로 채웁니다. 새로 만든 DB에서는
+create_all이 이미 같은 스키마를 만들므로 버전 기록만 남습니다.
+
+Revision ID: 1a7e4c2b9d05
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1a7e4c2b9d05'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (카운터 컬럼, 집계 원본 테이블)
+COUNTER_COLUMNS = [
+    ('like_count', 'likes'),
+    ('comment_count', 'comments'),
+]
+
+# (인덱스 이름, 컬럼) - Post.__table_args__와 같게 유지
+INDEXES = [
+    ('ix_posts_published_like_count', ['is_published', 'like_count']),
+    ('ix_posts_published_comment_count', ['is_published', 'comment_count']),
+]
+
+
+def _columns(table):
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    columns = _columns('posts')
+
+    # 좋아요/댓글 수 카운터 추가 후 현재 집계로 채움
+    for column, source in COUNTER_COLUMNS:
+        if column in columns:
+            continue
+        op.add_column('posts', sa.Column(column, sa.Integer(), nullable=False, server_default='0'))
+        op.execute(
+            f"UPDATE posts SET {column} = "
+            f"(SELECT COUNT(*) FROM {source} WHERE {source}.post_id = posts.id)"
+        )
+
+    existing = _indexes('posts')
+    for name, index_columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, 'posts', index_columns)
+
+
+def downgrade():
+    existing = _indexes('posts')
+    for name, _ in reversed(INDEXES):
+        if name in existing:
+            op.drop_index(name, table_name='posts')
+
+    columns = _columns('posts')
+    for column, _ in COUNTER_COLUMNS:
+        if column in columns:
+            op.drop_column('posts', column)
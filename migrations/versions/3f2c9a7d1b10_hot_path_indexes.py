@@ -0,0 +1,90 @@
+"""hot path indexes
+
+게시판/검색/챗봇 주요 조회 경로의 복합 인덱스 추가.
+
+이 저장소의 DB는 지금까지 앱 시작 시 db.create_all()로 만들어졌으므로
+(새 테이블은 생성되지만 기존 테이블의 컬럼/인덱스는 추가되지 않음),
+각 단계는 현재 스키마를 확인한 뒤 없거나 컬럼이 다른 것만 (다시) 만듭니다.
+새로 만든 DB에서는 create_all이 이미 같은 스키마를 만들므로 버전 기록만 남습니다.
+
+Revision ID: 3f2c9a7d1b10
+Revises: 1a7e4c2b9d05
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2c9a7d1b10'
+down_revision = '1a7e4c2b9d05'
+branch_labels = None
+depends_on = None
+
+# (테이블, 인덱스 이름, 컬럼) - 모델의 __table_args__와 같게 유지
+INDEXES = [
+    ('posts', 'ix_posts_published_created', ['is_published', 'created_at', 'id']),
+    ('posts', 'ix_posts_published_views', ['is_published', 'view_count', 'id']),
+    ('posts', 'ix_posts_published_like_count', ['is_published', 'like_count', 'id']),
+    ('posts', 'ix_posts_published_comment_count', ['is_published', 'comment_count', 'id']),
+    ('posts', 'ix_posts_category_published_created', ['category_id', 'is_published', 'created_at', 'id']),
+    ('comments', 'ix_comments_post_created', ['post_id', 'created_at', 'id']),
+    ('faqs', 'ix_faqs_active', ['is_active', 'id']),
+]
+
+# 이전 리비전(1a7e4c2b9d05)의 카운터 정렬 인덱스 - downgrade 시 복원
+PREVIOUS_INDEXES = [
+    ('posts', 'ix_posts_published_like_count', ['is_published', 'like_count']),
+    ('posts', 'ix_posts_published_comment_count', ['is_published', 'comment_count']),
+]
+
+
+def _indexes(table):
+    """인덱스 이름 -> 컬럼 목록"""
+    return {
+        index['name']: index['column_names']
+        for index in sa.inspect(op.get_bind()).get_indexes(table)
+    }
+
+
+def upgrade():
+    # 조회수: NULL 제거 후 NOT NULL DEFAULT 0 (키셋 커서 정렬 키)
+    op.execute("UPDATE posts SET view_count = 0 WHERE view_count IS NULL")
+    op.alter_column(
+        'posts', 'view_count',
+        existing_type=sa.Integer(),
+        nullable=False,
+        server_default='0'
+    )
+
+    # 없는 인덱스는 만들고, 같은 이름에 컬럼이 다르면 (id 타이브레이커 추가 등) 다시 만듦
+    existing = {}
+    for table, name, index_columns in INDEXES:
+        if table not in existing:
+            existing[table] = _indexes(table)
+        current = existing[table].get(name)
+        if current == index_columns:
+            continue
+        if current is not None:
+            op.drop_index(name, table_name=table)
+        op.create_index(name, table, index_columns)
+
+
+def downgrade():
+    existing = {}
+    for table, name, _ in reversed(INDEXES):
+        if table not in existing:
+            existing[table] = _indexes(table)
+        if name in existing[table]:
+            op.drop_index(name, table_name=table)
+
+    for table, name, index_columns in PREVIOUS_INDEXES:
+        op.create_index(name, table, index_columns)
+
+    op.alter_column(
+        'posts', 'view_count',
+        existing_type=sa.Integer(),
+        nullable=True,
+        server_default=None
+    )
@@ -3,8 +3,17 @@
 Flask 애플리케이션 실행 스크립트
 """
 
-from app import create_app, db
+import os
+
+import click
+from flask_migrate import upgrade
+
+from app import create_app, db, start_background_services
 from app.models import User, Post, Comment, Like, Category
+from app.services import job_queue, search_outbox, post_counters
+from app.services.index_manager import IndexManager
+from app.services.bulk_indexer import BulkReindexer, next_version
+from app.services.view_counter import get_view_counter
 
 app = create_app()
 
@@ -22,8 +31,9 @@ def make_shell_context():
 
 @app.cli.command()
 def init_db():
-    """데이터베이스 초기화"""
+    """데이터베이스 초기화 (테이블 생성 후 마이그레이션 적용)"""
     db.create_all()
+    upgrade()
     print("데이터베이스가 초기화되었습니다.")
 
 @app.cli.command()
@@ -61,5 +71,145 @@ def create_sample_data():
     db.session.commit()
     print("샘플 데이터가 생성되었습니다.")
 
+@app.cli.group()
+def jobs():
+    """백그라운드 작업 큐 관리"""
+
+@jobs.command('status')
+def jobs_status():
+    """작업 큐 상태 출력"""
+    stats = job_queue.queue_stats()
+    for key, value in stats.items():
+        print(f"  {key:24s}: {value}")
+
+@jobs.command('drain')
+@click.option('--limit', type=int, default=None, help='처리할 최대 작업 수')
+def jobs_drain(limit):
+    """대기 중인 작업을 현재 프로세스에서 모두 처리"""
+    succeeded, failed = job_queue.run_pending(limit=limit)
+    print(f"작업 처리 완료: 성공 {succeeded}건, 실패 {failed}건")
+
+@jobs.command('replay')
+@click.argument('job_ids', nargs=-1, type=int)
+def jobs_replay(job_ids):
+    """실패한 작업(또는 지정한 작업 ID)을 다시 대기 상태로 변경"""
+    count = job_queue.replay(job_ids=list(job_ids) or None)
+    print(f"{count}개 작업을 다시 대기 상태로 변경했습니다.")
+
+@app.cli.group()
+def outbox():
+    """검색 인덱스 동기화 아웃박스 관리"""
+
+@outbox.command('status')
+def outbox_status():
+    """아웃박스 적체/지연 상태 출력"""
+    for key, value in search_outbox.outbox_stats().items():
+        print(f"  {key:18s}: {value}")
+
+@outbox.command('drain')
+@click.option('--batch-size', type=int, default=200, help='배치당 처리할 행 수')
+def outbox_drain(batch_size):
+    """대기 중인 변경을 현재 프로세스에서 모두 ES에 반영"""
+    dispatched, failed = search_outbox.drain(batch_size=batch_size)
+    print(f"동기화 완료: 반영 {dispatched}건, 실패 {failed}건")
+
+@outbox.command('retry')
+def outbox_retry():
+    """재시도 중단된 변경을 다시 대기 상태로 변경"""
+    count = search_outbox.retry_failed()
+    print(f"{count}개 변경을 다시 대기 상태로 변경했습니다.")
+
+@app.cli.group('search-index')
+def search_index():
+    """검색 인덱스(별칭/버전) 관리"""
+
+@search_index.command('status')
+def search_index_status():
+    """별칭과 버전별 인덱스 상태 출력"""
+    status = IndexManager().status()
+    print(f"별칭: {status['alias']} (매핑 버전 {status['mapping_version']})")
+    if status['legacy']:
+        print("  ⚠️ 버전 없는 기존 인덱스 사용 중")
+    for index in status['indices']:
+        marker = '*' if index['aliased'] else ' '
+        print(f"  {marker} {index['index']:32s} v{index['version']:<3d} {index['docs']}건")
+
+@search_index.command('ensure')
+def search_index_ensure():
+    """인덱스/별칭 생성 및 매핑 확인"""
+    print(f"현재 인덱스: {IndexManager().ensure_index()}")
+
+@search_index.command('migrate')
+@click.option('--version', type=int, default=None, help='새 인덱스 버전 (기본: 다음 버전)')
+@click.option('--delete-old', is_flag=True, help='별칭 교체 후 이전 인덱스 삭제')
+def search_index_migrate(version, delete_old):
+    """새 버전 인덱스로 재색인 후 별칭 교체 (무중단)"""
+    target = IndexManager().migrate(version=version, delete_old=delete_old)
+    print(f"전환 완료: {target}")
+
+@app.cli.command()
+@click.option('--chunk-size', type=int, default=500, help='청크당 문서 수 (DB 조회/임베딩/bulk 단위)')
+@click.option('--threads', type=int, default=4, help='bulk 전송 스레드 수')
+@click.option('--new-index', is_flag=True, help='새 버전 인덱스에 색인 후 별칭 교체')
+@click.option('--delete-old', is_flag=True, help='별칭 교체 후 이전 인덱스 삭제 (--new-index와 함께 사용)')
+@click.option('--resume', is_flag=True, help='체크포인트에서 이어서 실행')
+@click.option('--no-embedding', is_flag=True, help='임베딩 계산 생략 (키워드 검색만 필요할 때)')
+@click.option('--checkpoint', default='reindex_checkpoint.json', show_default=True, help='체크포인트 파일 경로')
+def reindex(chunk_size, threads, new_index, delete_old, resume, no_embedding, checkpoint):
+    """MySQL의 게시글/FAQ 전체를 검색 인덱스에 일괄 재색인"""
+    reindexer = BulkReindexer(
+        chunk_size=chunk_size,
+        thread_count=threads,
+        with_embedding=not no_embedding,
+        checkpoint_path=checkpoint
+    )
+    result = reindexer.run(
+        target_version=next_version() if new_index and not resume else None,
+        resume=resume,
+        delete_old=delete_old
+    )
+    print(f"재색인 완료: {result['target']} {result['indexed']}건, 오류 {result['errors']}건, "
+          f"{result['seconds']}초 ({result['docs_per_sec']} docs/sec)")
+    if result['errors']:
+        for error in reindexer.errors[:10]:
+            print(f"  ❌ {error}")
+        print("체크포인트가 남아 있습니다. 원인 해결 후 --resume 으로 다시 실행하세요.")
+
+@app.cli.group()
+def counters():
+    """게시글 좋아요/댓글 카운터 관리"""
+
+@counters.command('reconcile')
+@click.option('--batch-size', type=int, default=1000, help='한 번에 집계할 게시글 수')
+@click.option('--background', is_flag=True, help='작업 큐에 등록해 백그라운드에서 실행')
+def counters_reconcile(batch_size, background):
+    """카운터를 실제 좋아요/댓글 수와 비교해 보정"""
+    if background:
+        job_queue.enqueue('reconcile_post_counters', {'batch_size': batch_size})
+        db.session.commit()
+        print("카운터 보정 작업을 등록했습니다.")
+        return
+    repaired = post_counters.reconcile(batch_size=batch_size)
+    print(f"카운터 보정 완료: {repaired}건")
+
+@app.cli.group()
+def views():
+    """게시글 조회수 버퍼 관리"""
+
+@views.command('status')
+def views_status():
+    """조회수 버퍼 상태 출력"""
+    for key, value in get_view_counter().stats().items():
+        print(f"  {key:16s}: {value}")
+
+@views.command('flush')
+def views_flush():
+    """버퍼에 쌓인 조회수를 지금 DB에 반영"""
+    count = get_view_counter().flush()
+    print(f"조회수 반영 완료: 게시글 {count}개")
+
 if __name__ == '__main__':
+    # 개발 서버: 리로더가 띄운 실제 서버 프로세스에서만 백그라운드 스레드 시작
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_services(app)
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+추론 백엔드 벤치마크 스크립트
+
+eager / int8 / onnx 백엔드별로 생성 모델의 토큰 처리량(tokens/sec),
+p95 지연 시간, 프로세스 메모리(RSS)와 샘플 출력을 비교합니다.
+메모리를 독립적으로 측정하기 위해 백엔드마다 별도 프로세스에서 실행합니다.
+
+사전 준비 (변환 모델이 없으면 로딩 시 변환하므로 시간이 더 걸림):
+    python scripts/download_models.py --export int8
+    python scripts/download_models.py --export onnx
+
+사용법:
+    python scripts/benchmark_inference_backends.py [--backends eager,int8,onnx] [--runs 10]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROMPTS = [
+    "이 포트폴리오의 주요 기술 스택은 무엇인가요?",
+    "Elasticsearch는 어떤 용도로 사용되나요?",
+    "게시글 작성 방법을 알려주세요.",
+    "AI 챗봇은 어떻게 동작하나요?",
+]
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _rss_mb():
+    """현재 RSS (Linux는 /proc, 그 외에는 최대 RSS)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_backend(backend, runs, max_length):
+    """단일 백엔드 측정 (하위 프로세스에서 실행, 결과를 JSON으로 출력)"""
+    from app.services.llm_service import LLMService
+    from app.services.model_registry import ModelRegistry
+
+    rss_before = _rss_mb()
+    service = LLMService(registry=ModelRegistry(backend=backend))
+    started = time.perf_counter()
+    tokenizer = service.tokenizer
+    model = service.generation_model
+    load_seconds = time.perf_counter() - started
+    if model is None or tokenizer is None:
+        return {'backend': backend, 'error': '생성 모델 로드 실패'}
+
+    # 첫 호출의 초기화 비용 제외
+    service.generate_response(PROMPTS[0], max_length=max_length)
+
+    latencies = []
+    tokens = 0
+    samples = {}
+    for i in range(runs):
+        prompt = PROMPTS[i % len(PROMPTS)]
+        started = time.perf_counter()
+        response = service.generate_response(prompt, max_length=max_length)
+        latencies.append((time.perf_counter() - started) * 1000)
+        tokens += len(tokenizer.encode(response))
+        samples.setdefault(prompt, response)
+
+    total_seconds = sum(latencies) / 1000
+    return {
+        'backend': backend,
+        'load_seconds': round(load_seconds, 2),
+        'tokens_per_sec': round(tokens / total_seconds, 1) if total_seconds else 0.0,
+        'p50_ms': round(_percentile(latencies, 50), 1),
+        'p95_ms': round(_percentile(latencies, 95), 1),
+        'rss_mb': round(_rss_mb(), 1),
+        'model_rss_mb': round(_rss_mb() - rss_before, 1),
+        'samples': samples,
+    }
+
+
+def _run_subprocess(backend, runs, max_length):
+    command = [
+        sys.executable, os.path.abspath(__file__),
+        '--worker', backend, '--runs', str(runs), '--max-length', str(max_length)
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    # 모델 로딩 로그 뒤의 마지막 줄이 결과 JSON
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        return {'backend': backend, 'error': result.stderr.strip()[-500:] or '실행 실패'}
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="추론 백엔드 벤치마크")
+    parser.add_argument("--backends", default="eager,int8,onnx", help="비교할 백엔드 (쉼표 구분)")
+    parser.add_argument("--runs", type=int, default=10, help="백엔드별 생성 횟수")
+    parser.add_argument("--max-length", type=int, default=150, help="생성 최대 길이")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_backend(args.worker, args.runs, args.max_length), ensure_ascii=False))
+        return 0
+
+    print("="*60)
+    print("🚀 추론 백엔드 벤치마크")
+    print("="*60)
+
+    results = []
+    for backend in [name.strip() for name in args.backends.split(',') if name.strip()]:
+        print(f"\n⏱️ {backend} 측정 중...")
+        result = _run_subprocess(backend, args.runs, args.max_length)
+        results.append(result)
+        if 'error' in result:
+            print(f"  ❌ {backend} 실패: {result['error']}")
+
+    print("\n" + "="*60)
+    print(f"{'backend':8s} {'load(s)':>8s} {'tok/s':>8s} {'p50(ms)':>9s} {'p95(ms)':>9s} {'RSS(MB)':>9s} {'모델(MB)':>9s}")
+    for result in results:
+        if 'error' in result:
+            continue
+        print(f"{result['backend']:8s} {result['load_seconds']:8.2f} {result['tokens_per_sec']:8.1f} "
+              f"{result['p50_ms']:9.1f} {result['p95_ms']:9.1f} {result['rss_mb']:9.1f} {result['model_rss_mb']:9.1f}")
+
+    print("\n📝 샘플 출력 (품질 비교)")
+    for prompt in PROMPTS:
+        print(f"\nQ: {prompt}")
+        for result in results:
+            if 'error' not in result and prompt in result['samples']:
+                print(f"  [{result['backend']}] {result['samples'][prompt][:200]}")
+
+    return 0 if all('error' not in result for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
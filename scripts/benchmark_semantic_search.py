@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+의미 기반 검색 벤치마크 스크립트
+
+키워드 검색(search_documents)과 벡터 검색(knn_search)의
+recall@k 및 지연 시간을 비교합니다.
+
+평가 데이터: 각 FAQ의 질문과 각 게시글의 제목을 쿼리로 사용하고,
+해당 문서가 top-k 안에 포함되면 정답으로 간주합니다.
+
+사용법:
+    python scripts/benchmark_semantic_search.py [--k 5] [--limit 200]
+"""
+
+import argparse
+import statistics
+import sys
+import os
+import time
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.models import Post, FAQ
+from app.services.elasticsearch_service import ElasticsearchService
+from app.services.llm_service import get_llm_service
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _load_queries(limit):
+    """(쿼리, 정답 문서 ID) 목록 생성"""
+    queries = []
+    for faq in FAQ.query.filter_by(is_active=True).limit(limit).all():
+        queries.append((faq.question, f"faq-{faq.id}"))
+    for post in Post.query.filter_by(is_published=True).limit(limit).all():
+        queries.append((post.title, f"post-{post.id}"))
+    return queries
+
+
+def _run(name, queries, search, k):
+    hits = 0
+    latencies = []
+    for query, expected_id in queries:
+        started = time.perf_counter()
+        result = search(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+        doc_ids = [hit['_id'] for hit in (result or {}).get('hits', {}).get('hits', [])[:k]]
+        if expected_id in doc_ids:
+            hits += 1
+
+    recall = hits / len(queries) if queries else 0.0
+    print(f"  {name:10s} recall@{k}: {recall:.3f}  "
+          f"p50: {statistics.median(latencies):7.1f}ms  "
+          f"p95: {_percentile(latencies, 95):7.1f}ms")
+    return recall
+
+
+def benchmark(k, limit):
+    """키워드 검색과 벡터 검색 비교"""
+    app = create_app()
+
+    with app.app_context():
+        es = ElasticsearchService()
+        llm_service = get_llm_service()
+        queries = _load_queries(limit)
+
+        if not queries:
+            print("⚠️ 평가할 FAQ/게시글이 없습니다.")
+            return 1
+
+        if llm_service.embedding_model is None:
+            print("❌ 임베딩 모델을 로드할 수 없습니다.")
+            return 1
+
+        def keyword_search(query):
+            return es.search_documents(query, size=k)
+
+        def vector_search(query):
+            # 쿼리 임베딩 계산 시간도 지연 시간에 포함
+            embedding = llm_service.get_embeddings([query])
+            return es.knn_search(embedding[0], size=k)
+
+        print("=" * 60)
+        print(f"📊 의미 기반 검색 벤치마크 (쿼리 {len(queries)}개)")
+        print("=" * 60)
+        _run("keyword", queries, keyword_search, k)
+        _run("vector", queries, vector_search, k)
+        print("=" * 60)
+        return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="키워드/벡터 검색 recall 및 지연 시간 비교")
+    parser.add_argument("--k", type=int, default=5, help="recall@k의 k (기본값: 5)")
+    parser.add_argument("--limit", type=int, default=200, help="문서 종류별 최대 쿼리 수 (기본값: 200)")
+    args = parser.parse_args()
+    sys.exit(benchmark(args.k, args.limit))
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+게시판 화면 쿼리 수 확인 스크립트 (N+1 회귀 검사)
+
+임시 SQLite DB에 데이터 양을 늘려 가며 메인/게시판 목록/게시글 상세 화면을
+요청하고, 요청당 실행된 SQL 수가 데이터 양과 관계없이 같은지 확인합니다.
+쿼리 수가 늘어나면 0이 아닌 종료 코드를 반환합니다.
+
+사용법:
+    python scripts/check_query_counts.py [--sizes 3,30] [--verbose]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 백그라운드 스레드/외부 서비스 없이 앱 생성
+os.environ.update({
+    'BACKGROUND_WORKERS': 'false',
+    'REDIS_URL': '',
+})
+
+
+def seed(db, size):
+    """게시글 size개, 게시글마다 댓글 size개(절반은 대댓글) 생성, 로그인용 사용자 반환"""
+    from app.models import User, Category, Post, Comment, Like
+
+    category = Category(name=f"카테고리{size}", description="쿼리 수 확인용")
+    db.session.add(category)
+    users = []
+    for i in range(size):
+        user = User(username=f"user{size}_{i}", email=f"user{size}_{i}@example.com")
+        user.set_password('password')
+        users.append(user)
+    db.session.add_all(users)
+    db.session.flush()
+
+    posts = []
+    for i in range(size):
+        post = Post(
+            title=f"게시글 {i}", content="내용 " * 50, tags="python,flask",
+            user_id=users[i % len(users)].id, category_id=category.id,
+            like_count=i, comment_count=size
+        )
+        posts.append(post)
+    db.session.add_all(posts)
+    db.session.flush()
+
+    for post in posts:
+        parent = None
+        for j in range(size):
+            comment = Comment(
+                content=f"댓글 {j}", user_id=users[j % len(users)].id, post_id=post.id,
+                parent_id=parent.id if parent is not None and j % 2 else None
+            )
+            db.session.add(comment)
+            db.session.flush()
+            if j % 2 == 0:
+                parent = comment
+        db.session.add(Like(user_id=users[0].id, post_id=post.id))
+    db.session.commit()
+    return users[0].id, posts[0].id
+
+
+def count_queries(app, db, path, user_id, verbose=False):
+    """path 요청 한 번에 실행된 SQL 수"""
+    from sqlalchemy import event
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get(path)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+    if response.status_code != 200:
+        raise RuntimeError(f"{path} 응답 코드 {response.status_code}")
+    if verbose:
+        for statement in statements:
+            print(f"    {' '.join(statement.split())[:160]}")
+    return len(statements)
+
+
+def measure(size, verbose=False):
+    """데이터 양 size에서 화면별 쿼리 수"""
+    db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    db_file.close()
+    os.environ['DATABASE_URL'] = f"sqlite:///{db_file.name}"
+    try:
+        from app import create_app, db
+        from app.services.category_cache import get_category_cache
+        from app.services.identity_cache import get_identity_cache
+
+        app = create_app()
+        app.config['TESTING'] = True
+        with app.app_context():
+            user_id, post_id = seed(db, size)
+            # 이전 측정의 프로세스 캐시 제거 (측정마다 같은 조건에서 시작)
+            get_identity_cache().clear()
+            get_category_cache().invalidate()
+            counts = {}
+            for name, path in (('main.index', '/'), ('board.list_posts', '/board/'),
+                               ('board.view_post', f'/board/{post_id}')):
+                if verbose:
+                    print(f"  [{size}] {name}")
+                counts[name] = count_queries(app, db, path, user_id, verbose)
+            db.session.remove()
+            db.engine.dispose()
+        return counts
+    finally:
+        os.remove(db_file.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='게시판 화면 쿼리 수 확인')
+    parser.add_argument('--sizes', default='3,30', help='비교할 데이터 양 (쉼표 구분)')
+    parser.add_argument('--verbose', action='store_true', help='실행된 SQL 출력')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    results = {size: measure(size, args.verbose) for size in sizes}
+
+    print(f"{'화면':20s}" + ''.join(f"{size:>8d}" for size in sizes))
+    failed = False
+    for name in results[sizes[0]]:
+        counts = [results[size][name] for size in sizes]
+        constant = len(set(counts)) == 1
+        failed = failed or not constant
+        print(f"{name:20s}" + ''.join(f"{count:>8d}" for count in counts) + ('' if constant else '  ❌ 증가'))
+
+    if failed:
+        print("❌ 데이터 양에 따라 쿼리 수가 늘어나는 화면이 있습니다 (--verbose로 확인).")
+        return 1
+    print("✅ 모든 화면의 쿼리 수가 일정합니다.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+주요 조회 쿼리 실행 계획 확인 스크립트 (EXPLAIN 회귀 검사)
+
+게시판 목록/상세, 메인, 검색 DB 폴백, 챗봇 FAQ 등 각 화면의 주 쿼리를
+앱과 같은 코드로 만들어 DATABASE_URL의 MySQL에서 EXPLAIN하고, 대상
+테이블을 전체 스캔(type=ALL)하는 쿼리가 있으면 0이 아닌 종료 코드를
+반환합니다. 행 수가 매우 적은 테이블은 옵티마이저가 인덱스 대신 전체
+스캔을 고를 수 있으므로 --min-rows 미만인 테이블은 경고만 출력합니다.
+
+사전 준비:
+    flask db upgrade    # migrations/ 의 인덱스 적용
+
+사용법:
+    python scripts/check_query_plans.py [--min-rows 1000] [--verbose]
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 백그라운드 스레드/외부 서비스 없이 앱 생성
+os.environ.update({
+    'BACKGROUND_WORKERS': 'false',
+})
+
+
+def route_queries():
+    """(이름, 전체 스캔을 허용하지 않을 테이블, 쿼리) 목록"""
+    from app.models import Post, Comment, FAQ, SearchOutbox, Job
+    from app.services.pagination import _after
+    from app.services.post_queries import published_posts, POST_SORTS
+
+    def page(query, sort_by, cursor_values=None):
+        columns = POST_SORTS[sort_by]
+        if cursor_values is not None:
+            query = query.filter(_after(columns, cursor_values))
+        return query.order_by(*[column.desc() for column in columns]).limit(11)
+
+    cursor_at = datetime.utcnow()
+    return [
+        ('main.index 최신 게시글', 'posts', published_posts().order_by(Post.created_at.desc()).limit(6)),
+        ('main.index 인기 게시글', 'posts', published_posts().order_by(Post.view_count.desc()).limit(5)),
+        ('board.list_posts 최신순', 'posts', page(published_posts(), 'latest')),
+        ('board.list_posts 최신순 다음 페이지', 'posts', page(published_posts(), 'latest', [cursor_at, 1000])),
+        ('board.list_posts 인기순', 'posts', page(published_posts(), 'popular')),
+        ('board.list_posts 좋아요순', 'posts', page(published_posts(), 'likes')),
+        ('board.list_posts 카테고리', 'posts',
+         page(published_posts().filter(Post.category_id == 1), 'latest', [cursor_at, 1000])),
+        ('board.view_post 댓글 트리', 'comments',
+         Comment.query.filter(Comment.post_id == 1).order_by(Comment.created_at.asc(), Comment.id.asc())),
+        ('chatbot FAQ 목록', 'faqs', FAQ.query.filter_by(is_active=True).order_by(FAQ.id.asc())),
+        ('search_outbox 디스패처', 'search_outbox',
+         SearchOutbox.query.filter(SearchOutbox.status == 'pending', SearchOutbox.next_attempt_at <= cursor_at)
+         .order_by(SearchOutbox.id.asc()).limit(200)),
+        ('job_queue 작업 가져오기', 'jobs',
+         Job.query.filter(Job.status == 'pending', Job.run_after <= cursor_at).order_by(Job.id.asc()).limit(1)),
+    ]
+
+
+def explain(connection, query):
+    """EXPLAIN 결과 행 목록 (dict)"""
+    compiled = query.statement.compile(dialect=connection.dialect)
+    result = connection.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params)
+    return [dict(row._mapping) for row in result]
+
+
+def table_rows(connection, table):
+    """information_schema의 추정 행 수"""
+    result = connection.exec_driver_sql(
+        "SELECT TABLE_ROWS FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %(table)s",
+        {'table': table}
+    ).scalar()
+    return int(result or 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='주요 조회 쿼리 실행 계획 확인')
+    parser.add_argument('--min-rows', type=int, default=1000,
+                        help='이 행 수 미만인 테이블의 전체 스캔은 경고만 출력')
+    parser.add_argument('--verbose', action='store_true', help='EXPLAIN 결과 전체 출력')
+    args = parser.parse_args()
+
+    from app import create_app, db
+
+    app = create_app()
+    failures = 0
+    with app.app_context():
+        connection = db.session.connection()
+        if connection.dialect.name != 'mysql':
+            print(f"❌ MySQL에서만 실행할 수 있습니다 (현재: {connection.dialect.name})")
+            return 2
+
+        rows_by_table = {}
+        for name, table, query in route_queries():
+            if table not in rows_by_table:
+                rows_by_table[table] = table_rows(connection, table)
+            plan = explain(connection, query)
+            full_scans = [row for row in plan if row.get('table') == table and row.get('type') == 'ALL']
+            keys = ', '.join(str(row.get('key')) for row in plan if row.get('table') == table)
+
+            if not full_scans:
+                status = '✅'
+            elif rows_by_table[table] < args.min_rows:
+                status = '⚠️ '
+            else:
+                status = '❌'
+                failures += 1
+            print(f"{status} {name:32s} key={keys}")
+            if args.verbose or status != '✅':
+                for row in plan:
+                    print(f"      {row}")
+
+    if failures:
+        print(f"❌ 전체 스캔 쿼리 {failures}개 - 인덱스(migrations/)와 쿼리 조건을 확인하세요.")
+        return 1
+    print("✅ 전체 스캔 쿼리가 없습니다.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,12 +3,61 @@
 HuggingFace 모델 사전 다운로드 스크립트
 """
 
+import argparse
 import os
 import sys
 from transformers import AutoTokenizer, AutoModelForCausalLM, AutoModelForSeq2SeqLM
 from sentence_transformers import SentenceTransformer
 
-def download_models():
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+EXPORT_FORMATS = ('int8', 'onnx')
+
+def export_model(model_type, model_save_path, export_format):
+    """저장된 생성/요약 모델을 int8 양자화 또는 ONNX로 변환하여 저장"""
+    import torch
+    from app.services.inference_backend import (
+        ORTModelForCausalLM, ORTModelForSeq2SeqLM,
+        int8_artifact_path, onnx_artifact_path, quantize_int8
+    )
+    
+    model_class = AutoModelForCausalLM if model_type == 'generation' else AutoModelForSeq2SeqLM
+    
+    if export_format == 'int8':
+        artifact = int8_artifact_path(model_save_path)
+        model = quantize_int8(model_class.from_pretrained(model_save_path))
+        torch.save(model, artifact)
+        print(f"✅ {model_type} 모델 int8 양자화 완료")
+        print(f"   저장 위치: {artifact}")
+        return True
+    
+    ort_class = ORTModelForCausalLM if model_type == 'generation' else ORTModelForSeq2SeqLM
+    if ort_class is None:
+        print("⚠️ optimum[onnxruntime]이 설치되지 않아 ONNX 변환을 건너뜁니다.")
+        return False
+    
+    from optimum.onnxruntime import ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    
+    onnx_path = onnx_artifact_path(model_save_path)
+    ort_model = ort_class.from_pretrained(model_save_path, export=True)
+    ort_model.save_pretrained(onnx_path)
+    AutoTokenizer.from_pretrained(model_save_path).save_pretrained(onnx_path)
+    
+    # ONNX 그래프별 동적 int8 양자화 (원본 파일을 양자화 버전으로 교체)
+    qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    for onnx_file in [f for f in os.listdir(onnx_path) if f.endswith('.onnx')]:
+        quantizer = ORTQuantizer.from_pretrained(onnx_path, file_name=onnx_file)
+        quantizer.quantize(save_dir=onnx_path, quantization_config=qconfig)
+        quantized_file = onnx_file.replace('.onnx', '_quantized.onnx')
+        os.replace(os.path.join(onnx_path, quantized_file), os.path.join(onnx_path, onnx_file))
+    
+    print(f"✅ {model_type} 모델 ONNX 변환 및 양자화 완료")
+    print(f"   저장 위치: {onnx_path}")
+    return True
+
+def download_models(export_format=None):
     """기본 모델들을 사전 다운로드하고 ./models 디렉토리에 저장"""
     # 스크립트가 있는 디렉토리 찾기
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -73,6 +122,12 @@ def download_models():
             else:
                 download_results[model_type] = False
                 print(f"   ❌ 저장 경로가 생성되지 않았습니다")
+            
+            # 추론 백엔드용 변환 (생성/요약 모델만 해당)
+            if export_format and model_type != 'embedding' and download_results[model_type]:
+                print(f"🔧 {model_type} 모델 변환 중: {export_format}")
+                if not export_model(model_type, model_save_path, export_format):
+                    print("   ⚠️ 변환 실패, eager 모델로 동작합니다")
                 
         except Exception as e:
             print(f"❌ {model_type} 모델 다운로드 실패: {e}")
@@ -103,5 +158,14 @@ def download_models():
         return 1
 
 if __name__ == "__main__":
-    exit_code = download_models()
+    parser = argparse.ArgumentParser(description="HuggingFace 모델 다운로드 및 추론 백엔드 변환")
+    parser.add_argument(
+        "--export",
+        choices=EXPORT_FORMATS,
+        # 지정하지 않으면 LLM_BACKEND 설정에 맞춰 변환
+        default=os.getenv('LLM_BACKEND') if os.getenv('LLM_BACKEND') in EXPORT_FORMATS else None,
+        help="생성/요약 모델 변환 형식 (int8: PyTorch 동적 양자화, onnx: ONNX Runtime + int8)"
+    )
+    args = parser.parse_args()
+    exit_code = download_models(export_format=args.export)
     sys.exit(exit_code)
\ No newline at end of file